@@ -0,0 +1,83 @@
+#!/usr/bin/env python
+"""Benchmark SQLiteFactTableLoader on synthetic curated partitions."""
+from __future__ import annotations
+
+import random
+import time
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Iterator
+
+import typer
+
+from gads_etl.raw_sink import PartitionKey
+from gads_etl.warehouse.curated_sink import FilesystemCuratedSink
+from gads_etl.warehouse.fact_loader import SQLiteFactTableLoader
+
+app = typer.Typer(add_completion=False)
+
+_QUERY = "campaign_daily_performance"
+_START_DATE = date(2024, 1, 1)
+
+
+def _partition_keys(customers: int, days: int) -> list[PartitionKey]:
+    return [
+        PartitionKey("google_ads", f"{customer:06d}", _QUERY, str(_START_DATE + timedelta(day)))
+        for customer in range(customers)
+        for day in range(days)
+    ]
+
+
+def _rows(key: PartitionKey, campaigns: int, rng: random.Random) -> Iterator[dict]:
+    for campaign in range(campaigns):
+        yield {
+            "campaign_id": 10_000 + campaign,
+            "segments_date": key.logical_date,
+            "metrics_impressions": rng.randint(0, 100_000),
+            "metrics_clicks": rng.randint(0, 5_000),
+            "metrics_conversions": round(rng.random() * 50, 4),
+            "metrics_cost_micros": rng.randint(0, 10**9),
+            "__query_name": _QUERY,
+        }
+
+
+@app.command()
+def main(
+    root: Path = typer.Option(Path("data/benchmark_facts"), "--root"),
+    customers: int = typer.Option(200, "--customers"),
+    days: int = typer.Option(90, "--days"),
+    campaigns: int = typer.Option(50, "--campaigns"),
+) -> None:
+    """Stage ``customers * days`` curated partitions (once), then time full and daily loads."""
+    sink = FilesystemCuratedSink(root)
+    keys = _partition_keys(customers, days)
+    rng = random.Random(0)
+    started = time.perf_counter()
+    for key in keys:
+        if not sink.is_staged(key, "run-1"):
+            sink.stage_partition(key, "run-1", _rows(key, campaigns, rng), "v1", campaigns, "now")
+    typer.echo(f"staged {len(keys)} partitions in {time.perf_counter() - started:.1f}s")
+
+    (root / "warehouse.db").unlink(missing_ok=True)
+    loader = SQLiteFactTableLoader(root / "warehouse.db")
+    started = time.perf_counter()
+    inserted = loader.replace_partitions(
+        (key, "run-1", sink.iter_rows(key, "run-1")) for key in keys
+    )
+    elapsed = time.perf_counter() - started
+    typer.echo(f"full load: rows={inserted} {elapsed:.2f}s ({inserted / elapsed:,.0f} rows/s)")
+
+    latest = [key for key in keys if key.logical_date == keys[days - 1].logical_date]
+    started = time.perf_counter()
+    inserted = loader.replace_partitions(
+        (key, "run-1", sink.iter_rows(key, "run-1")) for key in latest
+    )
+    typer.echo(
+        f"replace latest day: partitions={len(latest)} rows={inserted} "
+        f"{(time.perf_counter() - started) * 1000:.0f}ms"
+    )
+    loader.close()
+
+
+if __name__ == "__main__":  # pragma: no cover
+    app()
@@ -0,0 +1,154 @@
+#!/usr/bin/env python
+"""Benchmark PartitionStateRepository queries against a large synthetic history."""
+from __future__ import annotations
+
+import random
+import time
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
+from typing import Iterator
+
+import typer
+
+from gads_etl.state_store import PartitionState, PartitionStateRepository, _list_query
+
+app = typer.Typer(add_completion=False)
+
+_STATUSES = ("success",) * 18 + ("pending", "failed")
+_WRITE_BATCH = 50_000
+_START_DATE = date(2015, 1, 1)
+
+
+def _synthetic_states(rows: int, customers: int, queries: int) -> Iterator[PartitionState]:
+    rng = random.Random(0)
+    days = max(1, rows // (customers * queries))
+    start = _START_DATE
+    updated = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    produced = 0
+    for day in range(days + 1):
+        for customer in range(customers):
+            for query in range(queries):
+                if produced >= rows:
+                    return
+                status = rng.choice(_STATUSES)
+                yield PartitionState(
+                    source="google_ads",
+                    customer_id=f"{customer:06d}",
+                    query_name=f"query_{query}",
+                    logical_date=start + timedelta(days=day),
+                    status=status,
+                    current_run_id=f"run-{day}",
+                    schema_version="v1",
+                    record_count=rng.randint(0, 10_000),
+                    updated_at=updated + timedelta(seconds=rng.randint(0, 10_000_000)),
+                    error_message="boom" if status == "failed" else None,
+                    attempt_count=rng.randint(1, 5),
+                )
+                produced += 1
+
+
+def _populate(repo: PartitionStateRepository, rows: int, customers: int, queries: int) -> None:
+    batch: list[PartitionState] = []
+    started = time.perf_counter()
+    for state in _synthetic_states(rows, customers, queries):
+        batch.append(state)
+        if len(batch) == _WRITE_BATCH:
+            repo.upsert_partition_states(batch)
+            batch = []
+    if batch:
+        repo.upsert_partition_states(batch)
+    typer.echo(f"populated {rows} rows in {time.perf_counter() - started:.1f}s")
+
+
+def _bulk(db_path: Path, keys: int, customers: int, queries: int) -> None:
+    """Time the control-plane path: one bulk lookup and one bulk write of ``keys`` partitions.
+
+    This is what ``state backfill enqueue`` does for a range that is half
+    new and half already known, minus the per-partition log output.
+    """
+    db_path.unlink(missing_ok=True)
+    for suffix in ("-wal", "-shm"):
+        db_path.with_name(db_path.name + suffix).unlink(missing_ok=True)
+    repo = PartitionStateRepository(db_path)
+    states = list(_synthetic_states(keys, customers, queries))
+    repo.upsert_partition_states(states[::2])
+    lookup = [(s.source, s.customer_id, s.query_name, s.logical_date) for s in states]
+    started = time.perf_counter()
+    existing = repo.get_partition_states(lookup)
+    looked_up = time.perf_counter() - started
+    for state in states:
+        state.status = "pending"
+    started = time.perf_counter()
+    repo.upsert_partition_states(states)
+    written = time.perf_counter() - started
+    typer.echo(
+        f"bulk {keys} keys: lookup={looked_up * 1000:.0f}ms (found {len(existing)}) "
+        f"upsert={written * 1000:.0f}ms total={(looked_up + written) * 1000:.0f}ms"
+    )
+    repo.close()
+
+
+@app.command()
+def main(
+    db_path: Path = typer.Option(Path("data/benchmark_state_store.db"), "--db-path"),
+    rows: int = typer.Option(10_000_000, "--rows"),
+    customers: int = typer.Option(500, "--customers"),
+    queries: int = typer.Option(8, "--queries"),
+    repeat: int = typer.Option(5, "--repeat"),
+    bulk_keys: int = typer.Option(100_000, "--bulk-keys"),
+) -> None:
+    """Populate ``--db-path`` (once) and time the list, observe and bulk operations."""
+    _bulk(db_path.with_name(f"{db_path.stem}_bulk.db"), bulk_keys, customers, queries)
+    repo = PartitionStateRepository(db_path)
+    repo.ensure_schema()
+    existing = repo._connect().execute("SELECT COUNT(*) FROM partition_state").fetchone()[0]
+    if existing < rows:
+        _populate(repo, rows, customers, queries)
+    repo._connect().execute("ANALYZE")
+
+    middle = _START_DATE + timedelta(days=rows // (customers * queries) // 2)
+    cases = {
+        "failed, newest first": {"status": "failed", "limit": 100},
+        "pending": {"status": "pending"},
+        "query date range": {
+            "query_name": "query_1",
+            "since": middle,
+            "until": middle + timedelta(days=30),
+        },
+        "customer date range": {
+            "customer_id": "000042",
+            "since": middle - timedelta(days=180),
+            "until": middle + timedelta(days=180),
+        },
+    }
+    for name, filters in cases.items():
+        sql, params = _list_query(**filters)
+        plan = repo._connect().execute(f"EXPLAIN QUERY PLAN {sql}", params).fetchall()
+        timings = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            found = len(repo.list_partition_states(**filters))
+            timings.append(time.perf_counter() - started)
+        typer.echo(
+            f"{name}: rows={found} best={min(timings) * 1000:.1f}ms "
+            f"plan={' | '.join(row['detail'] for row in plan)}"
+        )
+    aggregates = {
+        "status counts": repo.status_counts,
+        "date ranges": repo.date_ranges,
+        "success gaps": repo.date_gaps,
+        "attempt summary": repo.attempt_summary,
+        "top attempts": lambda: repo.top_by_attempts(10),
+    }
+    for name, aggregate in aggregates.items():
+        timings = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            aggregate()
+            timings.append(time.perf_counter() - started)
+        typer.echo(f"{name}: best={min(timings) * 1000:.1f}ms")
+    repo.close()
+
+
+if __name__ == "__main__":  # pragma: no cover
+    app()
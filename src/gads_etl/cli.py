@@ -1,17 +1,27 @@
 """Command line interface for the ETL."""
+import json
 import logging
+from dataclasses import asdict
 from datetime import date, datetime, timezone, timedelta
+from itertools import islice
 from pathlib import Path
-from typing import Optional
+from typing import List, Optional
 
 import typer
 
+from .config import ConfigLoader
 from .pipeline import run_pipeline
 from .run_context import RunContext
-from .state_store import PartitionStateRepository, PartitionState
-from .state_inspect import format_states
+from .state_store import ATTEMPT_BUCKETS, PartitionState, PartitionStateStore
+from .state_store_factory import create_state_store, state_store_exists
+from .state_inspect import iter_format_states
+from .raw_sink_catalog import SQLitePartitionCatalog
+from .raw_sink_factory import create_raw_sink
 from .raw_sink_local import LocalFilesystemRawSink
+from .validator import FieldChecks, RawPartitionValidator
 from .consumer_preview import render_preview, collect_preview
+from .warehouse.curated_sink import FilesystemCuratedSink
+from .warehouse.fact_loader import SQLiteFactTableLoader
 from .warehouse.pointer_store import SQLiteWarehousePointerStore
 from .warehouse.loader import WarehouseLoader
 
@@ -33,28 +43,56 @@ warehouse_app = typer.Typer(help="Warehouse control-plane commands")
 app.add_typer(warehouse_app, name="warehouse")
 observe_app = typer.Typer(help="Observability commands")
 app.add_typer(observe_app, name="observe")
+raw_app = typer.Typer(help="Raw sink commands")
+app.add_typer(raw_app, name="raw")
+raw_catalog_app = typer.Typer(help="Raw partition catalog commands")
+raw_app.add_typer(raw_catalog_app, name="catalog")
 retry_threshold = 20
 backfill_threshold = 100
 
 
 @app.command()
-def daily() -> None:
+def daily(
+    auto_validate: Optional[bool] = typer.Option(
+        None,
+        "--auto-validate/--no-auto-validate",
+        help="Validate partitions as they are finalized (default: execution.auto_validate)",
+    ),
+    db_path: str = typer.Option("data/state_store.db", "--db-path"),
+) -> None:
     """Run the daily incremental sync."""
     run_context = RunContext.create()
     logger.info("Starting daily run with run_id=%s", run_context.run_id)
-    run_pipeline(mode="daily", run_context=run_context)
+    run_pipeline(
+        mode="daily",
+        run_context=run_context,
+        auto_validate=auto_validate,
+        state_db_path=db_path,
+    )
 
 
 @app.command("catch-up")
 def catch_up(
-    days: Optional[int] = typer.Option(None, help="Override default catch-up window")
+    days: Optional[int] = typer.Option(None, help="Override default catch-up window"),
+    auto_validate: Optional[bool] = typer.Option(
+        None,
+        "--auto-validate/--no-auto-validate",
+        help="Validate partitions as they are finalized (default: execution.auto_validate)",
+    ),
+    db_path: str = typer.Option("data/state_store.db", "--db-path"),
 ) -> None:
     """Backfill a range of dates."""
     run_context = RunContext.create()
     logger.info(
         "Starting catch-up run with run_id=%s days=%s", run_context.run_id, days
     )
-    run_pipeline(mode="catch-up", days=days, run_context=run_context)
+    run_pipeline(
+        mode="catch-up",
+        days=days,
+        run_context=run_context,
+        auto_validate=auto_validate,
+        state_db_path=db_path,
+    )
 
 
 @state_app.command("inspect")
@@ -69,15 +107,15 @@ def state_inspect(
     db_path: str = typer.Option("data/state_store.db", "--db-path"),
 ) -> None:
     """Inspect current partition state without mutating anything."""
-    repo = PartitionStateRepository(db_path=db_path)
-    if not Path(db_path).exists():
+    if not state_store_exists(db_path):
         typer.echo("State store not initialized; no records found.")
         raise typer.Exit(code=0)
+    repo = _open_read_only(db_path)
 
     since_date = date.fromisoformat(since) if since else None
     until_date = date.fromisoformat(until) if until else None
 
-    states = repo.list_partition_states(
+    states = repo.iter_partition_states(
         status=status,
         customer_id=customer_id,
         query_name=query_name,
@@ -85,10 +123,78 @@ def state_inspect(
         until=until_date,
         limit=limit,
     )
+    for chunk in iter_format_states(states, output_format=output_format):
+        typer.echo(chunk)
+
+
+@state_app.command("validate-run")
+def state_validate_run(
+    run_id: str = typer.Argument(..., help="run_id whose partitions should be validated"),
+    processes: int = typer.Option(4, "--processes", help="Worker processes inspecting partitions"),
+    chunk_workers: int = typer.Option(1, "--chunk-workers", help="Threads per chunked partition"),
+    deep: bool = typer.Option(False, "--deep", help="Parse every row, not just checksums"),
+    check_fields: bool = typer.Option(
+        False, "--check-fields", help="Check rows against the configured query fields"
+    ),
+    batch_size: int = typer.Option(500, "--batch-size", help="State rows per transaction"),
+    db_path: str = typer.Option("data/state_store.db", "--db-path"),
+) -> None:
+    """Validate every raw partition written by a run and record the outcome."""
+    field_checks = {}
+    if check_fields:
+        queries = ConfigLoader().model.extractors.google_ads.ads_resource_queries
+        field_checks = {
+            query.name: FieldChecks.from_query_fields(query.fields) for query in queries
+        }
+    validator = RawPartitionValidator(
+        create_raw_sink(),
+        create_state_store(db_path),
+        chunk_workers=chunk_workers,
+        deep=deep,
+        field_checks=field_checks,
+    )
+    states = validator.validate_run(
+        run_id, processes=processes, sink_factory=create_raw_sink, batch_size=batch_size
+    )
     if not states:
-        typer.echo("No partition state records found.")
+        typer.echo(f"No finalized partitions found for run_id={run_id}.")
+        raise typer.Exit(code=0)
+    failed = [state for state in states if state.status == "failed"]
+    typer.echo(
+        f"Validated {len(states)} partition(s) for run_id={run_id} | "
+        f"success={len(states) - len(failed)} failed={len(failed)}"
+    )
+    for state in failed:
+        typer.echo(
+            f"{state.customer_id} {state.query_name} {state.logical_date.isoformat()} "
+            f"{state.error_message}"
+        )
+    if failed:
+        raise typer.Exit(code=1)
+
+
+@state_app.command("events")
+def state_events(
+    since: int = typer.Option(0, "--since", help="Only events after this sequence number"),
+    limit: Optional[int] = typer.Option(None, "--limit"),
+    db_path: str = typer.Option("data/state_store.db", "--db-path"),
+) -> None:
+    """Print partition state change events as JSON lines (read-only)."""
+    if not state_store_exists(db_path):
+        typer.echo("State store not initialized; no records found.")
         raise typer.Exit(code=0)
-    typer.echo(format_states(states, output_format=output_format))
+    repo = _open_read_only(db_path)
+    events = repo.iter_events_since(since)
+    for event in islice(events, limit) if limit is not None else events:
+        typer.echo(
+            json.dumps(
+                {
+                    **asdict(event),
+                    "logical_date": event.logical_date.isoformat(),
+                    "updated_at": event.updated_at.isoformat(),
+                }
+            )
+        )
 
 
 @consumer_app.command("preview")
@@ -104,10 +210,10 @@ def consume_preview(
     sink_root: str = typer.Option("data/raw", "--raw-root"),
 ) -> None:
     """Preview authoritative partitions without writing anywhere."""
-    repo = PartitionStateRepository(db_path=db_path)
-    if not Path(db_path).exists():
+    if not state_store_exists(db_path):
         typer.echo("State store not initialized; no records found.")
         raise typer.Exit(code=1)
+    repo = _open_read_only(db_path)
 
     since_date = date.fromisoformat(since) if since else None
     until_date = date.fromisoformat(until) if until else None
@@ -133,8 +239,6 @@ def consume_preview(
     typer.echo(render_preview(previews, output_format=output_format))
 
 
-if __name__ == "__main__":
-    app()
 @state_app.command("retry")
 def state_retry(
     customer_id: Optional[str] = typer.Option(None, "--customer-id"),
@@ -147,8 +251,8 @@ def state_retry(
     db_path: str = typer.Option("data/state_store.db", "--db-path"),
 ) -> None:
     """Requeue failed logical partitions by setting status to pending."""
-    repo = PartitionStateRepository(db_path=db_path)
-    if not Path(db_path).exists():
+    repo = create_state_store(db_path)
+    if not state_store_exists(db_path):
         typer.echo("State store not initialized; no records found.")
         raise typer.Exit(code=1)
 
@@ -193,34 +297,26 @@ def state_retry(
         f"force={force}, clear_terminal={clear_terminal}]"
     )
 
-    failures = 0
+    now = datetime.now(timezone.utc)
+    updates = []
     for state in pending_states:
-        log_line = (
-            f"{state.customer_id} {state.query_name} {state.logical_date.isoformat()} "
-            f"attempt_count={state.attempt_count}"
-        )
-        typer.echo(log_line)
-        if dry_run:
-            continue
-        try:
-            repo.upsert_partition_state(
-                PartitionState(
-                    source=state.source,
-                    customer_id=state.customer_id,
-                    query_name=state.query_name,
-                    logical_date=state.logical_date,
-                    status="pending",
-                    current_run_id=state.current_run_id,
-                    schema_version=state.schema_version,
-                    record_count=state.record_count,
-                    updated_at=datetime.now(timezone.utc),
-                    error_message=None if clear_terminal else state.error_message,
-                    attempt_count=state.attempt_count,
-                )
+        typer.echo(_state_log_line(state))
+        updates.append(
+            PartitionState(
+                source=state.source,
+                customer_id=state.customer_id,
+                query_name=state.query_name,
+                logical_date=state.logical_date,
+                status="pending",
+                current_run_id=state.current_run_id,
+                schema_version=state.schema_version,
+                record_count=state.record_count,
+                updated_at=now,
+                error_message=None if clear_terminal else state.error_message,
+                attempt_count=state.attempt_count,
             )
-        except Exception as exc:  # pragma: no cover - best effort logging
-            typer.echo(f"Failed to update {log_line}: {exc}", err=True)
-            failures += 1
+        )
+    failures = 0 if dry_run else _upsert_batch(repo, updates, "update")
 
     if terminal_blocked and not clear_terminal:
         typer.echo(
@@ -236,19 +332,34 @@ def state_retry(
 def warehouse_load(
     state_db_path: str = typer.Option("data/state_store.db", "--state-db-path"),
     pointer_db_path: str = typer.Option("data/warehouse_pointers.db", "--pointer-db-path"),
+    full: bool = typer.Option(
+        False, "--full", help="Reconcile every partition instead of changes since the last load"
+    ),
+    curated_root: str = typer.Option("data", "--curated-root"),
+    staging_workers: int = typer.Option(4, "--staging-workers", min=1),
+    fact_db_path: Optional[str] = typer.Option(
+        None, "--fact-db-path", help="Also refresh the embedded fact tables in this SQLite file"
+    ),
 ) -> None:
-    """Reconcile and publish warehouse pointers."""
-    state_repo = PartitionStateRepository(db_path=state_db_path)
+    """Stage changed partitions into the curated sink and publish warehouse pointers."""
+    state_repo = create_state_store(state_db_path)
     pointer_store = SQLiteWarehousePointerStore(db_path=pointer_db_path)
     loader = WarehouseLoader(
         partition_state_repository=state_repo,
         pointer_store=pointer_store,
+        raw_sink=create_raw_sink(),
+        curated_sink=FilesystemCuratedSink(curated_root),
+        staging_workers=staging_workers,
+        fact_loader=SQLiteFactTableLoader(fact_db_path) if fact_db_path else None,
     )
-    plan = loader.run()
+    plan = loader.run(full=full)
     typer.echo(
         f"Warehouse reconciliation complete | loads={len(plan.load)} "
-        f"replacements={len(plan.replace)} demotions={len(plan.demote)}"
+        f"replacements={len(plan.replace)} demotions={len(plan.demote)} "
+        f"staging_failures={len(plan.failed)}"
     )
+    if plan.failed:
+        raise typer.Exit(code=1)
 
 
 @observe_app.command("state")
@@ -257,38 +368,14 @@ def observe_state(
     top_failed: int = typer.Option(10, "--top-failed", help="Top N failed partitions by attempts"),
 ) -> None:
     """Summarize pipeline state without mutating anything."""
-    repo = PartitionStateRepository(db_path=db_path)
-    states = repo.list_partition_states()
-    if not states:
+    repo = _open_read_only(db_path)
+    status_counts = repo.status_counts()
+    total = sum(status_counts.values())
+    if not total:
         typer.echo("No partition state records found.")
         raise typer.Exit(code=0)
 
-    total = len(states)
-    status_counts = {"pending": 0, "success": 0, "failed": 0}
-    range_by_query: dict[tuple[str, str], tuple[str, str]] = {}
-    attempt_values: list[int] = []
-    failed_states = []
-
-    for state in states:
-        status_counts.setdefault(state.status, 0)
-        status_counts[state.status] += 1
-        key = (state.source, state.query_name)
-        logical_date = state.logical_date.isoformat()
-        min_date, max_date = range_by_query.get(key, (logical_date, logical_date))
-        range_by_query[key] = (
-            logical_date if logical_date < min_date else min_date,
-            logical_date if logical_date > max_date else max_date,
-        )
-        attempts = state.attempt_count or 0
-        attempt_values.append(attempts)
-        if state.status == "failed":
-            failed_states.append(state)
-
-    attempt_min = min(attempt_values) if attempt_values else 0
-    attempt_max = max(attempt_values) if attempt_values else 0
-    attempt_avg = (
-        sum(attempt_values) / len(attempt_values) if attempt_values else 0.0
-    )
+    attempts = repo.attempt_summary()
 
     typer.echo(f"Total logical partitions: {total}")
     typer.echo("Status counts:")
@@ -296,42 +383,30 @@ def observe_state(
         typer.echo(f"  {status}: {status_counts.get(status, 0)}")
 
     typer.echo("Date ranges by (source, query_name):")
-    for key in sorted(range_by_query):
-        min_date, max_date = range_by_query[key]
-        typer.echo(f"  {key[0]} / {key[1]} :: {min_date} -> {max_date}")
+    for date_range in repo.date_ranges():
+        typer.echo(
+            f"  {date_range.source} / {date_range.query_name} :: "
+            f"{date_range.earliest.isoformat()} -> {date_range.latest.isoformat()}"
+        )
 
     typer.echo(
         "Attempt counts: "
-        f"min={attempt_min} max={attempt_max} avg={attempt_avg:.2f}"
+        f"min={attempts.minimum} max={attempts.maximum} avg={attempts.average:.2f}"
     )
 
-    failed_sorted = sorted(
-        failed_states,
-        key=lambda s: (
-            -(s.attempt_count or 0),
-            s.customer_id,
-            s.query_name,
-            s.logical_date.isoformat(),
-        ),
-    )
-    typer.echo(f"Top {min(top_failed, len(failed_sorted))} failed partitions:")
-    for state in failed_sorted[:top_failed]:
+    failed_top = repo.top_by_attempts(top_failed, status="failed")
+    typer.echo(f"Top {len(failed_top)} failed partitions:")
+    for state in failed_top:
         typer.echo(
             f"  {state.customer_id} {state.query_name} {state.logical_date.isoformat()} "
             f"attempts={state.attempt_count or 0} updated_at={state.updated_at.isoformat()}"
         )
-    if not failed_states:
+    if not status_counts.get("failed"):
         typer.echo("  (none)")
 
-    oldest_failed = min(
-        failed_states, key=lambda s: s.updated_at
-    ) if failed_states else None
+    oldest_failed = repo.oldest_updated("failed")
     if oldest_failed:
-        typer.echo(
-            "Oldest failed partition: "
-            f"{oldest_failed.customer_id} {oldest_failed.query_name} "
-            f"{oldest_failed.logical_date.isoformat()} updated_at={oldest_failed.updated_at.isoformat()}"
-        )
+        typer.echo("Oldest failed partition: " + _updated_line(oldest_failed))
     else:
         typer.echo("Oldest failed partition: (none)")
 
@@ -341,30 +416,25 @@ def observe_freshness(
     db_path: str = typer.Option("data/state_store.db", "--db-path"),
 ) -> None:
     """Report freshness and gaps for successful partitions."""
-    repo = PartitionStateRepository(db_path=db_path)
-    states = repo.list_partition_states(status="success")
-    if not states:
+    repo = _open_read_only(db_path)
+    date_ranges = repo.date_ranges(status="success")
+    if not date_ranges:
         typer.echo("No successful partitions found.")
         raise typer.Exit(code=0)
 
     today = date.today()
-    grouped: dict[tuple[str, str], set[date]] = {}
-    for state in states:
-        key = (state.source, state.query_name)
-        grouped.setdefault(key, set()).add(state.logical_date)
-
-    for key in sorted(grouped.keys()):
-        dates = sorted(grouped[key])
-        earliest = dates[0]
-        latest = dates[-1]
-        lag_days = (today - latest).days
-        total = len(dates)
-    typer.echo(f"{key[0]} / {key[1]}")
-    typer.echo(f"  earliest: {earliest.isoformat()}")
-    typer.echo(f"  latest: {latest.isoformat()} (lag_days={lag_days})")
-    typer.echo(f"  total_successful_partitions: {total}")
-
-        gaps = _find_date_gaps(dates)
+    gaps_by_query: dict[tuple[str, str], list[tuple[date, date]]] = {}
+    for gap in repo.date_gaps(status="success"):
+        gaps_by_query.setdefault((gap.source, gap.query_name), []).append((gap.start, gap.end))
+
+    for date_range in date_ranges:
+        lag_days = (today - date_range.latest).days
+        typer.echo(f"{date_range.source} / {date_range.query_name}")
+        typer.echo(f"  earliest: {date_range.earliest.isoformat()}")
+        typer.echo(f"  latest: {date_range.latest.isoformat()} (lag_days={lag_days})")
+        typer.echo(f"  total_successful_partitions: {date_range.distinct_dates}")
+
+        gaps = gaps_by_query.get((date_range.source, date_range.query_name))
         if gaps:
             typer.echo("  gaps:")
             for start, end in gaps:
@@ -378,26 +448,6 @@ def observe_freshness(
             typer.echo("  gaps: none")
 
 
-def _find_date_gaps(sorted_dates: list[date]) -> list[tuple[date, date]]:
-    """Identify missing logical dates between earliest and latest."""
-    if len(sorted_dates) < 2:
-        return []
-    date_set = set(sorted_dates)
-    gaps = []
-    current = sorted_dates[0]
-    end = sorted_dates[-1]
-    while current <= end:
-        if current not in date_set:
-            gap_start = current
-            while current <= end and current not in date_set:
-                current += timedelta(days=1)
-            gap_end = current - timedelta(days=1)
-            gaps.append((gap_start, gap_end))
-            continue
-        current += timedelta(days=1)
-    return gaps
-
-
 @observe_app.command("retries")
 def observe_retries(
     db_path: str = typer.Option("data/state_store.db", "--db-path"),
@@ -406,66 +456,31 @@ def observe_retries(
     ),
 ) -> None:
     """Summarize retry and failure patterns without mutating state."""
-    repo = PartitionStateRepository(db_path=db_path)
-    states = repo.list_partition_states()
-    if not states:
+    repo = _open_read_only(db_path)
+    attempts = repo.attempt_summary()
+    if not attempts.partitions:
         typer.echo("No partition state records found.")
         raise typer.Exit(code=0)
 
-    total = len(states)
-    failed = [s for s in states if s.status == "failed"]
-    terminal = [
-        s for s in failed if s.error_message and "[terminal]" in s.error_message
-    ]
-    retryable_failed = [s for s in failed if s not in terminal]
-
-    attempt_counts = [s.attempt_count or 0 for s in states]
-    attempt_min = min(attempt_counts) if attempt_counts else 0
-    attempt_max = max(attempt_counts) if attempt_counts else 0
-    attempt_avg = (
-        sum(attempt_counts) / len(attempt_counts) if attempt_counts else 0.0
-    )
+    failed = repo.status_counts().get("failed", 0)
+    terminal = repo.count_terminal()
 
     typer.echo("Retry overview")
-    typer.echo(f"  total partitions: {total}")
-    typer.echo(f"  failed partitions: {len(failed)}")
-    typer.echo(f"  terminal partitions: {len(terminal)}")
-    typer.echo(f"  retryable failed partitions: {len(retryable_failed)}")
+    typer.echo(f"  total partitions: {attempts.partitions}")
+    typer.echo(f"  failed partitions: {failed}")
+    typer.echo(f"  terminal partitions: {terminal}")
+    typer.echo(f"  retryable failed partitions: {failed - terminal}")
     typer.echo(
         "  attempt counts: "
-        f"min={attempt_min} max={attempt_max} avg={attempt_avg:.2f}"
+        f"min={attempts.minimum} max={attempts.maximum} avg={attempts.average:.2f}"
     )
 
-    buckets = {
-        "1-2": 0,
-        "3-5": 0,
-        "6-10": 0,
-        "10+": 0,
-    }
-    for attempts in attempt_counts:
-        if attempts <= 2:
-            buckets["1-2"] += 1
-        elif attempts <= 5:
-            buckets["3-5"] += 1
-        elif attempts <= 10:
-            buckets["6-10"] += 1
-        else:
-            buckets["10+"] += 1
     typer.echo("  attempt histogram:")
-    for label in ("1-2", "3-5", "6-10", "10+"):
-        typer.echo(f"    {label}: {buckets[label]}")
-
-    hot_partitions = sorted(
-        states,
-        key=lambda s: (
-            -(s.attempt_count or 0),
-            s.status != "failed",
-            s.customer_id,
-            s.query_name,
-            s.logical_date.isoformat(),
-        ),
-    )[:top_partitions]
-    typer.echo(f"Top {min(top_partitions, len(states))} partitions by attempts:")
+    for label in ATTEMPT_BUCKETS:
+        typer.echo(f"    {label}: {attempts.histogram[label]}")
+
+    hot_partitions = repo.top_by_attempts(top_partitions)
+    typer.echo(f"Top {len(hot_partitions)} partitions by attempts:")
     for state in hot_partitions:
         typer.echo(
             f"  {state.customer_id} {state.query_name} {state.logical_date.isoformat()} "
@@ -474,22 +489,30 @@ def observe_retries(
         )
 
     if failed:
-        oldest_failed = min(failed, key=lambda s: s.updated_at)
-        newest_failed = max(failed, key=lambda s: s.updated_at)
-        typer.echo(
-            "Oldest failed partition: "
-            f"{oldest_failed.customer_id} {oldest_failed.query_name} "
-            f"{oldest_failed.logical_date.isoformat()} updated_at={oldest_failed.updated_at.isoformat()}"
-        )
-        typer.echo(
-            "Newest failed partition: "
-            f"{newest_failed.customer_id} {newest_failed.query_name} "
-            f"{newest_failed.logical_date.isoformat()} updated_at={newest_failed.updated_at.isoformat()}"
-        )
+        typer.echo("Oldest failed partition: " + _updated_line(repo.oldest_updated("failed")))
+        typer.echo("Newest failed partition: " + _updated_line(repo.newest_updated("failed")))
     else:
         typer.echo("No failed partitions present.")
 
 
+def _open_read_only(db_path: str) -> PartitionStateStore:
+    """Open the state store read-only; exit 1 if it is missing or not migrated."""
+    repo = create_state_store(db_path, read_only=True)
+    try:
+        repo.ensure_schema()
+    except RuntimeError as exc:
+        typer.echo(str(exc), err=True)
+        raise typer.Exit(code=1)
+    return repo
+
+
+def _updated_line(state: PartitionState) -> str:
+    return (
+        f"{state.customer_id} {state.query_name} "
+        f"{state.logical_date.isoformat()} updated_at={state.updated_at.isoformat()}"
+    )
+
+
 @state_app.command("mark-terminal")
 def state_mark_terminal(
     customer_id: Optional[str] = typer.Option(None, "--customer-id"),
@@ -501,8 +524,8 @@ def state_mark_terminal(
     db_path: str = typer.Option("data/state_store.db", "--db-path"),
 ) -> None:
     """Mark failed logical partitions as terminal (no automatic retries)."""
-    repo = PartitionStateRepository(db_path=db_path)
-    if not Path(db_path).exists():
+    repo = create_state_store(db_path)
+    if not state_store_exists(db_path):
         typer.echo("State store not initialized; no records found.")
         raise typer.Exit(code=1)
 
@@ -544,34 +567,26 @@ def state_mark_terminal(
         f"[filters: customer={customer_id}, query={query_name}, since={since}, until={until}, force={force}]"
     )
 
-    failures = 0
+    now = datetime.now(timezone.utc)
+    updates = []
     for state in candidates:
-        log_line = (
-            f"{state.customer_id} {state.query_name} {state.logical_date.isoformat()} "
-            f"attempt_count={state.attempt_count}"
-        )
-        typer.echo(log_line)
-        if dry_run:
-            continue
-        try:
-            repo.upsert_partition_state(
-                PartitionState(
-                    source=state.source,
-                    customer_id=state.customer_id,
-                    query_name=state.query_name,
-                    logical_date=state.logical_date,
-                    status="failed",
-                    current_run_id=state.current_run_id,
-                    schema_version=state.schema_version,
-                    record_count=state.record_count,
-                    updated_at=datetime.now(timezone.utc),
-                    error_message=_terminal_message(state),
-                    attempt_count=state.attempt_count,
-                )
+        typer.echo(_state_log_line(state))
+        updates.append(
+            PartitionState(
+                source=state.source,
+                customer_id=state.customer_id,
+                query_name=state.query_name,
+                logical_date=state.logical_date,
+                status="failed",
+                current_run_id=state.current_run_id,
+                schema_version=state.schema_version,
+                record_count=state.record_count,
+                updated_at=now,
+                error_message=_terminal_message(state),
+                attempt_count=state.attempt_count,
             )
-        except Exception as exc:
-            typer.echo(f"Failed to update {log_line}: {exc}", err=True)
-            failures += 1
+        )
+    failures = 0 if dry_run else _upsert_batch(repo, updates, "update")
 
     if failures:
         raise typer.Exit(code=1)
@@ -579,8 +594,8 @@ def state_mark_terminal(
 
 @state_backfill_app.command("enqueue")
 def state_backfill_enqueue(
-    customer_id: str = typer.Option(..., "--customer-id"),
-    query_name: str = typer.Option(..., "--query-name"),
+    customer_ids: List[str] = typer.Option(..., "--customer-id", help="Repeatable"),
+    query_names: List[str] = typer.Option(..., "--query-name", help="Repeatable"),
     since: str = typer.Option(..., "--since"),
     until: str = typer.Option(..., "--until"),
     dry_run: bool = typer.Option(False, "--dry-run"),
@@ -588,9 +603,12 @@ def state_backfill_enqueue(
     force: bool = typer.Option(False, "--force"),
     db_path: str = typer.Option("data/state_store.db", "--db-path"),
 ) -> None:
-    """Enqueue historical logical partitions as pending."""
-    repo = PartitionStateRepository(db_path=db_path)
-    if not Path(db_path).exists():
+    """Enqueue historical logical partitions as pending.
+
+    Every customer/query/date combination is looked up and written in bulk.
+    """
+    repo = create_state_store(db_path)
+    if not state_store_exists(db_path):
         typer.echo("State store not initialized; no records found.")
         raise typer.Exit(code=1)
 
@@ -606,24 +624,28 @@ def state_backfill_enqueue(
         dates.append(cursor)
         cursor += timedelta(days=1)
 
-    if len(dates) > backfill_threshold and not force:
-        typer.confirm(f"Enqueue {len(dates)} partitions?", abort=True)
+    keys = [
+        ("google_ads", customer_id, query_name, logical_date)
+        for customer_id in dict.fromkeys(customer_ids)
+        for query_name in dict.fromkeys(query_names)
+        for logical_date in dates
+    ]
+    if len(keys) > backfill_threshold and not force:
+        typer.confirm(f"Enqueue {len(keys)} partitions?", abort=True)
 
     typer.echo(
-        f"{'Dry-run' if dry_run else 'Enqueueing'} backfill for customer={customer_id} "
-        f"query={query_name} dates={since}..{until} count={len(dates)} force_pending={force_pending}"
+        f"{'Dry-run' if dry_run else 'Enqueueing'} backfill for "
+        f"customers={','.join(customer_ids)} queries={','.join(query_names)} "
+        f"dates={since}..{until} count={len(keys)} force_pending={force_pending}"
     )
 
-    failures = 0
-    enqueued = 0
+    existing = repo.get_partition_states(keys)
+    now = datetime.now(timezone.utc)
+    updates = []
     skipped = 0
-    for logical_date in dates:
-        state = repo.get_partition_state(
-            source="google_ads",
-            customer_id=customer_id,
-            query_name=query_name,
-            logical_date=logical_date,
-        )
+    for key in keys:
+        source, customer_id, query_name, logical_date = key
+        state = existing.get(key)
         if state and not force_pending:
             typer.echo(
                 f"Skipping {customer_id} {query_name} {logical_date}: status={state.status}"
@@ -634,36 +656,49 @@ def state_backfill_enqueue(
         typer.echo(
             f"{'Would enqueue' if dry_run else 'Enqueueing'} {customer_id} {query_name} {logical_date}"
         )
-        enqueued += 1
-        if dry_run:
-            continue
-        try:
-            repo.upsert_partition_state(
-                PartitionState(
-                    source="google_ads",
-                    customer_id=customer_id,
-                    query_name=query_name,
-                    logical_date=logical_date,
-                    status="pending",
-                    current_run_id=state.current_run_id if state and force_pending else None,
-                    schema_version=state.schema_version if state else None,
-                    record_count=state.record_count if state else None,
-                    updated_at=datetime.now(timezone.utc),
-                    error_message=None,
-                    attempt_count=state.attempt_count if state else 0,
-                )
-            )
-        except Exception as exc:
-            typer.echo(
-                f"Failed to enqueue {customer_id} {query_name} {logical_date}: {exc}", err=True
+        updates.append(
+            PartitionState(
+                source=source,
+                customer_id=customer_id,
+                query_name=query_name,
+                logical_date=logical_date,
+                status="pending",
+                current_run_id=state.current_run_id if state and force_pending else None,
+                schema_version=state.schema_version if state else None,
+                record_count=state.record_count if state else None,
+                updated_at=now,
+                error_message=None,
+                attempt_count=state.attempt_count if state else 0,
             )
-            failures += 1
+        )
+    failures = 0 if dry_run else _upsert_batch(repo, updates, "enqueue")
+    enqueued = len(updates) - failures
 
     typer.echo(f"Enqueued={enqueued} skipped={skipped} failures={failures}")
     if failures:
         raise typer.Exit(code=1)
 
 
+def _state_log_line(state: PartitionState) -> str:
+    return (
+        f"{state.customer_id} {state.query_name} {state.logical_date.isoformat()} "
+        f"attempt_count={state.attempt_count}"
+    )
+
+
+def _upsert_batch(
+    repo: PartitionStateStore, states: list[PartitionState], action: str
+) -> int:
+    """Write ``states`` in one transaction; returns the number of partitions not written."""
+    try:
+        repo.upsert_partition_states(states)
+    except Exception as exc:
+        # The transaction rolled back, so none of the batch was applied.
+        typer.echo(f"Failed to {action} {len(states)} partition(s): {exc}", err=True)
+        return len(states)
+    return 0
+
+
 def _terminal_message(state: PartitionState) -> str:
     base = state.error_message or ""
     marker = "[terminal]"
@@ -672,3 +707,50 @@ def _terminal_message(state: PartitionState) -> str:
     if base:
         return f"{marker} {base}"
     return marker
+
+
+@raw_catalog_app.command("rebuild")
+def raw_catalog_rebuild(
+    catalog_path: str = typer.Option("data/raw_catalog.db", "--catalog-path"),
+) -> None:
+    """Reconstruct the partition catalog by scanning the configured raw sink."""
+    catalog = SQLitePartitionCatalog(catalog_path)
+    count = catalog.rebuild(create_raw_sink(with_catalog=False))
+    typer.echo(f"Catalog rebuilt with {count} finalized partition(s) at {catalog_path}")
+
+
+@raw_catalog_app.command("find")
+def raw_catalog_find(
+    source: Optional[str] = typer.Option(None, "--source"),
+    customer_id: Optional[str] = typer.Option(None, "--customer-id"),
+    query_name: Optional[str] = typer.Option(None, "--query-name"),
+    since: Optional[str] = typer.Option(None, "--since"),
+    until: Optional[str] = typer.Option(None, "--until"),
+    run_id: Optional[str] = typer.Option(None, "--run-id"),
+    catalog_path: str = typer.Option("data/raw_catalog.db", "--catalog-path"),
+) -> None:
+    """List finalized raw partitions from the catalog without scanning storage."""
+    if not Path(catalog_path).exists():
+        typer.echo("Catalog not initialized; run 'gads-etl raw catalog rebuild'.")
+        raise typer.Exit(code=1)
+    entries = SQLitePartitionCatalog(catalog_path).find(
+        source=source,
+        customer_id=customer_id,
+        query_name=query_name,
+        since=date.fromisoformat(since) if since else None,
+        until=date.fromisoformat(until) if until else None,
+        run_id=run_id,
+    )
+    if not entries:
+        typer.echo("No finalized partitions found.")
+        raise typer.Exit(code=0)
+    for entry in entries:
+        key = entry.partition_key
+        typer.echo(
+            f"{key.source} {key.customer_id} {key.query_name} {key.logical_date} "
+            f"run_id={entry.run_id} record_count={entry.record_count}"
+        )
+
+
+if __name__ == "__main__":
+    app()
@@ -70,6 +70,17 @@ class MetadataConfig(BaseModel):
     lookback_days_daily: int = 2
 
 
+class ExecutionConfig(BaseModel):
+    """Parallelism knobs for the extraction pipeline (stream -> convert -> serialize -> write)."""
+
+    converter_workers: int = Field(1, ge=1)
+    serializer_workers: int = Field(1, ge=1)
+    queue_depth: int = Field(1000, ge=1)
+    auto_validate: bool = False  # validate each partition right after finalize
+    validation_workers: int = Field(1, ge=1)
+    validation_check_fields: bool = False
+
+
 class ExtractorsConfig(BaseModel):
     google_ads: GoogleAdsConfig
     google_merchant: GoogleMerchantConfig | None = None
@@ -79,6 +90,7 @@ class PipelineConfig(BaseModel):
     metadata: MetadataConfig
     storage: StorageConfig
     extractors: ExtractorsConfig
+    execution: ExecutionConfig = Field(default_factory=ExecutionConfig)
 
 
 class ConfigLoader:
@@ -14,10 +14,17 @@ from .google_ads_client import load_google_ads_client
 from .raw_sink import PartitionKey, RawSink
 from .raw_sink_factory import create_raw_sink
 from .run_context import RunContext
+from .stage_pipeline import StagedPipeline, StageSpec
+from .state_store_factory import create_state_store
+from .validator import BackgroundValidator, FieldChecks, RawPartitionValidator
 
 logger = logging.getLogger(__name__)
 
 
+def _serialize_row(row: dict) -> bytes:
+    return json.dumps(row).encode("utf-8")
+
+
 class GoogleAdsExtractor:
     """Pulls batched data using the official Google Ads API client."""
 
@@ -42,7 +49,7 @@ class GoogleAdsExtractor:
         logical_date: str,
         start: date,
         end: date,
-    ) -> None:
+    ) -> PartitionKey:
         partition_key = PartitionKey(
             source=self.source_name,
             customer_id=customer_id,
@@ -59,10 +66,45 @@ class GoogleAdsExtractor:
             self.run_context.run_id,
         )
 
-        for row in self._stream_rows(query, ga_query, customer_id):
-            writer.write_payload_row(row)
+        def write(line: bytes) -> None:
+            nonlocal record_count
+            writer.write_serialized_row(line)
             record_count += 1
 
+        execution = self.config.execution
+        stages = StagedPipeline(
+            [
+                StageSpec(
+                    "convert",
+                    lambda row: self._row_to_dict(row, query),
+                    workers=execution.converter_workers,
+                    queue_depth=execution.queue_depth,
+                ),
+                StageSpec(
+                    "serialize",
+                    _serialize_row,
+                    workers=execution.serializer_workers,
+                    queue_depth=execution.queue_depth,
+                ),
+            ],
+            source_name="stream",
+        )
+        try:
+            metrics = stages.run(self._stream_results(ga_query, customer_id), write)
+        except Exception:
+            writer.abort()
+            raise
+        for stage in metrics:
+            logger.debug(
+                "Stage %s workers=%s processed=%s max_queue_depth=%s/%s blocked_seconds=%.3f",
+                stage.name,
+                stage.workers,
+                stage.processed,
+                stage.max_queue_depth,
+                stage.queue_capacity,
+                stage.blocked_seconds,
+            )
+
         metadata = {
             "source": partition_key.source,
             "customer_id": partition_key.customer_id,
@@ -76,18 +118,16 @@ class GoogleAdsExtractor:
             "query_signature": ga_query,
         }
         writer.finalize(metadata)
+        return partition_key
 
-    def _stream_rows(
-        self, query: QueryDefinition, ga_query: str, customer_id: str
-    ) -> Iterable[dict]:
+    def _stream_results(self, ga_query: str, customer_id: str) -> Iterable[object]:
         service = self.client.get_service("GoogleAdsService")
         search_request = self.client.get_type("SearchGoogleAdsStreamRequest")
         search_request.customer_id = customer_id
         search_request.query = ga_query
         stream = service.search_stream(search_request)
         for batch in stream:
-            for row in batch.results:
-                yield self._row_to_dict(row, query)
+            yield from batch.results
 
     def _build_query(self, query: QueryDefinition, start: date, end: date) -> str:
         fields = ", ".join(query.fields)
@@ -136,12 +176,19 @@ class LocalRawWriter:
 
 
 class PipelineRunner:
-    """Coordinates extraction and loading steps."""
+    """Coordinates extraction and loading steps.
+
+    With auto-validation enabled (``execution.auto_validate`` or the
+    ``auto_validate`` argument), every finalized partition is validated on a
+    background worker while the remaining partitions are extracted.
+    """
 
     def __init__(
         self,
         config_loader: ConfigLoader | None = None,
         run_context: RunContext | None = None,
+        auto_validate: bool | None = None,
+        state_db_path: str | Path = "data/state_store.db",
     ) -> None:
         self.config_loader = config_loader or ConfigLoader()
         self.config = self.config_loader.model
@@ -154,6 +201,26 @@ class PipelineRunner:
             self.run_context,
             self.raw_sink,
         )
+        if auto_validate is None:
+            auto_validate = self.config.execution.auto_validate
+        self.background_validator = (
+            self._build_background_validator(state_db_path) if auto_validate else None
+        )
+
+    def _build_background_validator(self, state_db_path: str | Path) -> BackgroundValidator:
+        execution = self.config.execution
+        field_checks = {}
+        if execution.validation_check_fields:
+            field_checks = {
+                query.name: FieldChecks.from_query_fields(query.fields)
+                for query in self.config.extractors.google_ads.ads_resource_queries
+            }
+        validator = RawPartitionValidator(
+            self.raw_sink,
+            create_state_store(state_db_path),
+            field_checks=field_checks,
+        )
+        return BackgroundValidator(validator, workers=execution.validation_workers)
 
     def _build_google_ads_client(self) -> GoogleAdsClient:
         return load_google_ads_client(
@@ -167,15 +234,38 @@ class PipelineRunner:
         start = target_date - timedelta(days=lookback)
         logger.info("Running daily sync for %s - %s", start, target_date)
         logical_date = target_date.isoformat()
-        for query in self.config.extractors.google_ads.ads_resource_queries:
-            for customer_id in self.config.extractors.google_ads.customer_ids:
-                self.extractor.extract_partition(
-                    query=query,
-                    customer_id=customer_id,
-                    logical_date=logical_date,
-                    start=start,
-                    end=target_date,
-                )
+        try:
+            for query in self.config.extractors.google_ads.ads_resource_queries:
+                for customer_id in self.config.extractors.google_ads.customer_ids:
+                    partition_key = self.extractor.extract_partition(
+                        query=query,
+                        customer_id=customer_id,
+                        logical_date=logical_date,
+                        start=start,
+                        end=target_date,
+                    )
+                    if self.background_validator is not None:
+                        self.background_validator.submit(
+                            partition_key, self.run_context.run_id
+                        )
+        except BaseException:
+            # Partitions finalized before a failure are still validated, but a
+            # validation error must not replace the extraction error.
+            try:
+                self._drain_validation()
+            except Exception:
+                logger.exception("Auto-validation failed after an extraction error")
+            raise
+        self._drain_validation()
+
+    def _drain_validation(self) -> None:
+        if self.background_validator is None:
+            return
+        states = self.background_validator.drain()
+        failed = sum(1 for state in states if state.status == "failed")
+        logger.info(
+            "Auto-validation complete | validated=%s failed=%s", len(states), failed
+        )
 
     def historical_catch_up(self, days: int | None = None) -> None:
         window = days or self.config.metadata.catch_up_window_days
@@ -186,12 +276,22 @@ class PipelineRunner:
 
 
 def run_pipeline(
-    mode: str, days: int | None = None, run_context: RunContext | None = None
+    mode: str,
+    days: int | None = None,
+    run_context: RunContext | None = None,
+    auto_validate: bool | None = None,
+    state_db_path: str | Path = "data/state_store.db",
 ) -> None:
-    runner = PipelineRunner(run_context=run_context)
-    if mode == "daily":
-        runner.sync_daily()
-    elif mode == "catch-up":
-        runner.historical_catch_up(days=days)
-    else:
-        raise ValueError(f"Unsupported mode: {mode}")
+    runner = PipelineRunner(
+        run_context=run_context, auto_validate=auto_validate, state_db_path=state_db_path
+    )
+    try:
+        if mode == "daily":
+            runner.sync_daily()
+        elif mode == "catch-up":
+            runner.historical_catch_up(days=days)
+        else:
+            raise ValueError(f"Unsupported mode: {mode}")
+    finally:
+        if runner.background_validator is not None:
+            runner.background_validator.close()
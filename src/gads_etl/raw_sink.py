@@ -1,8 +1,12 @@
 """Vendor-neutral interfaces for raw sink implementations."""
 from __future__ import annotations
 
+import hashlib
 from dataclasses import dataclass
-from typing import Iterable, Mapping, Protocol, Sequence
+from typing import Iterable, Iterator, Mapping, Optional, Protocol, Sequence
+
+PAYLOAD_FILENAME = "payload.jsonl"
+CHECKSUM_ALGORITHM = "blake2b"
 
 
 @dataclass(frozen=True)
@@ -15,25 +19,138 @@ class PartitionKey:
     logical_date: str  # YYYY-MM-DD
 
 
+@dataclass(frozen=True)
+class PayloadChunk:
+    """One payload file of a raw partition.
+
+    Single-file partitions expose ``payload.jsonl`` as their only chunk; chunked
+    partitions list ``payload-00000.jsonl``, ``payload-00001.jsonl``, ... in
+    metadata.json so readers can hand chunks to separate workers.
+    """
+
+    name: str
+    record_count: Optional[int] = None
+    byte_size: Optional[int] = None
+    line_count: Optional[int] = None  # newline count; equals record_count unless blank lines
+    checksum: Optional[str] = None  # "blake2b:<hex>" of the file bytes
+
+
+class PayloadDigest:
+    """Streaming checksum, byte length and line count of one payload file.
+
+    Writers feed it every row as it is written; validators feed it raw blocks
+    read back from storage and compare the results without decoding JSON.
+    """
+
+    def __init__(self) -> None:
+        self._hash = hashlib.blake2b(digest_size=16)
+        self.byte_size = 0
+        self.line_count = 0
+
+    def update_row(self, line: bytes) -> None:
+        """Account for one serialized row and its trailing newline."""
+        self._hash.update(line)
+        self._hash.update(b"\n")
+        self.byte_size += len(line) + 1
+        self.line_count += 1
+
+    def update(self, block: bytes) -> None:
+        """Account for a raw block of payload bytes split at any offset."""
+        self._hash.update(block)
+        self.byte_size += len(block)
+        self.line_count += block.count(b"\n")
+
+    @property
+    def checksum(self) -> str:
+        return f"{CHECKSUM_ALGORITHM}:{self._hash.hexdigest()}"
+
+    def chunk_entry(self, name: str) -> dict:
+        """Return the ``chunks`` entry recorded in metadata.json for this file."""
+        return {
+            "name": name,
+            "record_count": self.line_count,
+            "byte_size": self.byte_size,
+            "line_count": self.line_count,
+            "checksum": self.checksum,
+        }
+
+    def payload_fields(self) -> dict:
+        """Return the top-level metadata fields describing a single-file payload."""
+        return {
+            "payload_byte_size": self.byte_size,
+            "payload_line_count": self.line_count,
+            "payload_checksum": self.checksum,
+        }
+
+
+def chunk_filename(index: int) -> str:
+    return f"payload-{index:05d}.jsonl"
+
+
+def payload_chunks_from_metadata(metadata: Mapping[str, object]) -> list[PayloadChunk]:
+    """Return the chunk list recorded in metadata.json (single-file if absent)."""
+    chunks = metadata.get("chunks")
+    if not chunks:
+        record_count = metadata.get("record_count")
+        return [
+            PayloadChunk(
+                PAYLOAD_FILENAME,
+                int(record_count) if record_count is not None else None,
+                metadata.get("payload_byte_size"),
+                metadata.get("payload_line_count"),
+                metadata.get("payload_checksum"),
+            )
+        ]
+    return [
+        PayloadChunk(
+            name=chunk["name"],
+            record_count=chunk.get("record_count"),
+            byte_size=chunk.get("byte_size"),
+            line_count=chunk.get("line_count"),
+            checksum=chunk.get("checksum"),
+        )
+        for chunk in chunks
+    ]
+
+
 class PartitionWriter(Protocol):
     """Mutable handle for writing exactly one raw partition."""
 
     def write_payload_row(self, row: Mapping[str, object]) -> None:
         """Append a JSON-serializable row destined for payload.jsonl."""
 
+    def write_serialized_row(self, line: bytes) -> None:
+        """Append one row already encoded as UTF-8 JSON (without the trailing newline)."""
+
     def finalize(self, metadata: Mapping[str, object]) -> None:
-        """Persist metadata.json and mark the partition immutable."""
+        """Persist metadata.json and mark the partition immutable.
+
+        Writers add the payload checksum and byte size to the metadata they
+        persist (per file in a ``chunks`` list when a chunk size is set).
+        """
+
+    def abort(self) -> None:
+        """Discard any partially written payload; the writer is unusable afterwards."""
 
 
 class PartitionReader(Protocol):
     """Read-only handle for an immutable raw partition."""
 
     def iter_payload_rows(self) -> Iterable[Mapping[str, object]]:
-        """Yield payload rows in the order they were stored."""
+        """Yield payload rows in the order they were stored, across all chunks."""
 
     def read_metadata(self) -> Mapping[str, object]:
         """Return metadata.json contents."""
 
+    def payload_chunks(self) -> Sequence[PayloadChunk]:
+        """Return the payload files of the partition in row order."""
+
+    def iter_chunk_rows(self, chunk: PayloadChunk) -> Iterable[Mapping[str, object]]:
+        """Yield the rows of one payload chunk in stored order."""
+
+    def iter_chunk_bytes(self, chunk: PayloadChunk) -> Iterable[bytes]:
+        """Yield the raw bytes of one payload chunk in order, in blocks of any size."""
+
 
 class RawSink(Protocol):
     """Backend interface used by extractors/validators to interact with raw storage."""
@@ -47,10 +164,19 @@ class RawSink(Protocol):
     def list_partitions(self, partition_key: PartitionKey) -> Sequence[str]:
         """Return the available run_ids for the partition key."""
 
+    def scan_partitions(self, run_id: Optional[str] = None) -> Iterator[tuple[PartitionKey, str]]:
+        """Yield (partition_key, run_id) for every finalized partition, optionally of one run."""
+
 
 __all__ = [
+    "CHECKSUM_ALGORITHM",
+    "PAYLOAD_FILENAME",
     "PartitionKey",
+    "PayloadChunk",
+    "PayloadDigest",
     "PartitionWriter",
     "PartitionReader",
     "RawSink",
+    "chunk_filename",
+    "payload_chunks_from_metadata",
 ]
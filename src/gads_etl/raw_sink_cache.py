@@ -0,0 +1,246 @@
+"""Size-bounded local disk cache for finalized raw partitions."""
+from __future__ import annotations
+
+import logging
+import os
+import shutil
+import threading
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Optional
+from urllib.parse import quote
+
+from .raw_sink import PartitionKey
+from .raw_sink_local import LocalFilesystemRawSink, _partition_dir
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_MAX_BYTES = 10 * 1024 * 1024 * 1024
+
+
+@dataclass(frozen=True)
+class PartitionCacheStats:
+    """Counters describing cache effectiveness since the cache was opened."""
+
+    hits: int
+    misses: int
+    fills: int
+    evictions: int
+    entries: int
+    bytes_cached: int
+    max_bytes: int
+
+
+class LocalPartitionCache:
+    """Read-through cache of raw partitions keyed by ``(partition_key, run_id)``.
+
+    Finalized partitions are immutable, so entries never go stale and are only
+    removed to stay within ``max_bytes`` (least recently used first). Entries
+    use the filesystem sink layout under ``root`` and are published by renaming
+    a fully written temporary directory, so concurrent fills from threads or
+    processes never expose partial files. Within a process, concurrent misses
+    on the same partition wait for a single fill.
+
+    ``namespace`` (e.g. the bucket and prefix a partition was read from) keeps
+    partitions of different origins apart when several sinks share ``root``.
+    """
+
+    def __init__(
+        self, root: str | Path = "data/raw_cache", max_bytes: int = DEFAULT_CACHE_MAX_BYTES
+    ) -> None:
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self._tmp_root = self.root / ".tmp"
+        self._lock = threading.Lock()
+        # Path -> [lock, threads using it]; dropped once no fill is in progress.
+        self._fill_locks: dict[Path, list] = {}
+        self._entries: OrderedDict[Path, int] = OrderedDict()  # LRU order, oldest first
+        self._bytes = 0
+        self._hits = 0
+        self._misses = 0
+        self._fills = 0
+        self._evictions = 0
+        self._load_entries()
+
+    def lookup(
+        self, partition_key: PartitionKey, run_id: str, namespace: str = ""
+    ) -> Optional[Path]:
+        """Return the cached partition directory, counting a hit or a miss."""
+        directory = self._directory(partition_key, run_id, namespace)
+        found = self._touch(directory)
+        with self._lock:
+            if found:
+                self._hits += 1
+            else:
+                self._misses += 1
+        return directory if found else None
+
+    def get_or_fill(
+        self,
+        partition_key: PartitionKey,
+        run_id: str,
+        fill: Callable[[Path], None],
+        namespace: str = "",
+        expected_bytes: Optional[int] = None,
+    ) -> Optional[Path]:
+        """Return the cached directory, calling ``fill(tmp_dir)`` to populate it on a miss.
+
+        ``fill`` must write every partition file, metadata.json last. Returns
+        None when the partition alone exceeds the byte budget; it is then not
+        retained and the caller should read from the origin instead. Passing
+        ``expected_bytes`` lets an over-budget partition be refused before
+        ``fill`` downloads anything.
+        """
+        directory = self._directory(partition_key, run_id, namespace)
+        if expected_bytes is not None and expected_bytes > self.max_bytes:
+            if self._touch(directory):
+                return directory
+            self._log_over_budget(partition_key, run_id, expected_bytes)
+            return None
+        with self._lock:
+            fill_lock = self._fill_locks.setdefault(directory, [threading.Lock(), 0])
+            fill_lock[1] += 1
+        try:
+            with fill_lock[0]:
+                return self._fill(directory, partition_key, run_id, fill)
+        finally:
+            with self._lock:
+                fill_lock[1] -= 1
+                if not fill_lock[1]:
+                    del self._fill_locks[directory]
+
+    def _fill(
+        self,
+        directory: Path,
+        partition_key: PartitionKey,
+        run_id: str,
+        fill: Callable[[Path], None],
+    ) -> Optional[Path]:
+        if self._touch(directory):
+            return directory
+        self._tmp_root.mkdir(parents=True, exist_ok=True)
+        staging = self._tmp_root / uuid.uuid4().hex
+        staging.mkdir()
+        try:
+            fill(staging)
+            size = _directory_size(staging)
+            if size > self.max_bytes:
+                self._log_over_budget(partition_key, run_id, size)
+                return None
+            directory.parent.mkdir(parents=True, exist_ok=True)
+            try:
+                os.rename(staging, directory)
+            except OSError:
+                # Another process published the same immutable partition first.
+                if not self._touch(directory):
+                    raise
+                return directory
+        finally:
+            shutil.rmtree(staging, ignore_errors=True)
+        with self._lock:
+            self._fills += 1
+            self._add(directory, size)
+            self._evict(keep=directory)
+        return directory
+
+    @staticmethod
+    def _log_over_budget(partition_key: PartitionKey, run_id: str, size: int) -> None:
+        logger.info(
+            "Not caching %s run_id=%s: %s bytes exceeds the cache budget",
+            partition_key,
+            run_id,
+            size,
+        )
+
+    def stats(self) -> PartitionCacheStats:
+        with self._lock:
+            return PartitionCacheStats(
+                hits=self._hits,
+                misses=self._misses,
+                fills=self._fills,
+                evictions=self._evictions,
+                entries=len(self._entries),
+                bytes_cached=self._bytes,
+                max_bytes=self.max_bytes,
+            )
+
+    def clear(self) -> None:
+        """Remove every cached partition."""
+        with self._lock:
+            for directory in list(self._entries):
+                self._remove(directory)
+
+    def _directory(self, partition_key: PartitionKey, run_id: str, namespace: str = "") -> Path:
+        root = self.root / quote(namespace, safe="") if namespace else self.root
+        return _partition_dir(root, partition_key, run_id)
+
+    def _touch(self, directory: Path) -> bool:
+        """Mark ``directory`` most recently used; returns False if it is not cached."""
+        if not (directory / "metadata.json").exists():
+            with self._lock:
+                self._discard(directory)
+            return False
+        with self._lock:
+            if directory in self._entries:
+                self._entries.move_to_end(directory)
+            else:
+                # Filled by another process (or another cache instance) sharing the root.
+                self._add(directory, _directory_size(directory))
+                self._evict(keep=directory)
+        try:
+            os.utime(directory)  # persists recency across restarts
+        except OSError:  # pragma: no cover - evicted concurrently by another process
+            pass
+        return True
+
+    def _load_entries(self) -> None:
+        found = []
+        # Entries sit directly under root or under one namespace directory.
+        roots = [self.root] + [
+            child
+            for child in self.root.iterdir()
+            if child.is_dir() and child != self._tmp_root
+        ]
+        for root in roots:
+            for partition_key, run_id in LocalFilesystemRawSink(root).scan_partitions():
+                directory = _partition_dir(root, partition_key, run_id)
+                found.append((directory.stat().st_mtime, directory))
+        for _, directory in sorted(found):
+            self._add(directory, _directory_size(directory))
+        self._evict()
+
+    def _add(self, directory: Path, size: int) -> None:
+        self._discard(directory)
+        self._entries[directory] = size
+        self._bytes += size
+
+    def _discard(self, directory: Path) -> None:
+        size = self._entries.pop(directory, None)
+        if size is not None:
+            self._bytes -= size
+
+    def _evict(self, keep: Optional[Path] = None) -> None:
+        while self._bytes > self.max_bytes and len(self._entries) > (1 if keep else 0):
+            directory = next(iter(self._entries))
+            if directory == keep:
+                self._entries.move_to_end(directory)
+                continue
+            self._remove(directory)
+            self._evictions += 1
+
+    def _remove(self, directory: Path) -> None:
+        self._discard(directory)
+        # Drop metadata.json first so the entry stops being a hit before its
+        # payload disappears; open memory maps keep working after unlink.
+        (directory / "metadata.json").unlink(missing_ok=True)
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+def _directory_size(directory: Path) -> int:
+    return sum(path.stat().st_size for path in directory.iterdir() if path.is_file())
+
+
+__all__ = ["DEFAULT_CACHE_MAX_BYTES", "LocalPartitionCache", "PartitionCacheStats"]
@@ -0,0 +1,397 @@
+"""Queryable index of finalized raw partitions."""
+from __future__ import annotations
+
+import sqlite3
+from dataclasses import dataclass
+from datetime import date, datetime, timezone
+from pathlib import Path
+from typing import Iterator, Mapping, Optional, Sequence
+
+from .raw_sink import PartitionKey, PartitionReader, PartitionWriter, RawSink
+
+
+@dataclass(frozen=True)
+class CatalogEntry:
+    """One finalized raw partition as recorded in the catalog."""
+
+    partition_key: PartitionKey
+    run_id: str
+    record_count: Optional[int]
+    schema_version: Optional[str]
+    finalized_at: str
+
+
+class SQLitePartitionCatalog:
+    """SQLite-backed catalog answering partition lookups without scanning storage.
+
+    Rows are written when a partition is finalized and can be rebuilt from the
+    sink at any time, so the catalog is an index rather than a source of truth.
+    A partition is noted as pending before its metadata is sealed and moved
+    into the catalog afterwards; ``reconcile`` settles pending rows left by a
+    crash between the two.
+    """
+
+    def __init__(self, db_path: str | Path = "data/raw_catalog.db") -> None:
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.ensure_schema()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def ensure_schema(self) -> None:
+        with self._connect() as conn:
+            conn.executescript(
+                """
+                CREATE TABLE IF NOT EXISTS raw_partition_catalog (
+                    source TEXT NOT NULL,
+                    customer_id TEXT NOT NULL,
+                    query_name TEXT NOT NULL,
+                    logical_date DATE NOT NULL,
+                    run_id TEXT NOT NULL,
+                    record_count BIGINT,
+                    schema_version TEXT,
+                    finalized_at TIMESTAMPTZ NOT NULL,
+                    PRIMARY KEY (source, customer_id, query_name, logical_date, run_id)
+                );
+                CREATE INDEX IF NOT EXISTS idx_raw_catalog_customer_date
+                    ON raw_partition_catalog (customer_id, logical_date);
+                CREATE INDEX IF NOT EXISTS idx_raw_catalog_query_date
+                    ON raw_partition_catalog (query_name, logical_date);
+                CREATE INDEX IF NOT EXISTS idx_raw_catalog_run
+                    ON raw_partition_catalog (run_id);
+                CREATE TABLE IF NOT EXISTS raw_partition_pending (
+                    source TEXT NOT NULL,
+                    customer_id TEXT NOT NULL,
+                    query_name TEXT NOT NULL,
+                    logical_date DATE NOT NULL,
+                    run_id TEXT NOT NULL,
+                    record_count BIGINT,
+                    schema_version TEXT,
+                    finalized_at TIMESTAMPTZ NOT NULL,
+                    PRIMARY KEY (source, customer_id, query_name, logical_date, run_id)
+                );
+                CREATE TABLE IF NOT EXISTS raw_catalog_backfill (
+                    id INTEGER PRIMARY KEY CHECK (id = 1),
+                    backfilled_at TIMESTAMPTZ NOT NULL
+                );
+                """
+            )
+
+    def record(
+        self,
+        partition_key: PartitionKey,
+        run_id: str,
+        metadata: Mapping[str, object],
+    ) -> None:
+        """Register a finalized partition (idempotent) and clear its pending row."""
+        with self._connect() as conn:
+            conn.execute(_UPSERT_SQL, _entry_params(partition_key, run_id, metadata))
+            conn.execute(_DELETE_PENDING_SQL, _key_params(partition_key, run_id))
+
+    def record_pending(
+        self,
+        partition_key: PartitionKey,
+        run_id: str,
+        metadata: Mapping[str, object],
+    ) -> None:
+        """Note a partition that is about to be sealed."""
+        with self._connect() as conn:
+            conn.execute(_PENDING_SQL, _entry_params(partition_key, run_id, metadata))
+
+    def discard_pending(self, partition_key: PartitionKey, run_id: str) -> None:
+        """Forget a pending partition whose finalize failed."""
+        with self._connect() as conn:
+            conn.execute(_DELETE_PENDING_SQL, _key_params(partition_key, run_id))
+
+    def reconcile(self, sink: RawSink) -> int:
+        """Move pending partitions that ``sink`` has sealed into the catalog.
+
+        Pending rows whose partition is not sealed yet belong to writers still
+        running (or to crashed ones that never sealed) and are left alone.
+        """
+        with self._connect() as conn:
+            pending = conn.execute("SELECT * FROM raw_partition_pending").fetchall()
+        sealed = []
+        for row in pending:
+            entry = _row_to_entry(row)
+            try:
+                sink.open_partition(entry.partition_key, entry.run_id).read_metadata()
+            except FileNotFoundError:
+                continue
+            sealed.append(tuple(row))
+        if sealed:
+            with self._connect() as conn:
+                conn.executemany(_UPSERT_SQL, sealed)
+                conn.executemany(_DELETE_PENDING_SQL, [row[:5] for row in sealed])
+        return len(sealed)
+
+    def find(
+        self,
+        source: Optional[str] = None,
+        customer_id: Optional[str] = None,
+        query_name: Optional[str] = None,
+        since: Optional[date] = None,
+        until: Optional[date] = None,
+        run_id: Optional[str] = None,
+    ) -> list[CatalogEntry]:
+        """Return finalized partitions matching any subset of the filters."""
+        where_clauses = []
+        params: list[str] = []
+        for column, value in (
+            ("source", source),
+            ("customer_id", customer_id),
+            ("query_name", query_name),
+            ("run_id", run_id),
+        ):
+            if value:
+                where_clauses.append(f"{column} = ?")
+                params.append(value)
+        if since:
+            where_clauses.append("logical_date >= ?")
+            params.append(since.isoformat())
+        if until:
+            where_clauses.append("logical_date <= ?")
+            params.append(until.isoformat())
+
+        where_sql = ""
+        if where_clauses:
+            where_sql = "WHERE " + " AND ".join(where_clauses)
+
+        with self._connect() as conn:
+            rows = conn.execute(
+                f"""
+                SELECT *
+                  FROM raw_partition_catalog
+                  {where_sql}
+                 ORDER BY source, customer_id, query_name, logical_date, run_id
+                """,
+                tuple(params),
+            ).fetchall()
+        return [_row_to_entry(row) for row in rows]
+
+    def run_ids(self, partition_key: PartitionKey) -> list[str]:
+        """Return finalized run_ids for a logical partition in ascending order."""
+        with self._connect() as conn:
+            rows = conn.execute(
+                """
+                SELECT run_id
+                  FROM raw_partition_catalog
+                 WHERE source=? AND customer_id=? AND query_name=? AND logical_date=?
+                 ORDER BY run_id
+                """,
+                (
+                    partition_key.source,
+                    partition_key.customer_id,
+                    partition_key.query_name,
+                    partition_key.logical_date,
+                ),
+            ).fetchall()
+        return [row["run_id"] for row in rows]
+
+    def is_backfilled(self) -> bool:
+        """True once the catalog has been filled from storage by ``backfill`` or ``rebuild``."""
+        with self._connect() as conn:
+            return conn.execute("SELECT 1 FROM raw_catalog_backfill").fetchone() is not None
+
+    def rebuild(self, sink: RawSink) -> int:
+        """Replace the catalog contents with every finalized partition in ``sink``."""
+        params = _scan_entries(sink)
+        with self._connect() as conn:
+            conn.execute("DELETE FROM raw_partition_catalog")
+            conn.executemany(_UPSERT_SQL, params)
+            _mark_backfilled(conn)
+        return len(params)
+
+    def backfill(self, sink: RawSink) -> int:
+        """Add every finalized partition in ``sink`` without dropping existing rows.
+
+        Safe to run while other writers record partitions, unlike ``rebuild``.
+        """
+        params = _scan_entries(sink)
+        with self._connect() as conn:
+            conn.executemany(_BACKFILL_SQL, params)
+            _mark_backfilled(conn)
+        return len(params)
+
+
+class CatalogedRawSink(RawSink):
+    """RawSink decorator that records finalized partitions in a catalog.
+
+    A catalog that was never filled from storage is backfilled from the inner
+    sink when it is wrapped, so enabling the catalog on a populated sink does
+    not hide older partitions. Listings are served from the catalog after
+    settling any pending partitions.
+    """
+
+    def __init__(self, inner: RawSink, catalog: SQLitePartitionCatalog) -> None:
+        self.inner = inner
+        self.catalog = catalog
+        if not catalog.is_backfilled():
+            catalog.backfill(inner)
+
+    def write_partition(self, partition_key: PartitionKey, run_id: str) -> PartitionWriter:
+        writer = self.inner.write_partition(partition_key, run_id)
+        return _CatalogingPartitionWriter(writer, self.catalog, partition_key, run_id)
+
+    def open_partition(self, partition_key: PartitionKey, run_id: str) -> PartitionReader:
+        return self.inner.open_partition(partition_key, run_id)
+
+    def list_partitions(self, partition_key: PartitionKey) -> Sequence[str]:
+        self.catalog.reconcile(self.inner)
+        return self.catalog.run_ids(partition_key)
+
+    def scan_partitions(self, run_id: Optional[str] = None) -> Iterator[tuple[PartitionKey, str]]:
+        # Indexed lookup instead of listing the whole sink.
+        self.catalog.reconcile(self.inner)
+        entries = self.catalog.find(run_id=run_id)
+        return iter([(entry.partition_key, entry.run_id) for entry in entries])
+
+
+class _CatalogingPartitionWriter(PartitionWriter):
+    def __init__(
+        self,
+        inner: PartitionWriter,
+        catalog: SQLitePartitionCatalog,
+        partition_key: PartitionKey,
+        run_id: str,
+    ) -> None:
+        self._inner = inner
+        self._catalog = catalog
+        self._partition_key = partition_key
+        self._run_id = run_id
+
+    def write_payload_row(self, row: Mapping[str, object]) -> None:
+        self._inner.write_payload_row(row)
+
+    def write_serialized_row(self, line: bytes) -> None:
+        self._inner.write_serialized_row(line)
+
+    def finalize(self, metadata: Mapping[str, object]) -> None:
+        # Pending first: a crash after the seal is settled by ``reconcile``.
+        self._catalog.record_pending(self._partition_key, self._run_id, metadata)
+        try:
+            self._inner.finalize(metadata)
+        except Exception:
+            self._catalog.discard_pending(self._partition_key, self._run_id)
+            raise
+        self._catalog.record(self._partition_key, self._run_id, metadata)
+
+    def abort(self) -> None:
+        self._inner.abort()
+
+
+_UPSERT_SQL = """
+    INSERT INTO raw_partition_catalog (
+        source,
+        customer_id,
+        query_name,
+        logical_date,
+        run_id,
+        record_count,
+        schema_version,
+        finalized_at
+    )
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT(source, customer_id, query_name, logical_date, run_id) DO UPDATE SET
+        record_count=excluded.record_count,
+        schema_version=excluded.schema_version,
+        finalized_at=excluded.finalized_at
+"""
+
+
+_BACKFILL_SQL = """
+    INSERT OR IGNORE INTO raw_partition_catalog (
+        source,
+        customer_id,
+        query_name,
+        logical_date,
+        run_id,
+        record_count,
+        schema_version,
+        finalized_at
+    )
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+
+_PENDING_SQL = """
+    INSERT OR REPLACE INTO raw_partition_pending (
+        source,
+        customer_id,
+        query_name,
+        logical_date,
+        run_id,
+        record_count,
+        schema_version,
+        finalized_at
+    )
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+
+_DELETE_PENDING_SQL = """
+    DELETE FROM raw_partition_pending
+     WHERE source=? AND customer_id=? AND query_name=? AND logical_date=? AND run_id=?
+"""
+
+
+def _mark_backfilled(conn: sqlite3.Connection) -> None:
+    conn.execute(
+        "INSERT OR REPLACE INTO raw_catalog_backfill (id, backfilled_at) VALUES (1, ?)",
+        (datetime.now(timezone.utc).isoformat(),),
+    )
+
+
+def _key_params(partition_key: PartitionKey, run_id: str) -> tuple:
+    return (
+        partition_key.source,
+        partition_key.customer_id,
+        partition_key.query_name,
+        partition_key.logical_date,
+        run_id,
+    )
+
+
+def _scan_entries(sink: RawSink) -> list[tuple]:
+    params = []
+    for partition_key, run_id in sink.scan_partitions():
+        metadata = sink.open_partition(partition_key, run_id).read_metadata()
+        params.append(_entry_params(partition_key, run_id, metadata))
+    return params
+
+
+def _entry_params(
+    partition_key: PartitionKey, run_id: str, metadata: Mapping[str, object]
+) -> tuple:
+    record_count = metadata.get("record_count")
+    return (
+        partition_key.source,
+        partition_key.customer_id,
+        partition_key.query_name,
+        partition_key.logical_date,
+        run_id,
+        int(record_count) if record_count is not None else None,
+        metadata.get("schema_version"),
+        metadata.get("extracted_at") or datetime.now(timezone.utc).isoformat(),
+    )
+
+
+def _row_to_entry(row: sqlite3.Row) -> CatalogEntry:
+    return CatalogEntry(
+        partition_key=PartitionKey(
+            source=row["source"],
+            customer_id=row["customer_id"],
+            query_name=row["query_name"],
+            logical_date=row["logical_date"],
+        ),
+        run_id=row["run_id"],
+        record_count=row["record_count"],
+        schema_version=row["schema_version"],
+        finalized_at=row["finalized_at"],
+    )
+
+
+__all__ = ["CatalogEntry", "CatalogedRawSink", "SQLitePartitionCatalog"]
@@ -6,15 +6,32 @@ import os
 from pathlib import Path
 
 from .raw_sink import RawSink
+from .raw_sink_cache import DEFAULT_CACHE_MAX_BYTES, LocalPartitionCache
+from .raw_sink_catalog import CatalogedRawSink, SQLitePartitionCatalog
 from .raw_sink_local import LocalFilesystemRawSink
-from .raw_sink_object import ObjectStorageRawSink, S3Config
+from .raw_sink_object import (
+    DEFAULT_MAX_CONCURRENCY,
+    DEFAULT_MAX_POOL_CONNECTIONS,
+    DEFAULT_PART_SIZE,
+    ObjectStorageRawSink,
+    S3Config,
+)
 
 
-def create_raw_sink() -> RawSink:
+def create_raw_sink(with_catalog: bool = True) -> RawSink:
+    sink = _create_backend()
+    catalog_path = os.getenv("RAW_SINK_CATALOG_PATH")
+    if with_catalog and catalog_path:
+        return CatalogedRawSink(sink, SQLitePartitionCatalog(catalog_path))
+    return sink
+
+
+def _create_backend() -> RawSink:
     backend = os.getenv("RAW_SINK", "filesystem").lower()
+    chunk_size = int(os.getenv("RAW_SINK_CHUNK_SIZE", 0))
     if backend == "filesystem":
         root = os.getenv("RAW_SINK_ROOT", "data/raw")
-        return LocalFilesystemRawSink(Path(root))
+        return LocalFilesystemRawSink(Path(root), chunk_size=chunk_size)
     if backend == "object":
         bucket = os.getenv("RAW_SINK_BUCKET")
         prefix = os.getenv("RAW_SINK_PREFIX", "raw")
@@ -28,6 +45,31 @@ def create_raw_sink() -> RawSink:
                 region=os.getenv("RAW_SINK_REGION"),
                 access_key=os.getenv("RAW_SINK_ACCESS_KEY_ID"),
                 secret_key=os.getenv("RAW_SINK_SECRET_ACCESS_KEY"),
-            )
+                multipart_part_size=int(
+                    os.getenv("RAW_SINK_MULTIPART_PART_SIZE", DEFAULT_PART_SIZE)
+                ),
+                multipart_max_concurrency=int(
+                    os.getenv("RAW_SINK_MULTIPART_CONCURRENCY", DEFAULT_MAX_CONCURRENCY)
+                ),
+                read_range_size=int(os.getenv("RAW_SINK_READ_RANGE_SIZE", 0)),
+                read_max_concurrency=int(
+                    os.getenv("RAW_SINK_READ_CONCURRENCY", DEFAULT_MAX_CONCURRENCY)
+                ),
+                max_pool_connections=int(
+                    os.getenv("RAW_SINK_MAX_POOL_CONNECTIONS", DEFAULT_MAX_POOL_CONNECTIONS)
+                ),
+                conditional_writes=os.getenv("RAW_SINK_CONDITIONAL_WRITES", "true").lower()
+                in ("1", "true", "yes"),
+                chunk_size=chunk_size,
+            ),
+            cache=_create_cache(),
         )
     raise RuntimeError(f"Unsupported RAW_SINK backend: {backend}")
+
+
+def _create_cache() -> LocalPartitionCache | None:
+    cache_dir = os.getenv("RAW_SINK_CACHE_DIR")
+    if not cache_dir:
+        return None
+    max_bytes = int(os.getenv("RAW_SINK_CACHE_MAX_BYTES", DEFAULT_CACHE_MAX_BYTES))
+    return LocalPartitionCache(Path(cache_dir), max_bytes=max_bytes)
@@ -1,11 +1,31 @@
 """Filesystem-backed RawSink implementation."""
 from __future__ import annotations
 
+import glob
 import json
+import mmap
+import os
+import random
+import sys
+from array import array
+from bisect import bisect_right
+from functools import partial
 from pathlib import Path
-from typing import Iterable, Mapping, Sequence
+from typing import BinaryIO, Iterable, Iterator, Mapping, Sequence
 
-from .raw_sink import PartitionKey, PartitionReader, PartitionWriter, RawSink
+from .raw_sink import (
+    PAYLOAD_FILENAME,
+    PartitionKey,
+    PartitionReader,
+    PartitionWriter,
+    PayloadChunk,
+    PayloadDigest,
+    RawSink,
+    chunk_filename,
+    payload_chunks_from_metadata,
+)
+
+_READ_BLOCK_SIZE = 1024 * 1024
 
 
 def _logical_dir(root: Path, key: PartitionKey) -> Path:
@@ -22,70 +42,382 @@ def _partition_dir(root: Path, key: PartitionKey, run_id: str) -> Path:
     return _logical_dir(root, key) / f"run_id={run_id}"
 
 
+def _build_offset_index(data: bytes | mmap.mmap) -> array:
+    """Return start offsets of every non-blank line followed by the data length."""
+    offsets = array("Q")
+    size = len(data)
+    position = 0
+    while position < size:
+        newline = data.find(b"\n", position)
+        end = size if newline < 0 else newline
+        if data[position:end].strip():
+            offsets.append(position)
+        position = end + 1
+    offsets.append(size)
+    return offsets
+
+
+def _save_offset_index(path: Path, offsets: array) -> None:
+    data = array("Q", offsets)
+    if sys.byteorder == "big":
+        data.byteswap()  # persisted little-endian
+    tmp_path = path.with_name(path.name + ".tmp")
+    with tmp_path.open("wb") as handle:
+        data.tofile(handle)
+    os.replace(tmp_path, path)
+
+
+def _write_offset_index(payload_path: Path, index_path: Path) -> None:
+    """Persist the offset index of an existing payload file, reading it line by line."""
+    offsets = array("Q")
+    position = 0
+    with payload_path.open("rb") as handle:
+        for line in handle:
+            if line.strip():
+                offsets.append(position)
+            position += len(line)
+    offsets.append(position)
+    _save_offset_index(index_path, offsets)
+
+
+def _load_offset_index(path: Path) -> array | None:
+    if not path.exists():
+        return None
+    offsets = array("Q")
+    offsets.frombytes(path.read_bytes())
+    if sys.byteorder == "big":
+        offsets.byteswap()
+    return offsets
+
+
 class LocalFilesystemPartitionWriter(PartitionWriter):
-    """Writes raw partitions to the local filesystem."""
+    """Writes raw partitions to the local filesystem.
+
+    Row start offsets are tracked while writing and persisted next to each
+    payload file as a ``.idx`` file at finalize, giving readers O(1) row counts
+    and random access without a scan. The checksum and byte size of each file
+    are computed while streaming and recorded in metadata.json.
 
-    def __init__(self, payload_path: Path, metadata_path: Path) -> None:
+    With ``chunk_size`` set, the payload rolls over to ``payload-00000.jsonl``,
+    ``payload-00001.jsonl``, ... once a file reaches that many bytes and the
+    chunk list is added to metadata.json.
+    """
+
+    def __init__(
+        self,
+        payload_path: Path,
+        metadata_path: Path,
+        index_path: Path,
+        chunk_size: int = 0,
+    ) -> None:
         self._payload_path = payload_path
         self._metadata_path = metadata_path
+        self._index_path = index_path
+        self._chunk_size = chunk_size
         self._finalized = metadata_path.exists()
         self._payload_path.parent.mkdir(parents=True, exist_ok=True)
+        self._handle: BinaryIO | None = None
+        self._position = 0
+        self._offsets: array | None = array("Q")
+        self._digest: PayloadDigest | None = PayloadDigest()
+        self._chunks: list[dict] = []
+        if chunk_size > 0:
+            self._payload_path, self._index_path = self._chunk_paths(0)
 
     def _ensure_not_finalized(self) -> None:
         if self._finalized:
             raise RuntimeError("Partition already finalized; cannot write.")
 
+    def _chunk_paths(self, index: int) -> tuple[Path, Path]:
+        payload_path = self._metadata_path.parent / chunk_filename(index)
+        return payload_path, payload_path.with_suffix(".idx")
+
+    def _open_payload(self) -> BinaryIO:
+        if self._handle is None:
+            if self._chunk_size > 0 and not self._chunks:
+                # Chunk boundaries are not resumable; restart from a clean slate.
+                self._remove_chunk_files()
+            self._handle = self._payload_path.open("ab")
+            self._position = self._handle.tell()
+            if self._position:
+                # Resuming a partial write; rebuild index and digest from disk at finalize.
+                self._offsets = None
+                self._digest = None
+        return self._handle
+
     def write_payload_row(self, row: Mapping[str, object]) -> None:
+        self.write_serialized_row(json.dumps(row).encode("utf-8"))
+
+    def write_serialized_row(self, line: bytes) -> None:
         self._ensure_not_finalized()
-        with self._payload_path.open("a", encoding="utf-8") as handle:
-            handle.write(json.dumps(row))
-            handle.write("\n")
+        handle = self._open_payload()
+        if self._offsets is not None:
+            self._offsets.append(self._position)
+        if self._digest is not None:
+            self._digest.update_row(line)
+        handle.write(line)
+        handle.write(b"\n")
+        self._position += len(line) + 1
+        if self._chunk_size > 0 and self._position >= self._chunk_size:
+            self._close_payload()
+            self._payload_path, self._index_path = self._chunk_paths(len(self._chunks))
 
     def finalize(self, metadata: Mapping[str, object]) -> None:
         self._ensure_not_finalized()
+        if self._handle is not None or not self._chunks:
+            self._close_payload()
+        if self._chunk_size > 0:
+            metadata = {**metadata, "chunks": self._chunks}
+        else:
+            chunk = self._chunks[-1]
+            metadata = {
+                **metadata,
+                "payload_byte_size": chunk["byte_size"],
+                "payload_line_count": chunk["line_count"],
+                "payload_checksum": chunk["checksum"],
+            }
         with self._metadata_path.open("w", encoding="utf-8") as handle:
             json.dump(metadata, handle, ensure_ascii=False)
         self._finalized = True
 
+    def abort(self) -> None:
+        if self._finalized:
+            return
+        if self._handle is not None:
+            self._handle.close()
+            self._handle = None
+        self._payload_path.unlink(missing_ok=True)
+        self._index_path.unlink(missing_ok=True)
+        if self._chunk_size > 0:
+            self._remove_chunk_files()
+
+    def _close_payload(self) -> None:
+        """Close the current payload file and persist its offset index."""
+        self._open_payload().close()
+        self._handle = None
+        offsets = self._offsets
+        digest = self._digest
+        if offsets is None or digest is None:
+            data = self._payload_path.read_bytes()
+            offsets = _build_offset_index(data)
+            digest = PayloadDigest()
+            digest.update(data)
+        else:
+            offsets.append(self._position)
+        _save_offset_index(self._index_path, offsets)
+        entry = digest.chunk_entry(self._payload_path.name)
+        entry["record_count"] = len(offsets) - 1  # resumed files may hold blank lines
+        self._chunks.append(entry)
+        self._offsets = array("Q")
+        self._digest = PayloadDigest()
+        self._position = 0
 
-class LocalFilesystemPartitionReader(PartitionReader):
-    """Reads raw partitions from the local filesystem."""
+    def _remove_chunk_files(self) -> None:
+        for pattern in ("payload-*.jsonl", "payload-*.idx"):
+            for path in self._metadata_path.parent.glob(pattern):
+                path.unlink(missing_ok=True)
 
-    def __init__(self, payload_path: Path, metadata_path: Path) -> None:
+
+class _MappedPayload:
+    """One memory-mapped payload file addressed through its line-offset index."""
+
+    def __init__(self, payload_path: Path, index_path: Path) -> None:
         self._payload_path = payload_path
-        self._metadata_path = metadata_path
+        self._index_path = index_path
+        self._mapped: mmap.mmap | bytes | None = None
+        self._offsets: array | None = None
 
-    def iter_payload_rows(self) -> Iterable[Mapping[str, object]]:
-        with self._payload_path.open("r", encoding="utf-8") as handle:
+    def row_count(self) -> int:
+        return len(self.index()) - 1
+
+    def read_row(self, position: int) -> Mapping[str, object]:
+        offsets = self.index()
+        return json.loads(self.data()[offsets[position] : offsets[position + 1]])
+
+    def iter_rows(self, start: int, stop: int) -> Iterator[Mapping[str, object]]:
+        offsets = self.index()
+        data = self.data()
+        for position in range(start, stop):
+            yield json.loads(data[offsets[position] : offsets[position + 1]])
+
+    def iter_all_rows(self) -> Iterator[Mapping[str, object]]:
+        """Stream every row line by line; needs neither the mapping nor the index."""
+        with self._payload_path.open("rb") as handle:
             for line in handle:
                 if line.strip():
                     yield json.loads(line)
 
+    def iter_bytes(self) -> Iterator[bytes]:
+        with self._payload_path.open("rb") as handle:
+            yield from iter(partial(handle.read, _READ_BLOCK_SIZE), b"")
+
+    def close(self) -> None:
+        if isinstance(self._mapped, mmap.mmap):
+            self._mapped.close()
+        self._mapped = None
+
+    def data(self) -> mmap.mmap | bytes:
+        if self._mapped is None:
+            with self._payload_path.open("rb") as handle:
+                size = os.fstat(handle.fileno()).st_size
+                # mmap cannot map empty files.
+                self._mapped = (
+                    mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) if size else b""
+                )
+        return self._mapped
+
+    def index(self) -> array:
+        if self._offsets is None:
+            data = self.data()
+            offsets = _load_offset_index(self._index_path)
+            if not offsets or offsets[-1] != len(data):
+                offsets = _build_offset_index(data)
+            self._offsets = offsets
+        return self._offsets
+
+
+class LocalFilesystemPartitionReader(PartitionReader):
+    """Reads raw partitions from the local filesystem.
+
+    Full scans (``iter_payload_rows``/``iter_chunk_rows``) stream each file
+    line by line. Row counts, random access, slices and samples memory-map
+    the payload and address it through its line-offset index, so they never
+    decode rows they do not return; use the reader as a context manager (or
+    call ``close``) to release those mappings. Row positions span all chunks
+    of a chunked partition. Workers may each open a reader and process
+    disjoint slices or chunks of the same partition while sharing the page
+    cache.
+    """
+
+    def __init__(
+        self,
+        payload_path: Path,
+        metadata_path: Path,
+        index_path: Path | None = None,
+        metadata: Mapping[str, object] | None = None,
+    ) -> None:
+        self._payload_path = payload_path
+        self._metadata_path = metadata_path
+        self._index_path = index_path or payload_path.with_suffix(".idx")
+        self._metadata = metadata
+        self._files: dict[str, _MappedPayload] = {}
+        self._starts: list[int] | None = None
+
+    def __enter__(self) -> LocalFilesystemPartitionReader:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def iter_payload_rows(self) -> Iterable[Mapping[str, object]]:
+        for chunk in self.payload_chunks():
+            yield from self.iter_chunk_rows(chunk)
+
     def read_metadata(self) -> Mapping[str, object]:
-        with self._metadata_path.open("r", encoding="utf-8") as handle:
-            return json.load(handle)
+        if self._metadata is None:
+            with self._metadata_path.open("r", encoding="utf-8") as handle:
+                self._metadata = json.load(handle)
+        return self._metadata
+
+    def payload_chunks(self) -> Sequence[PayloadChunk]:
+        return payload_chunks_from_metadata(self.read_metadata())
+
+    def iter_chunk_rows(self, chunk: PayloadChunk) -> Iterator[Mapping[str, object]]:
+        return self._file(chunk.name).iter_all_rows()
+
+    def iter_chunk_bytes(self, chunk: PayloadChunk) -> Iterator[bytes]:
+        return self._file(chunk.name).iter_bytes()
+
+    def row_count(self) -> int:
+        return self._row_starts()[-1]
+
+    def read_row(self, position: int) -> Mapping[str, object]:
+        starts = self._row_starts()
+        if position < 0:
+            position += starts[-1]
+        if not 0 <= position < starts[-1]:
+            raise IndexError("row index out of range")
+        chunk = bisect_right(starts, position) - 1
+        return self._chunk_file(chunk).read_row(position - starts[chunk])
+
+    def iter_rows(self, start: int = 0, stop: int | None = None) -> Iterator[Mapping[str, object]]:
+        """Yield rows ``start <= i < stop`` in stored order."""
+        starts = self._row_starts()
+        start, stop, _ = slice(start, stop).indices(starts[-1])
+        for chunk in range(len(starts) - 1):
+            lower = max(start, starts[chunk])
+            upper = min(stop, starts[chunk + 1])
+            if lower < upper:
+                yield from self._chunk_file(chunk).iter_rows(
+                    lower - starts[chunk], upper - starts[chunk]
+                )
+
+    def sample_rows(self, count: int, seed: int | None = None) -> list[Mapping[str, object]]:
+        """Return up to ``count`` uniformly sampled rows in stored order."""
+        total = self.row_count()
+        positions = sorted(random.Random(seed).sample(range(total), min(count, total)))
+        return [self.read_row(position) for position in positions]
+
+    def close(self) -> None:
+        """Release the memory mappings opened for random access."""
+        for payload in self._files.values():
+            payload.close()
+
+    def _file(self, name: str) -> _MappedPayload:
+        payload = self._files.get(name)
+        if payload is None:
+            if name == PAYLOAD_FILENAME:
+                payload = _MappedPayload(self._payload_path, self._index_path)
+            else:
+                path = self._metadata_path.parent / name
+                payload = _MappedPayload(path, path.with_suffix(".idx"))
+            self._files[name] = payload
+        return payload
+
+    def _chunk_file(self, chunk: int) -> _MappedPayload:
+        return self._file(self.payload_chunks()[chunk].name)
+
+    def _row_starts(self) -> list[int]:
+        """Cumulative row counts: chunk ``i`` holds rows ``starts[i]:starts[i + 1]``."""
+        if self._starts is None:
+            starts = [0]
+            for chunk in self.payload_chunks():
+                starts.append(starts[-1] + self._file(chunk.name).row_count())
+            self._starts = starts
+        return self._starts
 
 
 class LocalFilesystemRawSink(RawSink):
     """Raw sink that persists partitions under the canonical directory layout."""
 
-    def __init__(self, root: Path | str = Path("data/raw")) -> None:
+    def __init__(self, root: Path | str = Path("data/raw"), chunk_size: int = 0) -> None:
         self._root = Path(root)
         self._root.mkdir(parents=True, exist_ok=True)
+        self.chunk_size = chunk_size  # bytes per payload file; 0 keeps one file
 
     def write_partition(self, partition_key: PartitionKey, run_id: str) -> PartitionWriter:
         directory = _partition_dir(self._root, partition_key, run_id)
-        payload_path = directory / "payload.jsonl"
+        payload_path = directory / PAYLOAD_FILENAME
         metadata_path = directory / "metadata.json"
-        return LocalFilesystemPartitionWriter(payload_path, metadata_path)
+        index_path = directory / "payload.idx"
+        return LocalFilesystemPartitionWriter(
+            payload_path, metadata_path, index_path, chunk_size=self.chunk_size
+        )
 
     def open_partition(self, partition_key: PartitionKey, run_id: str) -> PartitionReader:
         directory = _partition_dir(self._root, partition_key, run_id)
-        payload_path = directory / "payload.jsonl"
+        payload_path = directory / PAYLOAD_FILENAME
         metadata_path = directory / "metadata.json"
-        if not payload_path.exists() or not metadata_path.exists():
+        if not metadata_path.exists():
             raise FileNotFoundError(f"Partition not found: {directory}")
-        return LocalFilesystemPartitionReader(payload_path, metadata_path)
+        with metadata_path.open("r", encoding="utf-8") as handle:
+            metadata = json.load(handle)
+        for chunk in payload_chunks_from_metadata(metadata):
+            if not (directory / chunk.name).exists():
+                raise FileNotFoundError(f"Partition payload missing: {directory / chunk.name}")
+        return LocalFilesystemPartitionReader(
+            payload_path, metadata_path, directory / "payload.idx", metadata=metadata
+        )
 
     def list_partitions(self, partition_key: PartitionKey) -> Sequence[str]:
         logical_dir = _logical_dir(self._root, partition_key)
@@ -98,6 +430,22 @@ class LocalFilesystemRawSink(RawSink):
         run_ids.sort()
         return run_ids
 
+    def scan_partitions(self, run_id: str | None = None) -> Iterator[tuple[PartitionKey, str]]:
+        run_glob = glob.escape(run_id) if run_id else "*"
+        pattern = f"*/customer_id=*/query_name=*/logical_date=*/run_id={run_glob}/metadata.json"
+        for metadata_path in sorted(self._root.glob(pattern)):
+            run_dir = metadata_path.parent
+            date_dir = run_dir.parent
+            query_dir = date_dir.parent
+            customer_dir = query_dir.parent
+            key = PartitionKey(
+                source=customer_dir.parent.name,
+                customer_id=customer_dir.name.split("=", 1)[1],
+                query_name=query_dir.name.split("=", 1)[1],
+                logical_date=date_dir.name.split("=", 1)[1],
+            )
+            yield key, run_dir.name.split("=", 1)[1]
+
 
 __all__ = [
     "LocalFilesystemRawSink",
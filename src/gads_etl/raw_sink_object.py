@@ -1,17 +1,50 @@
 """S3-compatible RawSink implementation."""
 from __future__ import annotations
 
+import hashlib
 import json
+import logging
 import os
-import tempfile
+import threading
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
 from dataclasses import dataclass
-from typing import Iterable, Mapping, Sequence
+from itertools import islice
+from pathlib import Path
+from typing import BinaryIO, Iterable, Iterator, Mapping, Sequence
 
 import boto3
 from botocore.client import BaseClient
+from botocore.config import Config as BotoConfig
 from botocore.exceptions import ClientError
 
-from .raw_sink import PartitionKey, PartitionReader, PartitionWriter, RawSink
+from .raw_sink import (
+    PAYLOAD_FILENAME,
+    PartitionKey,
+    PartitionReader,
+    PartitionWriter,
+    PayloadChunk,
+    PayloadDigest,
+    RawSink,
+    chunk_filename,
+    payload_chunks_from_metadata,
+)
+from .raw_sink_cache import LocalPartitionCache
+from .raw_sink_local import LocalFilesystemPartitionReader, _write_offset_index
+
+logger = logging.getLogger(__name__)
+
+# S3 rejects multipart parts smaller than 5 MiB (except the last one).
+MIN_PART_SIZE = 5 * 1024 * 1024
+DEFAULT_PART_SIZE = 8 * 1024 * 1024
+DEFAULT_MAX_CONCURRENCY = 4
+DEFAULT_MAX_POOL_CONNECTIONS = 50
+_READ_BLOCK_SIZE = 1024 * 1024
+
+_PRECONDITION_FAILED = ("PreconditionFailed", "412")
+_CONDITIONAL_UNSUPPORTED = ("NotImplemented", "501")
+_NOT_FOUND = ("NoSuchKey", "404", "NotFound")
+_NO_SUCH_UPLOAD = ("NoSuchUpload",)
 
 
 @dataclass
@@ -22,6 +55,62 @@ class S3Config:
     region: str | None = None
     access_key: str | None = None
     secret_key: str | None = None
+    multipart_part_size: int = DEFAULT_PART_SIZE
+    multipart_max_concurrency: int = DEFAULT_MAX_CONCURRENCY
+    read_range_size: int = 0  # 0 reads the payload over a single GET
+    read_max_concurrency: int = DEFAULT_MAX_CONCURRENCY
+    max_pool_connections: int = DEFAULT_MAX_POOL_CONNECTIONS
+    conditional_writes: bool = True  # If-None-Match on PUT/CompleteMultipartUpload
+    chunk_size: int = 0  # bytes per payload object; 0 keeps one payload.jsonl
+
+    def __post_init__(self) -> None:
+        if self.multipart_part_size < MIN_PART_SIZE:
+            raise ValueError(
+                f"multipart_part_size must be at least {MIN_PART_SIZE} bytes"
+            )
+
+
+_clients: dict[tuple, BaseClient] = {}
+_clients_lock = threading.Lock()
+
+
+def shared_s3_client(config: S3Config) -> BaseClient:
+    """Return the process-wide S3 client for the config's endpoint and credentials.
+
+    boto3 clients are thread-safe, so a single connection-pooled client serves
+    every sink, writer and reader thread. The PID is part of the cache key so
+    forked worker processes never reuse the parent's sockets.
+    """
+    cache_key = (
+        os.getpid(),
+        config.endpoint_url,
+        config.region,
+        config.access_key,
+        config.secret_key,
+        config.max_pool_connections,
+    )
+    with _clients_lock:
+        client = _clients.get(cache_key)
+        if client is None:
+            session = boto3.session.Session()
+            client = session.client(
+                "s3",
+                endpoint_url=config.endpoint_url,
+                region_name=config.region,
+                aws_access_key_id=config.access_key,
+                aws_secret_access_key=config.secret_key,
+                config=BotoConfig(
+                    max_pool_connections=config.max_pool_connections,
+                    tcp_keepalive=True,
+                    retries={"mode": "standard", "max_attempts": 5},
+                ),
+            )
+            _clients[cache_key] = client
+        return client
+
+
+def _error_code(exc: ClientError) -> str:
+    return str(exc.response.get("Error", {}).get("Code", ""))
 
 
 def _partition_prefix(prefix: str, key: PartitionKey) -> str:
@@ -41,33 +130,85 @@ def _object_key(prefix: str, run_id: str, filename: str) -> str:
 
 
 class ObjectStorageRawSink(RawSink):
-    def __init__(self, config: S3Config) -> None:
-        session = boto3.session.Session()
-        self.client: BaseClient = session.client(
-            "s3",
-            endpoint_url=config.endpoint_url,
-            region_name=config.region,
-            aws_access_key_id=config.access_key,
-            aws_secret_access_key=config.secret_key,
-        )
+    """RawSink backed by an S3-compatible bucket.
+
+    With a ``cache``, readers fetch each partition from the bucket once and
+    serve every later read of the same ``(partition_key, run_id)`` from local
+    disk.
+    """
+
+    def __init__(
+        self,
+        config: S3Config,
+        client: BaseClient | None = None,
+        cache: LocalPartitionCache | None = None,
+    ) -> None:
+        self.client: BaseClient = client or shared_s3_client(config)
+        self.cache = cache
         self.bucket = config.bucket
         self.prefix = config.prefix.strip("/")
+        self.part_size = config.multipart_part_size
+        self.max_concurrency = config.multipart_max_concurrency
+        self.read_range_size = config.read_range_size
+        self.read_max_concurrency = config.read_max_concurrency
+        self.conditional_writes = config.conditional_writes
+        self.chunk_size = config.chunk_size
 
     def write_partition(self, partition_key: PartitionKey, run_id: str) -> PartitionWriter:
         prefix = _partition_prefix(self.prefix, partition_key)
-        payload_key = _object_key(prefix, run_id, "payload.jsonl")
+        payload_key = _object_key(prefix, run_id, PAYLOAD_FILENAME)
         metadata_key = _object_key(prefix, run_id, "metadata.json")
-        if self._object_exists(metadata_key):
-            raise RuntimeError("Partition already finalized; metadata exists")
-        return S3PartitionWriter(self.client, self.bucket, payload_key, metadata_key)
+        # One HEAD up front refuses a sealed partition before any extraction;
+        # publishing the payload re-checks only if it collides with an object.
+        writer = S3PartitionWriter(
+            self.client,
+            self.bucket,
+            payload_key,
+            metadata_key,
+            part_size=self.part_size,
+            max_concurrency=self.max_concurrency,
+            conditional_writes=self.conditional_writes,
+            chunk_size=self.chunk_size,
+        )
+        writer.ensure_not_sealed()
+        return writer
 
     def open_partition(self, partition_key: PartitionKey, run_id: str) -> PartitionReader:
+        if self.cache is None:
+            return self._open_remote(partition_key, run_id)
+        namespace = f"{self.bucket}/{self.prefix}"
+        directory = self.cache.lookup(partition_key, run_id, namespace)
+        if directory is not None:
+            return _cached_reader(directory)
+        return _ReadThroughPartitionReader(
+            self._open_remote(partition_key, run_id),
+            self.cache,
+            partition_key,
+            run_id,
+            namespace,
+        )
+
+    def _open_remote(self, partition_key: PartitionKey, run_id: str) -> S3PartitionReader:
+        # Fetching metadata.json doubles as the finalized check, so no HEAD is needed.
         prefix = _partition_prefix(self.prefix, partition_key)
-        payload_key = _object_key(prefix, run_id, "payload.jsonl")
+        payload_key = _object_key(prefix, run_id, PAYLOAD_FILENAME)
         metadata_key = _object_key(prefix, run_id, "metadata.json")
-        if not self._object_exists(metadata_key):
-            raise FileNotFoundError("Partition metadata missing (not finalized)")
-        return S3PartitionReader(self.client, self.bucket, payload_key, metadata_key)
+        try:
+            obj = self.client.get_object(Bucket=self.bucket, Key=metadata_key)
+        except ClientError as exc:
+            if _error_code(exc) in _NOT_FOUND:
+                raise FileNotFoundError("Partition metadata missing (not finalized)") from exc
+            raise
+        metadata = json.loads(obj["Body"].read().decode("utf-8"))
+        return S3PartitionReader(
+            self.client,
+            self.bucket,
+            payload_key,
+            metadata_key,
+            range_size=self.read_range_size,
+            max_concurrency=self.read_max_concurrency,
+            metadata=metadata,
+        )
 
     def list_partitions(self, partition_key: PartitionKey) -> Sequence[str]:
         prefix = _partition_prefix(self.prefix, partition_key)
@@ -87,75 +228,508 @@ class ObjectStorageRawSink(RawSink):
                     run_ids.add(part.split("run_id=", 1)[1])
         return sorted(run_ids)
 
-    def _object_exists(self, key: str) -> bool:
-        try:
-            self.client.head_object(Bucket=self.bucket, Key=key)
-            return True
-        except ClientError as exc:  # pragma: no cover - network errors
-            if exc.response["Error"].get("Code") in ("404", "NotFound"):
-                return False
-            raise
+    def scan_partitions(self, run_id: str | None = None) -> Iterator[tuple[PartitionKey, str]]:
+        paginator = self.client.get_paginator("list_objects_v2")
+        root = f"{self.prefix}/" if self.prefix else ""
+        for page in paginator.paginate(Bucket=self.bucket, Prefix=root):
+            for obj in page.get("Contents", []) or []:
+                key = obj["Key"]
+                if not key.endswith("/metadata.json"):
+                    continue
+                parts = key[len(root) :].split("/")
+                if len(parts) != 6:
+                    continue
+                source, customer, query, logical, run, _ = parts
+                if run_id is not None and run != f"run_id={run_id}":
+                    continue
+                yield (
+                    PartitionKey(
+                        source=source,
+                        customer_id=customer.split("=", 1)[1],
+                        query_name=query.split("=", 1)[1],
+                        logical_date=logical.split("=", 1)[1],
+                    ),
+                    run.split("=", 1)[1],
+                )
 
 
 class S3PartitionWriter(PartitionWriter):
-    def __init__(self, client: BaseClient, bucket: str, payload_key: str, metadata_key: str) -> None:
+    """Streams payload rows to S3 as multipart parts uploaded in the background.
+
+    Rows are buffered in memory until ``part_size`` bytes accumulate; each full
+    buffer is handed to a small thread pool as one multipart part so uploads
+    overlap with extraction. Payloads smaller than one part are sent with a
+    single ``put_object`` at finalize. Any failure aborts the multipart upload
+    so no partial payload object is ever published.
+
+    With ``conditional_writes`` the payload and metadata are published with
+    ``If-None-Match: *``; metadata.json is only probed when the payload write
+    hits an existing object.
+
+    With ``chunk_size`` set, the payload rolls over to ``payload-00000.jsonl``,
+    ``payload-00001.jsonl``, ... next to ``payload_key``; each chunk object is
+    published as soon as it is full and the chunk list is added to
+    metadata.json. Aborting deletes chunks that were already published. The
+    checksum and byte size of every payload object are computed while rows
+    stream through and recorded in metadata.json.
+    """
+
+    def __init__(
+        self,
+        client: BaseClient,
+        bucket: str,
+        payload_key: str,
+        metadata_key: str,
+        part_size: int = DEFAULT_PART_SIZE,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        conditional_writes: bool = False,
+        chunk_size: int = 0,
+    ) -> None:
         self.client = client
         self.bucket = bucket
         self.payload_key = payload_key
         self.metadata_key = metadata_key
-        self._tempfile = tempfile.NamedTemporaryFile(mode="w", encoding="utf-8", delete=False)
+        self.conditional_writes = conditional_writes
+        self.chunk_size = chunk_size
+        self.part_size = part_size
+        self.max_concurrency = max(1, max_concurrency)
+        self._buffer = bytearray()
+        self._upload_id: str | None = None
+        self._executor: ThreadPoolExecutor | None = None
+        self._in_flight: set[Future] = set()
+        self._parts: list[dict] = []
+        self._next_part_number = 1
         self._finalized = False
+        self._aborted = False
+        # Object currently being written and the digest of its bytes.
+        self._object_key = self._chunk_key(0) if chunk_size > 0 else payload_key
+        self._digest = PayloadDigest()
+        self._chunks: list[dict] = []
+        self._published: list[str] = []
 
     def write_payload_row(self, row: Mapping[str, object]) -> None:
-        if self._finalized:
-            raise RuntimeError("Partition already finalized")
-        self._tempfile.write(json.dumps(row))
-        self._tempfile.write("\n")
+        self.write_serialized_row(json.dumps(row).encode("utf-8"))
+
+    def write_serialized_row(self, line: bytes) -> None:
+        self._ensure_open()
+        self._buffer += line
+        self._buffer += b"\n"
+        self._digest.update_row(line)
+        try:
+            if self.chunk_size > 0 and self._digest.byte_size >= self.chunk_size:
+                self._publish_chunk()
+            elif len(self._buffer) >= self.part_size:
+                self._flush_part()
+        except Exception:
+            self.abort()
+            raise
 
     def finalize(self, metadata: Mapping[str, object]) -> None:
+        self._ensure_open()
+        try:
+            if self.chunk_size <= 0:
+                if self._upload_id is not None and self._buffer:
+                    self._flush_part()
+                self._publish_payload()
+                metadata = {**metadata, **self._digest.payload_fields()}
+            else:
+                if self._digest.line_count or not self._chunks:
+                    self._publish_chunk()
+                metadata = {**metadata, "chunks": self._chunks}
+            try:
+                self.client.put_object(
+                    Bucket=self.bucket,
+                    Key=self.metadata_key,
+                    Body=json.dumps(metadata).encode("utf-8"),
+                    ContentType="application/json",
+                    **self._write_conditions(),
+                )
+            except ClientError as exc:
+                if _error_code(exc) in _PRECONDITION_FAILED:
+                    raise RuntimeError("Partition already finalized; metadata exists") from exc
+                raise
+            self._finalized = True
+        except Exception:
+            self.abort()
+            raise
+        finally:
+            self._shutdown_executor()
+
+    def abort(self) -> None:
+        """Discard buffered data and abort any in-progress multipart upload."""
+        if self._finalized or self._aborted:
+            return
+        self._aborted = True
+        self._buffer.clear()
+        for future in self._in_flight:
+            future.cancel()
+        self._shutdown_executor()
+        if self._upload_id is not None:
+            upload_id, self._upload_id = self._upload_id, None
+            try:
+                self.client.abort_multipart_upload(
+                    Bucket=self.bucket, Key=self._object_key, UploadId=upload_id
+                )
+            except ClientError:  # pragma: no cover - bucket lifecycle rules clean up leftovers
+                logger.warning(
+                    "Failed to abort multipart upload %s for %s", upload_id, self._object_key
+                )
+        for key in self._published:
+            try:
+                self.client.delete_object(Bucket=self.bucket, Key=key)
+            except ClientError:  # pragma: no cover - best effort, metadata is never written
+                logger.warning("Failed to delete orphaned chunk %s", key)
+
+    def _ensure_open(self) -> None:
         if self._finalized:
             raise RuntimeError("Partition already finalized")
-        self._tempfile.flush()
-        os.fsync(self._tempfile.fileno())
-        self._tempfile.close()
+        if self._aborted:
+            raise RuntimeError("Partition writer aborted")
+
+    def _chunk_key(self, index: int) -> str:
+        return f"{self.payload_key.rsplit('/', 1)[0]}/{chunk_filename(index)}"
+
+    def _publish_chunk(self) -> None:
+        """Publish the current chunk object and start the next one."""
+        if self._upload_id is not None and self._buffer:
+            self._flush_part()
+        self._publish_payload()
+        self._published.append(self._object_key)
+        self._chunks.append(self._digest.chunk_entry(self._object_key.rsplit("/", 1)[1]))
+        self._parts = []
+        self._next_part_number = 1
+        self._digest = PayloadDigest()
+        self._object_key = self._chunk_key(len(self._chunks))
+
+    def _flush_part(self) -> None:
+        if self._upload_id is None:
+            response = self.client.create_multipart_upload(
+                Bucket=self.bucket,
+                Key=self._object_key,
+                ContentType="application/x-ndjson",
+            )
+            self._upload_id = response["UploadId"]
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_concurrency,
+                thread_name_prefix="s3-part-upload",
+            )
+        # Bound memory to roughly (max_concurrency + 1) parts by waiting for a
+        # slot before handing over the next buffer.
+        while len(self._in_flight) >= self.max_concurrency:
+            done, _ = wait(self._in_flight, return_when=FIRST_COMPLETED)
+            self._collect(done)
+        body = bytes(self._buffer)
+        self._buffer.clear()
+        part_number = self._next_part_number
+        self._next_part_number += 1
+        self._in_flight.add(
+            self._executor.submit(
+                self._upload_part, self._object_key, self._upload_id, part_number, body
+            )
+        )
+
+    def _upload_part(self, key: str, upload_id: str, part_number: int, body: bytes) -> dict:
+        response = self.client.upload_part(
+            Bucket=self.bucket,
+            Key=key,
+            UploadId=upload_id,
+            PartNumber=part_number,
+            Body=body,
+        )
+        return {"PartNumber": part_number, "ETag": response["ETag"]}
+
+    def _collect(self, done: set[Future]) -> None:
+        for future in done:
+            self._in_flight.discard(future)
+            self._parts.append(future.result())
+
+    def _publish_payload(self) -> None:
+        """Make the payload object visible, refusing to replace a sealed partition."""
+        if self._in_flight:
+            done, _ = wait(self._in_flight)
+            self._collect(done)
+        if not self.conditional_writes:
+            self.ensure_not_sealed()
+            self._write_payload()
+            return
+        try:
+            self._write_payload()
+        except ClientError as exc:
+            code = _error_code(exc)
+            if code in _CONDITIONAL_UNSUPPORTED:
+                logger.warning("Endpoint rejected If-None-Match; falling back to HEAD checks")
+                self.conditional_writes = False
+            elif code not in _PRECONDITION_FAILED:
+                raise
+            # A payload already exists: either the partition is sealed or an
+            # earlier attempt of this run crashed before writing metadata.
+            self.ensure_not_sealed()
+            self._replace_payload()
+
+    def _replace_payload(self) -> None:
+        """Overwrite the orphaned payload of a crashed attempt with this one.
+
+        S3 may have dropped the multipart upload when the conditional complete
+        failed. Parts are not kept after they are sent, so the payload cannot
+        be re-sent here: unless the object already is this upload, the writer
+        aborts and the partition has to be written again.
+        """
+        upload_id = self._upload_id
         try:
-            if self._object_exists(self.metadata_key):
-                raise RuntimeError("Partition already finalized; metadata exists")
-            self.client.upload_file(self._tempfile.name, self.bucket, self.payload_key)
+            self._write_payload(conditional=False)
+        except ClientError as exc:
+            if upload_id is None or _error_code(exc) not in _NO_SUCH_UPLOAD:
+                raise
+            self._upload_id = None  # nothing left to abort
+            if self._payload_is_upload():
+                return
+            raise RuntimeError(
+                f"Multipart upload {upload_id} for {self._object_key} no longer exists; "
+                "write the partition again"
+            ) from exc
+
+    def _payload_is_upload(self) -> bool:
+        """True when the object at ``_object_key`` was completed from ``_parts``."""
+        try:
+            head = self.client.head_object(Bucket=self.bucket, Key=self._object_key)
+        except ClientError as exc:
+            if _error_code(exc) in _NOT_FOUND:
+                return False
+            raise
+        parts = sorted(self._parts, key=lambda part: part["PartNumber"])
+        digest = hashlib.md5(usedforsecurity=False)
+        for part in parts:
+            digest.update(bytes.fromhex(part["ETag"].strip('"')))
+        return head.get("ETag", "").strip('"') == f"{digest.hexdigest()}-{len(parts)}"
+
+    def _write_payload(self, conditional: bool = True) -> None:
+        conditions = self._write_conditions() if conditional else {}
+        if self._upload_id is None:
             self.client.put_object(
                 Bucket=self.bucket,
-                Key=self.metadata_key,
-                Body=json.dumps(metadata).encode("utf-8"),
-                ContentType="application/json",
+                Key=self._object_key,
+                Body=bytes(self._buffer),
+                ContentType="application/x-ndjson",
+                **conditions,
             )
-            self._finalized = True
-        finally:
-            os.remove(self._tempfile.name)
+            self._buffer.clear()
+            return
+        self.client.complete_multipart_upload(
+            Bucket=self.bucket,
+            Key=self._object_key,
+            UploadId=self._upload_id,
+            MultipartUpload={
+                "Parts": sorted(self._parts, key=lambda part: part["PartNumber"])
+            },
+            **conditions,
+        )
+        self._upload_id = None
+
+    def _write_conditions(self) -> dict:
+        return {"IfNoneMatch": "*"} if self.conditional_writes else {}
+
+    def ensure_not_sealed(self) -> None:
+        """Raise when metadata.json exists, i.e. the partition is already finalized."""
+        if self._object_exists(self.metadata_key):
+            raise RuntimeError("Partition already finalized; metadata exists")
+
+    def _shutdown_executor(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+        self._in_flight.clear()
 
     def _object_exists(self, key: str) -> bool:
         try:
             self.client.head_object(Bucket=self.bucket, Key=key)
             return True
         except ClientError as exc:
-            if exc.response["Error"].get("Code") in ("404", "NotFound"):
+            if _error_code(exc) in _NOT_FOUND:
                 return False
             raise
 
 
 class S3PartitionReader(PartitionReader):
-    def __init__(self, client: BaseClient, bucket: str, payload_key: str, metadata_key: str) -> None:
+    """Reads a finalized partition from S3.
+
+    With ``range_size`` set, each payload object is fetched as concurrent
+    byte-range GETs (at most ``max_concurrency`` ranges ahead of the consumer)
+    and line boundaries are stitched across ranges so rows are yielded in
+    order. Chunks of a chunked partition live next to ``payload_key``.
+    """
+
+    def __init__(
+        self,
+        client: BaseClient,
+        bucket: str,
+        payload_key: str,
+        metadata_key: str,
+        range_size: int = 0,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        metadata: Mapping[str, object] | None = None,
+    ) -> None:
         self.client = client
         self.bucket = bucket
         self.payload_key = payload_key
         self.metadata_key = metadata_key
+        self.range_size = range_size
+        self.max_concurrency = max(1, max_concurrency)
+        self._metadata = metadata
 
     def iter_payload_rows(self) -> Iterable[Mapping[str, object]]:
-        obj = self.client.get_object(Bucket=self.bucket, Key=self.payload_key)
-        body = obj["Body"]
-        for line in body.iter_lines():
-            if line:
-                yield json.loads(line.decode("utf-8"))
+        for chunk in self.payload_chunks():
+            yield from self.iter_chunk_rows(chunk)
+
+    def payload_chunks(self) -> Sequence[PayloadChunk]:
+        return payload_chunks_from_metadata(self.read_metadata())
+
+    def iter_chunk_rows(self, chunk: PayloadChunk) -> Iterator[Mapping[str, object]]:
+        key = self._chunk_key(chunk.name)
+        if self.range_size <= 0:
+            obj = self.client.get_object(Bucket=self.bucket, Key=key)
+            body = obj["Body"]
+            for line in body.iter_lines():
+                if line:
+                    yield json.loads(line.decode("utf-8"))
+            return
+        yield from _iter_json_lines(self._iter_ranges(key))
 
     def read_metadata(self) -> Mapping[str, object]:
-        obj = self.client.get_object(Bucket=self.bucket, Key=self.metadata_key)
-        return json.loads(obj["Body"].read().decode("utf-8"))
+        if self._metadata is None:
+            obj = self.client.get_object(Bucket=self.bucket, Key=self.metadata_key)
+            self._metadata = json.loads(obj["Body"].read().decode("utf-8"))
+        return self._metadata
+
+    def iter_chunk_bytes(self, chunk: PayloadChunk) -> Iterator[bytes]:
+        key = self._chunk_key(chunk.name)
+        if self.range_size <= 0:
+            obj = self.client.get_object(Bucket=self.bucket, Key=key)
+            yield from obj["Body"].iter_chunks(_READ_BLOCK_SIZE)
+            return
+        yield from self._iter_ranges(key)
+
+    def download_chunk(self, chunk: PayloadChunk, fileobj: BinaryIO) -> None:
+        """Copy one payload object into ``fileobj`` using managed (parallel) transfers."""
+        self.client.download_fileobj(self.bucket, self._chunk_key(chunk.name), fileobj)
+
+    def _chunk_key(self, name: str) -> str:
+        if name == PAYLOAD_FILENAME:
+            return self.payload_key
+        return f"{self.payload_key.rsplit('/', 1)[0]}/{name}"
+
+    def _iter_ranges(self, key: str) -> Iterator[bytes]:
+        """Yield byte ranges of ``key`` in order with a bounded prefetch window."""
+        try:
+            first, total_size = self._fetch_range(key, 0)
+        except ClientError as exc:
+            if _error_code(exc) == "InvalidRange":
+                return  # zero-byte payload
+            raise
+        offsets = iter(range(self.range_size, total_size, self.range_size))
+        with ThreadPoolExecutor(
+            max_workers=self.max_concurrency, thread_name_prefix="s3-range-get"
+        ) as executor:
+            window: deque[Future] = deque(
+                executor.submit(self._fetch_range, key, start)
+                for start in islice(offsets, self.max_concurrency)
+            )
+            try:
+                yield first
+                while window:
+                    data, _ = window.popleft().result()
+                    start = next(offsets, None)
+                    if start is not None:
+                        window.append(executor.submit(self._fetch_range, key, start))
+                    yield data
+            finally:
+                for future in window:
+                    future.cancel()
+
+    def _fetch_range(self, key: str, start: int) -> tuple[bytes, int]:
+        end = start + self.range_size - 1
+        obj = self.client.get_object(Bucket=self.bucket, Key=key, Range=f"bytes={start}-{end}")
+        # ContentRange looks like "bytes 0-1023/4096".
+        total_size = int(obj["ContentRange"].rsplit("/", 1)[1])
+        return obj["Body"].read(), total_size
+
+
+class _ReadThroughPartitionReader(PartitionReader):
+    """Fills the local cache on first payload access, then reads from disk."""
+
+    def __init__(
+        self,
+        remote: S3PartitionReader,
+        cache: LocalPartitionCache,
+        partition_key: PartitionKey,
+        run_id: str,
+        namespace: str = "",
+    ) -> None:
+        self._remote = remote
+        self._cache = cache
+        self._partition_key = partition_key
+        self._run_id = run_id
+        self._namespace = namespace
+        self._source: PartitionReader | None = None
+
+    def iter_payload_rows(self) -> Iterable[Mapping[str, object]]:
+        return self._reader().iter_payload_rows()
+
+    def read_metadata(self) -> Mapping[str, object]:
+        return self._remote.read_metadata()
+
+    def payload_chunks(self) -> Sequence[PayloadChunk]:
+        return self._remote.payload_chunks()
+
+    def iter_chunk_rows(self, chunk: PayloadChunk) -> Iterable[Mapping[str, object]]:
+        return self._reader().iter_chunk_rows(chunk)
+
+    def iter_chunk_bytes(self, chunk: PayloadChunk) -> Iterable[bytes]:
+        return self._reader().iter_chunk_bytes(chunk)
+
+    def _reader(self) -> PartitionReader:
+        if self._source is None:
+            sizes = [chunk.byte_size for chunk in self._remote.payload_chunks()]
+            directory = self._cache.get_or_fill(
+                self._partition_key,
+                self._run_id,
+                self._fill,
+                namespace=self._namespace,
+                expected_bytes=None if None in sizes else sum(sizes),
+            )
+            # Partitions larger than the whole cache budget stream from the bucket.
+            self._source = self._remote if directory is None else _cached_reader(directory)
+        return self._source
+
+    def _fill(self, directory: Path) -> None:
+        for chunk in self._remote.payload_chunks():
+            payload_path = directory / chunk.name
+            with payload_path.open("wb") as handle:
+                self._remote.download_chunk(chunk, handle)
+            # Cached copies get the same sidecar index as locally written partitions.
+            _write_offset_index(payload_path, payload_path.with_suffix(".idx"))
+        with (directory / "metadata.json").open("w", encoding="utf-8") as handle:
+            json.dump(self._remote.read_metadata(), handle, ensure_ascii=False)
+
+
+def _cached_reader(directory: Path) -> LocalFilesystemPartitionReader:
+    return LocalFilesystemPartitionReader(
+        directory / PAYLOAD_FILENAME, directory / "metadata.json"
+    )
+
+
+def _iter_json_lines(chunks: Iterable[bytes]) -> Iterator[Mapping[str, object]]:
+    """Decode newline-delimited JSON from byte chunks split at arbitrary offsets."""
+    carry = b""
+    for chunk in chunks:
+        cut = chunk.rfind(b"\n")
+        if cut < 0:
+            carry += chunk
+            continue
+        lines = (carry + chunk[:cut]).split(b"\n")
+        carry = chunk[cut + 1 :]
+        for line in lines:
+            if line.strip():
+                yield json.loads(line)
+    if carry.strip():
+        yield json.loads(carry)
@@ -0,0 +1,200 @@
+"""Bounded-queue producer/consumer pipeline used by the extractor."""
+from __future__ import annotations
+
+import heapq
+import queue
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Iterable, Sequence
+
+_POLL_SECONDS = 0.1
+_DONE = object()
+
+
+@dataclass(frozen=True)
+class StageSpec:
+    """One transformation step and its degree of parallelism."""
+
+    name: str
+    fn: Callable[[Any], Any]
+    workers: int = 1
+    queue_depth: int = 1000  # capacity of the queue feeding this stage
+
+
+@dataclass
+class StageMetrics:
+    """Counters collected for one stage of a pipeline run."""
+
+    name: str
+    workers: int
+    queue_capacity: int  # of the downstream queue the stage writes to
+    processed: int = 0
+    max_queue_depth: int = 0  # of that same downstream queue
+    blocked_seconds: float = 0.0  # time spent waiting on a full downstream queue
+
+
+class _Channel:
+    """Bounded queue that records depth and backpressure for its producer."""
+
+    def __init__(self, capacity: int, metrics: StageMetrics, stop: threading.Event) -> None:
+        self._queue: queue.Queue = queue.Queue(maxsize=max(1, capacity))
+        self._metrics = metrics
+        self._stop = stop
+        self._lock = threading.Lock()
+
+    def put(self, item: Any) -> bool:
+        """Enqueue ``item``; returns False if the pipeline is stopping."""
+        started = None
+        while not self._stop.is_set():
+            try:
+                self._queue.put(item, timeout=_POLL_SECONDS if started else 0)
+            except queue.Full:
+                started = started or time.perf_counter()
+                continue
+            depth = self._queue.qsize()
+            with self._lock:
+                if started is not None:
+                    self._metrics.blocked_seconds += time.perf_counter() - started
+                if depth > self._metrics.max_queue_depth:
+                    self._metrics.max_queue_depth = depth
+            return True
+        return False
+
+    def get(self) -> Any:
+        while not self._stop.is_set():
+            try:
+                return self._queue.get(timeout=_POLL_SECONDS)
+            except queue.Empty:
+                continue
+        return _DONE
+
+
+class StagedPipeline:
+    """Runs ``source -> stage_1 -> ... -> sink`` over bounded queues.
+
+    The source is drained on its own thread, every stage runs on its own
+    worker threads and the sink runs on the calling thread, so network, CPU
+    and storage work overlap. Full queues block upstream producers
+    (backpressure). Items reach the sink in source order even when a stage has
+    several workers; the source only admits a new item while fewer than the
+    pipeline's total queue and worker capacity are in flight, so results that
+    wait behind a slow item are bounded too. The first exception raised
+    anywhere stops all stages and is re-raised from :meth:`run`.
+    """
+
+    def __init__(self, stages: Sequence[StageSpec], source_name: str = "source") -> None:
+        self.stages = list(stages)
+        self.source_name = source_name
+
+    def run(self, source: Iterable[Any], sink: Callable[[Any], None]) -> list[StageMetrics]:
+        stop = threading.Event()
+        errors: list[BaseException] = []
+        # channels[i] carries the output of metrics[i] (source, then each stage).
+        capacities = [stage.queue_depth for stage in self.stages] + [
+            self.stages[-1].queue_depth if self.stages else 1000
+        ]
+        workers = [1] + [max(1, stage.workers) for stage in self.stages]
+        names = [self.source_name] + [stage.name for stage in self.stages]
+        metrics = [
+            StageMetrics(name, count, capacity)
+            for name, count, capacity in zip(names, workers, capacities)
+        ]
+        channels = [
+            _Channel(capacity, metrics[idx], stop) for idx, capacity in enumerate(capacities)
+        ]
+        consumers = [m.workers for m in metrics[1:]] + [1]
+        # Items between the source and the sink, including those held for reordering.
+        window = threading.Semaphore(sum(capacities) + sum(workers[1:]))
+
+        def fail(exc: BaseException) -> None:
+            errors.append(exc)
+            stop.set()
+
+        def produce() -> None:
+            try:
+                for seq, item in enumerate(source):
+                    while not window.acquire(timeout=_POLL_SECONDS):
+                        if stop.is_set():
+                            return
+                    if not channels[0].put((seq, item)):
+                        return
+                    metrics[0].processed += 1
+            except BaseException as exc:  # propagate to the caller
+                fail(exc)
+                return
+            for _ in range(consumers[0]):
+                channels[0].put(_DONE)
+
+        threads = [threading.Thread(target=produce, name=f"{self.source_name}-0", daemon=True)]
+        for idx, stage in enumerate(self.stages, start=1):
+            remaining = [metrics[idx].workers]
+            lock = threading.Lock()
+
+            def work(
+                stage: StageSpec = stage,
+                inbox: _Channel = channels[idx - 1],
+                outbox: _Channel = channels[idx],
+                stage_metrics: StageMetrics = metrics[idx],
+                remaining: list[int] = remaining,
+                lock: threading.Lock = lock,
+                downstream: int = consumers[idx],
+            ) -> None:
+                try:
+                    while True:
+                        message = inbox.get()
+                        if message is _DONE:
+                            break
+                        seq, item = message
+                        if not outbox.put((seq, stage.fn(item))):
+                            return
+                        with lock:
+                            stage_metrics.processed += 1
+                except BaseException as exc:
+                    fail(exc)
+                    return
+                with lock:
+                    remaining[0] -= 1
+                    last = remaining[0] == 0
+                if last:
+                    for _ in range(downstream):
+                        outbox.put(_DONE)
+
+            threads.extend(
+                threading.Thread(target=work, name=f"{stage.name}-{n}", daemon=True)
+                for n in range(metrics[idx].workers)
+            )
+
+        for thread in threads:
+            thread.start()
+        try:
+            self._drain(channels[-1], sink, window)
+        except BaseException as exc:
+            fail(exc)
+        finally:
+            stop.set()
+            for thread in threads:
+                thread.join()
+        if errors:
+            raise errors[0]
+        return metrics
+
+    @staticmethod
+    def _drain(
+        inbox: _Channel, sink: Callable[[Any], None], window: threading.Semaphore
+    ) -> None:
+        """Deliver items to ``sink`` in source order until the stream ends."""
+        pending: list[tuple[int, Any]] = []
+        next_seq = 0
+        while True:
+            message = inbox.get()
+            if message is _DONE:
+                return
+            heapq.heappush(pending, message)
+            while pending and pending[0][0] == next_seq:
+                sink(heapq.heappop(pending)[1])
+                next_seq += 1
+                window.release()
+
+
+__all__ = ["StageMetrics", "StageSpec", "StagedPipeline"]
@@ -2,60 +2,103 @@
 from __future__ import annotations
 
 import json
-from typing import Iterable, List
+import textwrap
+from itertools import islice
+from typing import Iterable, Iterator
 
 from tabulate import tabulate
 
 from .state_store import PartitionState
 
+EMPTY_MESSAGE = "No partition state records found."
+TABLE_BLOCK_ROWS = 1000
+
+_TABLE_HEADERS = [
+    "source",
+    "customer_id",
+    "query_name",
+    "logical_date",
+    "status",
+    "current_run_id",
+    "record_count",
+    "updated_at",
+]
+
 
 def format_states(states: Iterable[PartitionState], output_format: str = "table") -> str:
-    rows = list(states)
-    if not rows:
-        return "No partition state records found."
+    return "\n".join(iter_format_states(states, output_format=output_format))
+
+
+def iter_format_states(
+    states: Iterable[PartitionState], output_format: str = "table"
+) -> Iterator[str]:
+    """Yield the formatted output in pieces (joined by newlines) as ``states`` is consumed.
+
+    JSON output is identical to a single ``json.dumps(..., indent=2)`` of the
+    list. Tables are rendered ``TABLE_BLOCK_ROWS`` rows at a time, each block
+    aligned on its own.
+    """
+    states = iter(states)
+    first = next(states, None)
+    if first is None:
+        yield EMPTY_MESSAGE
+        return
     if output_format == "json":
-        payload: List[dict] = [
-            {
-                "source": row.source,
-                "customer_id": row.customer_id,
-                "query_name": row.query_name,
-                "logical_date": row.logical_date.isoformat(),
-                "status": row.status,
-                "current_run_id": row.current_run_id,
-                "schema_version": row.schema_version,
-                "record_count": row.record_count,
-                "updated_at": row.updated_at.isoformat(),
-                "error_message": row.error_message,
-                "attempt_count": row.attempt_count,
-            }
-            for row in rows
-        ]
-        return json.dumps(payload, indent=2)
-
-    table_data = [
-        [
-            row.source,
-            row.customer_id,
-            row.query_name,
-            row.logical_date.isoformat(),
-            row.status,
-            row.current_run_id or "-",
-            row.record_count if row.record_count is not None else "-",
-            row.updated_at.isoformat(),
-        ]
-        for row in rows
-    ]
-    headers = [
-        "source",
-        "customer_id",
-        "query_name",
-        "logical_date",
-        "status",
-        "current_run_id",
-        "record_count",
-        "updated_at",
+        yield from _iter_json(first, states)
+    else:
+        yield from _iter_table(first, states)
+
+
+def _iter_json(first: PartitionState, rest: Iterator[PartitionState]) -> Iterator[str]:
+    yield "["
+    previous = first
+    for state in rest:
+        yield _json_item(previous) + ","
+        previous = state
+    yield _json_item(previous)
+    yield "]"
+
+
+def _json_item(row: PartitionState) -> str:
+    payload = {
+        "source": row.source,
+        "customer_id": row.customer_id,
+        "query_name": row.query_name,
+        "logical_date": row.logical_date.isoformat(),
+        "status": row.status,
+        "current_run_id": row.current_run_id,
+        "schema_version": row.schema_version,
+        "record_count": row.record_count,
+        "updated_at": row.updated_at.isoformat(),
+        "error_message": row.error_message,
+        "attempt_count": row.attempt_count,
+    }
+    return textwrap.indent(json.dumps(payload, indent=2), "  ")
+
+
+def _iter_table(first: PartitionState, rest: Iterator[PartitionState]) -> Iterator[str]:
+    block = [first, *islice(rest, TABLE_BLOCK_ROWS - 1)]
+    headers = _TABLE_HEADERS
+    while block:
+        rendered = tabulate(
+            [_table_row(row) for row in block], headers=headers, tablefmt="plain"
+        )
+        yield rendered
+        headers = ()
+        block = list(islice(rest, TABLE_BLOCK_ROWS))
+
+
+def _table_row(row: PartitionState) -> list:
+    return [
+        row.source,
+        row.customer_id,
+        row.query_name,
+        row.logical_date.isoformat(),
+        row.status,
+        row.current_run_id or "-",
+        row.record_count if row.record_count is not None else "-",
+        row.updated_at.isoformat(),
     ]
-    return tabulate(table_data, headers=headers, tablefmt="plain")
 
 
-__all__ = ["format_states"]
+__all__ = ["format_states", "iter_format_states"]
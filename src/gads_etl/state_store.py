@@ -1,17 +1,33 @@
-"""SQLite-backed access layer for PartitionState records."""
+"""Access layer for PartitionState records (SQLite by default)."""
 from __future__ import annotations
 
+import os
 import sqlite3
+import threading
+import weakref
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
 from dataclasses import dataclass
-from datetime import date, datetime
+from datetime import date, datetime, timezone
 from pathlib import Path
-from typing import Optional
+from sys import intern
+from typing import Any, ContextManager, Iterable, Iterator, Optional, Sequence
 
 PartitionStatus = str  # constrained elsewhere (pending|success|failed)
+PartitionStateKey = tuple[str, str, str, date]  # (source, customer_id, query_name, logical_date)
+# (source, customer_id, query_name, logical_date ISO, current_run_id, schema_version)
+AuthoritativeRun = tuple[str, str, str, str, str, Optional[str]]
 
 
-@dataclass
+@dataclass(slots=True)
 class PartitionState:
+    """One row of ``partition_state``.
+
+    Slotted, so large scans carry no per-instance ``__dict__``. Dates are
+    parsed when the row is loaded; callers that only need keys and statuses
+    should use ``read_state_columns``, which keeps them as ISO text.
+    """
+
     source: str
     customer_id: str
     query_name: str
@@ -25,52 +41,160 @@ class PartitionState:
     attempt_count: Optional[int] = None
 
 
-class PartitionStateRepository:
-    """Lightweight DAO for the partition state table."""
+@dataclass(frozen=True)
+class PartitionStateColumns:
+    """Column arrays for many partitions; ``logical_dates`` stay ISO strings."""
 
-    def __init__(self, db_path: str | Path = "data/state_store.db") -> None:
-        self.db_path = Path(db_path)
-        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+    sources: list[str]
+    customer_ids: list[str]
+    query_names: list[str]
+    logical_dates: list[str]
+    statuses: list[str]
 
-    def _connect(self) -> sqlite3.Connection:
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
-        return conn
+    def __len__(self) -> int:
+        return len(self.statuses)
+
+    def keys(self) -> Iterator[tuple[str, str, str, str]]:
+        return zip(self.sources, self.customer_ids, self.query_names, self.logical_dates)
+
+
+@dataclass(frozen=True)
+class PartitionStateEvent:
+    """One append-only entry of ``partition_state_events``.
+
+    ``seq`` increases strictly with every recorded write and is never reused,
+    so consumers can resume from the last ``seq`` they processed.
+    """
+
+    seq: int
+    source: str
+    customer_id: str
+    query_name: str
+    logical_date: date
+    status: PartitionStatus
+    previous_status: Optional[PartitionStatus]  # None when the row was created
+    current_run_id: Optional[str]
+    schema_version: Optional[str]
+    record_count: Optional[int]
+    error_message: Optional[str]
+    attempt_count: Optional[int]
+    updated_at: datetime
+
+
+@dataclass(frozen=True)
+class QueryDateRange:
+    """Logical date coverage of one ``(source, query_name)``."""
+
+    source: str
+    query_name: str
+    earliest: date
+    latest: date
+    distinct_dates: int
+
+
+@dataclass(frozen=True)
+class DateGap:
+    """Inclusive run of logical dates missing between covered dates."""
+
+    source: str
+    query_name: str
+    start: date
+    end: date
+
+
+@dataclass(frozen=True)
+class AttemptSummary:
+    """Distribution of ``attempt_count`` (NULL counts as 0)."""
+
+    partitions: int
+    minimum: int
+    maximum: int
+    average: float
+    histogram: dict[str, int]  # ATTEMPT_BUCKETS label -> partitions
+
+
+ATTEMPT_BUCKETS = ("1-2", "3-5", "6-10", "10+")
+
+
+class PartitionStateStore(ABC):
+    """Backend-neutral partition state store.
+
+    Implements every query in SQL that SQLite and PostgreSQL both accept, with
+    ``?`` placeholders and the default ``partition_state`` table name.
+    Backends provide connections (``_cursor``/``_transaction``), translate
+    SQL through ``_sql`` and override the few queries that need a dialect of
+    their own. ``tests/unit/test_state_store_conformance.py`` holds every
+    backend to the same behaviour.
+    """
+
+    _ROW_ID = "rowid"  # stable per-row tiebreaker for keyset pagination
+    _ROW_ID_PARAM = "?"
+    _MIGRATIONS_TABLE = "schema_migrations"
+    # ``date_gaps`` date arithmetic (SQLite dialect)
+    _GAP_EXPRESSIONS = {
+        "gap_start": "date(previous_date, '+1 day')",
+        "gap_end": "date(logical_date, '-1 day')",
+        "gap_days": "julianday(logical_date) - julianday(previous_date)",
+    }
+
+    @abstractmethod
+    def _cursor(self) -> ContextManager[Any]:
+        """Return a context manager yielding a cursor for reads."""
+
+    @abstractmethod
+    def _transaction(self) -> ContextManager[Any]:
+        """Return a context manager yielding a cursor whose statements commit together."""
+
+    def _sql(self, sql: str) -> str:
+        return sql
+
+    def _rows(self, sql: str, params: Sequence = ()) -> list:
+        with self._cursor() as cursor:
+            cursor.execute(self._sql(sql), params)
+            return cursor.fetchall()
 
+    def _row(self, sql: str, params: Sequence = ()) -> Optional[Sequence]:
+        with self._cursor() as cursor:
+            cursor.execute(self._sql(sql), params)
+            return cursor.fetchone()
+
+    def _stream(self, sql: str, params: Sequence = ()) -> Iterator[Sequence]:
+        with self._cursor() as cursor:
+            cursor.execute(self._sql(sql), params)
+            while rows := cursor.fetchmany(_COLUMN_FETCH_SIZE):
+                yield from rows
+
+    def close(self) -> None:
+        """Release every connection held by the store."""
+
+    def __enter__(self) -> "PartitionStateStore":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    @abstractmethod
     def ensure_schema(self) -> None:
-        with self._connect() as conn:
-            conn.execute(
-                """
-                CREATE TABLE IF NOT EXISTS partition_state (
-                    source TEXT NOT NULL,
-                    customer_id TEXT NOT NULL,
-                    query_name TEXT NOT NULL,
-                    logical_date DATE NOT NULL,
-                    status TEXT NOT NULL CHECK (status IN ('pending','success','failed')),
-                    current_run_id TEXT,
-                    schema_version TEXT,
-                    record_count BIGINT,
-                    updated_at TIMESTAMPTZ NOT NULL,
-                    error_message TEXT,
-                    attempt_count INTEGER,
-                    PRIMARY KEY (source, customer_id, query_name, logical_date)
-                )
-                """
-            )
+        """Apply any pending schema migrations."""
+
+    def schema_version(self) -> int:
+        with self._cursor() as cursor:
+            # Already the backend's own name, so it bypasses ``_sql``.
+            cursor.execute(f"SELECT MAX(version) FROM {self._MIGRATIONS_TABLE}")
+            return cursor.fetchone()[0] or 0
 
     def get_partition_state(
         self, source: str, customer_id: str, query_name: str, logical_date: date
     ) -> Optional[PartitionState]:
-        with self._connect() as conn:
-            row = conn.execute(
-                """
-                SELECT *
-                  FROM partition_state
-                 WHERE source=? AND customer_id=? AND query_name=? AND logical_date=?
-                """,
-                (source, customer_id, query_name, logical_date.isoformat()),
-            ).fetchone()
-            return self._row_to_state(row)
+        row = self._row(
+            """
+            SELECT *
+              FROM partition_state
+             WHERE source=? AND customer_id=? AND query_name=? AND logical_date=?
+            """,
+            _key_params((source, customer_id, query_name, logical_date)),
+        )
+        return self._row_to_state(row)
 
     def list_partition_states(
         self,
@@ -81,103 +205,808 @@ class PartitionStateRepository:
         until: Optional[date] = None,
         limit: Optional[int] = None,
     ) -> list[PartitionState]:
-        where_clauses = []
-        params: list[str] = []
-        if status:
-            where_clauses.append("status = ?")
-            params.append(status)
-        if customer_id:
-            where_clauses.append("customer_id = ?")
-            params.append(customer_id)
-        if query_name:
-            where_clauses.append("query_name = ?")
-            params.append(query_name)
-        if since:
-            where_clauses.append("logical_date >= ?")
-            params.append(since.isoformat())
-        if until:
-            where_clauses.append("logical_date <= ?")
-            params.append(until.isoformat())
-
-        where_sql = ""
-        if where_clauses:
-            where_sql = "WHERE " + " AND ".join(where_clauses)
-
-        limit_sql = ""
-        if limit is not None:
-            limit_sql = f" LIMIT {int(limit)}"
-
-        with self._connect() as conn:
-            rows = conn.execute(
-                f"""
-                SELECT *
-                  FROM partition_state
-                  {where_sql}
-                 ORDER BY updated_at DESC
-                 {limit_sql}
-                """,
-                tuple(params),
-            ).fetchall()
-            return [self._row_to_state(row) for row in rows if row]
+        sql, params = self._list_query(status, customer_id, query_name, since, until, limit)
+        return [self._row_to_state(row) for row in self._stream(sql, params)]
 
-    def upsert_partition_state(self, state: PartitionState) -> None:
-        with self._connect() as conn:
-            conn.execute(
-                """
-                INSERT INTO partition_state (
-                    source,
-                    customer_id,
-                    query_name,
-                    logical_date,
-                    status,
-                    current_run_id,
-                    schema_version,
-                    record_count,
-                    updated_at,
-                    error_message,
-                    attempt_count
+    def iter_partition_states(
+        self,
+        status: Optional[str] = None,
+        customer_id: Optional[str] = None,
+        query_name: Optional[str] = None,
+        since: Optional[date] = None,
+        until: Optional[date] = None,
+        limit: Optional[int] = None,
+        page_size: int = 1000,
+    ) -> Iterator[PartitionState]:
+        """Yield the same rows as ``list_partition_states`` one page at a time.
+
+        Pages are fetched by keyset pagination on ``(updated_at, rowid)``, which
+        the status and updated_at indexes serve directly, so memory stays bounded
+        by ``page_size``. Rows updated while iterating may be skipped or repeated.
+        """
+        remaining = limit
+        after: Optional[tuple] = None
+        while remaining is None or remaining > 0:
+            page = page_size if remaining is None else min(page_size, remaining)
+            sql, params = self._list_query(
+                status, customer_id, query_name, since, until, page, after
+            )
+            rows = self._rows(sql, params)
+            for row in rows:
+                yield self._row_to_state(row)
+            if len(rows) < page:
+                return
+            if remaining is not None:
+                remaining -= len(rows)
+            after = (rows[-1][_UPDATED_AT], rows[-1][_ROWID])
+
+    def _list_query(self, *args: Any, **kwargs: Any) -> tuple[str, tuple]:
+        return _list_query(
+            *args, row_id=self._ROW_ID, row_id_param=self._ROW_ID_PARAM, **kwargs
+        )
+
+    def get_partition_states(
+        self, keys: Iterable[PartitionStateKey]
+    ) -> dict[PartitionStateKey, PartitionState]:
+        """Return existing states for many ``(source, customer_id, query_name, date)`` keys."""
+        keys = list(dict.fromkeys(keys))
+        rows: list = []
+        for offset in range(0, len(keys), _KEY_BATCH_SIZE):
+            batch = keys[offset : offset + _KEY_BATCH_SIZE]
+            values_sql = ", ".join(["(?, ?, ?, ?)"] * len(batch))
+            rows.extend(
+                self._rows(
+                    f"""
+                    SELECT *
+                      FROM partition_state
+                     WHERE (source, customer_id, query_name, logical_date)
+                           IN (VALUES {values_sql})
+                    """,
+                    [value for key in batch for value in _key_params(key)],
                 )
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                ON CONFLICT(source, customer_id, query_name, logical_date) DO UPDATE SET
-                    status=excluded.status,
-                    current_run_id=excluded.current_run_id,
-                    schema_version=excluded.schema_version,
-                    record_count=excluded.record_count,
-                    updated_at=excluded.updated_at,
-                    error_message=excluded.error_message,
-                    attempt_count=excluded.attempt_count
-                """,
-                (
-                    state.source,
-                    state.customer_id,
-                    state.query_name,
-                    state.logical_date.isoformat(),
-                    state.status,
-                    state.current_run_id,
-                    state.schema_version,
-                    state.record_count,
-                    state.updated_at.isoformat(),
-                    state.error_message,
-                    state.attempt_count,
-                ),
+            )
+        return self._states_by_key(rows)
+
+    def _states_by_key(self, rows: Iterable[Sequence]) -> dict[PartitionStateKey, PartitionState]:
+        states: dict[PartitionStateKey, PartitionState] = {}
+        for row in rows:
+            state = self._row_to_state(row)
+            states[(state.source, state.customer_id, state.query_name, state.logical_date)] = state
+        return states
+
+    def upsert_partition_state(self, state: PartitionState) -> None:
+        with self._transaction() as cursor:
+            cursor.execute(self._sql(_UPSERT_SQL), _state_params(state))
+
+    def upsert_partition_states(self, states: Iterable[PartitionState]) -> None:
+        """Upsert many states in a single transaction.
+
+        This saves a connection and commit per state, but every row still
+        updates the indexes and fires the event trigger, so the cost stays
+        linear in ``len(states)``.
+        """
+        with self._transaction() as cursor:
+            cursor.executemany(
+                self._sql(_UPSERT_SQL), [_state_params(state) for state in states]
             )
 
-    def _row_to_state(self, row: Optional[sqlite3.Row]) -> Optional[PartitionState]:
+    def read_state_columns(
+        self,
+        status: Optional[str] = None,
+        customer_id: Optional[str] = None,
+        query_name: Optional[str] = None,
+        since: Optional[date] = None,
+        until: Optional[date] = None,
+    ) -> PartitionStateColumns:
+        """Return keys and statuses of matching partitions without building records."""
+        sql, params = self._list_query(
+            status,
+            customer_id,
+            query_name,
+            since,
+            until,
+            columns="source, customer_id, query_name, CAST(logical_date AS TEXT), status",
+        )
+        columns: tuple[list[str], ...] = ([], [], [], [], [])
+        with self._cursor() as cursor:
+            cursor.execute(self._sql(sql), params)
+            while rows := cursor.fetchmany(_COLUMN_FETCH_SIZE):
+                for column, values in zip(columns, zip(*rows)):
+                    column.extend(map(intern, values))
+        return PartitionStateColumns(*columns)
+
+    def iter_authoritative_runs(self) -> Iterator[AuthoritativeRun]:
+        """Stream the authoritative run of every successful partition as plain tuples."""
+        return self._stream(
+            """
+            SELECT source, customer_id, query_name, CAST(logical_date AS TEXT),
+                   current_run_id, schema_version
+              FROM partition_state
+             WHERE status = 'success' AND current_run_id <> ''
+            """
+        )
+
+    def events_since(self, seq: int = 0, limit: int = 1000) -> list[PartitionStateEvent]:
+        """Return up to ``limit`` change events with a sequence number above ``seq``."""
+        rows = self._rows(
+            """
+            SELECT *
+              FROM partition_state_events
+             WHERE seq > ?
+             ORDER BY seq
+             LIMIT ?
+            """,
+            (seq, int(limit)),
+        )
+        return [_row_to_event(row) for row in rows]
+
+    def iter_events_since(
+        self, seq: int = 0, page_size: int = 1000
+    ) -> Iterator[PartitionStateEvent]:
+        """Yield every event after ``seq``, fetching ``page_size`` at a time."""
+        while events := self.events_since(seq, page_size):
+            yield from events
+            seq = events[-1].seq
+
+    def latest_event_seq(self) -> int:
+        """Return the highest recorded sequence number (0 when the log is empty)."""
+        return self._row("SELECT MAX(seq) FROM partition_state_events")[0] or 0
+
+    def status_counts(self) -> dict[str, int]:
+        """Return the number of partitions per status."""
+        rows = self._rows("SELECT status, COUNT(*) FROM partition_state GROUP BY status")
+        return {row[0]: row[1] for row in rows}
+
+    def count_terminal(self) -> int:
+        """Return the number of failed partitions flagged ``[terminal]``."""
+        row = self._row(
+            """
+            SELECT COUNT(*)
+              FROM partition_state
+             WHERE status = 'failed' AND error_message LIKE ?
+            """,
+            ("%[terminal]%",),
+        )
+        return row[0]
+
+    def date_ranges(self, status: Optional[str] = None) -> list[QueryDateRange]:
+        """Return earliest/latest logical date per ``(source, query_name)``."""
+        where_sql, params = ("WHERE status = ?", (status,)) if status else ("", ())
+        rows = self._rows(
+            f"""
+            SELECT source, query_name, MIN(logical_date), MAX(logical_date),
+                   COUNT(DISTINCT logical_date)
+              FROM partition_state
+              {where_sql}
+             GROUP BY source, query_name
+             ORDER BY source, query_name
+            """,
+            params,
+        )
+        return [
+            QueryDateRange(
+                source=row[0],
+                query_name=row[1],
+                earliest=_as_date(row[2]),
+                latest=_as_date(row[3]),
+                distinct_dates=row[4],
+            )
+            for row in rows
+        ]
+
+    def date_gaps(self, status: Optional[str] = "success") -> list[DateGap]:
+        """Return logical dates missing between each query's earliest and latest date."""
+        where_sql, params = ("WHERE status = ?", (status,)) if status else ("", ())
+        rows = self._rows(_GAPS_SQL.format(where_sql=where_sql, **self._GAP_EXPRESSIONS), params)
+        return [DateGap(row[0], row[1], _as_date(row[2]), _as_date(row[3])) for row in rows]
+
+    def attempt_summary(self) -> AttemptSummary:
+        row = self._row(
+            """
+            WITH attempts AS (
+                SELECT COALESCE(attempt_count, 0) AS attempts FROM partition_state
+            )
+            SELECT COUNT(*),
+                   COALESCE(MIN(attempts), 0),
+                   COALESCE(MAX(attempts), 0),
+                   COALESCE(AVG(attempts), 0.0),
+                   COALESCE(SUM(CASE WHEN attempts <= 2 THEN 1 ELSE 0 END), 0),
+                   COALESCE(SUM(CASE WHEN attempts BETWEEN 3 AND 5 THEN 1 ELSE 0 END), 0),
+                   COALESCE(SUM(CASE WHEN attempts BETWEEN 6 AND 10 THEN 1 ELSE 0 END), 0),
+                   COALESCE(SUM(CASE WHEN attempts > 10 THEN 1 ELSE 0 END), 0)
+              FROM attempts
+            """
+        )
+        return AttemptSummary(
+            partitions=row[0],
+            minimum=row[1],
+            maximum=row[2],
+            average=float(row[3]),
+            histogram=dict(zip(ATTEMPT_BUCKETS, (int(value) for value in row[4:]))),
+        )
+
+    def top_by_attempts(
+        self, limit: int, status: Optional[str] = None
+    ) -> list[PartitionState]:
+        """Return the ``limit`` partitions with the most attempts, failed first on ties."""
+        where_sql, params = ("WHERE status = ?", (status,)) if status else ("", ())
+        rows = self._rows(
+            f"""
+            SELECT *
+              FROM partition_state
+              {where_sql}
+             ORDER BY COALESCE(attempt_count, 0) DESC,
+                      CASE WHEN status = 'failed' THEN 0 ELSE 1 END,
+                      customer_id, query_name, logical_date
+             LIMIT ?
+            """,
+            (*params, int(limit)),
+        )
+        return [self._row_to_state(row) for row in rows]
+
+    def oldest_updated(self, status: str) -> Optional[PartitionState]:
+        """Return the least recently updated partition with ``status``."""
+        row = self._row(
+            """
+            SELECT *
+              FROM partition_state
+             WHERE status = ?
+             ORDER BY updated_at
+             LIMIT 1
+            """,
+            (status,),
+        )
+        return self._row_to_state(row)
+
+    def newest_updated(self, status: str) -> Optional[PartitionState]:
+        """Return the most recently updated partition with ``status``."""
+        states = self.list_partition_states(status=status, limit=1)
+        return states[0] if states else None
+
+    def _row_to_state(self, row: Optional[Sequence]) -> Optional[PartitionState]:
+        """Build a record from a row whose leading columns follow the table order."""
         if row is None:
             return None
+        # Low-cardinality text is interned so large scans share one copy per value.
+        current_run_id = row[5]
+        schema_version = row[6]
         return PartitionState(
-            source=row["source"],
-            customer_id=row["customer_id"],
-            query_name=row["query_name"],
-            logical_date=date.fromisoformat(row["logical_date"]),
-            status=row["status"],
-            current_run_id=row["current_run_id"],
-            schema_version=row["schema_version"],
-            record_count=row["record_count"],
-            updated_at=datetime.fromisoformat(row["updated_at"]),
-            error_message=row["error_message"],
-            attempt_count=row["attempt_count"],
+            source=intern(row[0]),
+            customer_id=intern(row[1]),
+            query_name=intern(row[2]),
+            logical_date=_as_date(row[3]),
+            status=intern(row[4]),
+            current_run_id=intern(current_run_id) if current_run_id else current_run_id,
+            schema_version=intern(schema_version) if schema_version else schema_version,
+            record_count=row[7],
+            updated_at=_as_datetime(row[_UPDATED_AT]),
+            error_message=row[9],
+            attempt_count=row[10],
+        )
+
+
+class PartitionStateRepository(PartitionStateStore):
+    """SQLite partition state store (the default, single-host backend).
+
+    The schema is versioned in ``schema_migrations``; pending migrations are
+    applied the first time the repository connects. With ``read_only=True`` the
+    database is opened with ``mode=ro`` instead: it is never created or
+    migrated, and connecting fails if it is missing or behind ``_MIGRATIONS``.
+
+    Each thread reuses one connection (opened lazily, reopened after a fork) in
+    WAL mode, so readers and a single writer proceed concurrently and
+    statements stay in the connection's prepared-statement cache. A thread's
+    connection is closed when the thread exits, so worker pools do not leak
+    connections. Writers wait up to ``busy_timeout`` seconds for the lock
+    instead of failing immediately.
+    """
+
+    def __init__(
+        self,
+        db_path: str | Path = "data/state_store.db",
+        busy_timeout: float = 30.0,
+        read_only: bool = False,
+    ) -> None:
+        self.db_path = Path(db_path)
+        self.busy_timeout = busy_timeout
+        self.read_only = read_only
+        if not read_only:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._local = threading.local()
+        self._connections: set[sqlite3.Connection] = set()
+        self._connections_lock = threading.Lock()
+        self._migrated = False
+
+    def _connect(self) -> sqlite3.Connection:
+        """Return this thread's connection; use it as ``with`` for a transaction."""
+        owner = getattr(self._local, "owner", None)
+        if owner is not None and owner.pid == os.getpid():
+            return owner.conn
+        if self.read_only and not self.db_path.exists():
+            raise RuntimeError(f"State store {self.db_path} does not exist")
+        conn = sqlite3.connect(
+            f"file:{self.db_path.resolve()}?mode=ro" if self.read_only else self.db_path,
+            timeout=self.busy_timeout,
+            cached_statements=_STATEMENT_CACHE_SIZE,
+            check_same_thread=False,  # only so close() may run from another thread
+            uri=self.read_only,
+        )
+        conn.row_factory = sqlite3.Row
+        for pragma in _READ_ONLY_PRAGMAS if self.read_only else _CONNECTION_PRAGMAS:
+            conn.execute(pragma)
+        if not self._migrated:
+            if self.read_only:
+                self._check_migrated(conn)
+            else:
+                self._migrate(conn)
+            self._migrated = True
+        owner = _ConnectionOwner(conn, os.getpid())
+        # The thread-local owner is dropped when the thread exits, which closes
+        # the connection; the finalizer must not reference ``self``.
+        weakref.finalize(
+            owner, _release_connection, conn, owner.pid, self._connections, self._connections_lock
+        )
+        self._local.owner = owner
+        with self._connections_lock:
+            self._connections.add(conn)
+        return conn
+
+    @contextmanager
+    def _cursor(self) -> Iterator[sqlite3.Cursor]:
+        cursor = self._connect().cursor()
+        cursor.row_factory = None  # positional tuples are cheaper than sqlite3.Row
+        try:
+            yield cursor
+        finally:
+            cursor.close()
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Cursor]:
+        conn = self._connect()
+        with conn:
+            cursor = conn.cursor()
+            try:
+                yield cursor
+            finally:
+                cursor.close()
+
+    def close(self) -> None:
+        """Close every connection opened by this repository."""
+        with self._connections_lock:
+            connections = list(self._connections)
+            self._connections.clear()
+        for conn in connections:
+            conn.close()
+        self._local = threading.local()
+
+    def ensure_schema(self) -> None:
+        """Apply any pending schema migrations (see ``_MIGRATIONS``).
+
+        A read-only repository only checks that none are pending.
+        """
+        self._connect()
+
+    def _check_migrated(self, conn: sqlite3.Connection) -> None:
+        try:
+            current = conn.execute("SELECT MAX(version) FROM schema_migrations").fetchone()[0]
+        except sqlite3.OperationalError:
+            current = None
+        _require_migrated(self.db_path, current, _MIGRATIONS[-1][0])
+
+    def _migrate(self, conn: sqlite3.Connection) -> None:
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS schema_migrations (
+                version INTEGER PRIMARY KEY,
+                applied_at TIMESTAMPTZ NOT NULL
+            )
+            """
         )
+        current = conn.execute("SELECT MAX(version) FROM schema_migrations").fetchone()[0] or 0
+        if current >= _MIGRATIONS[-1][0]:
+            return
+        # IMMEDIATE takes the write lock up front so concurrent processes
+        # apply each migration exactly once.
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            current = conn.execute("SELECT MAX(version) FROM schema_migrations").fetchone()[0]
+            for version, statements in _MIGRATIONS:
+                if version <= (current or 0):
+                    continue
+                for statement in statements:
+                    conn.execute(statement)
+                conn.execute(
+                    "INSERT INTO schema_migrations (version, applied_at) VALUES (?, ?)",
+                    (version, datetime.now(timezone.utc).isoformat()),
+                )
+        except BaseException:
+            conn.rollback()
+            raise
+        conn.commit()
+
+    def get_partition_states(
+        self, keys: Iterable[PartitionStateKey]
+    ) -> dict[PartitionStateKey, PartitionState]:
+        """Return existing states for many ``(source, customer_id, query_name, date)`` keys.
+
+        Small key sets are matched with one ``IN (VALUES ...)`` query; larger
+        ones are loaded into a temporary table and joined in a single query.
+        """
+        keys = list(dict.fromkeys(keys))
+        if len(keys) <= _KEY_BATCH_SIZE:
+            return super().get_partition_states(keys)
+        with self._transaction() as cursor:
+            cursor.execute(_LOOKUP_TABLE_SQL)
+            cursor.execute("DELETE FROM temp.partition_state_lookup")
+            cursor.executemany(
+                "INSERT OR IGNORE INTO temp.partition_state_lookup VALUES (?, ?, ?, ?)",
+                (_key_params(key) for key in keys),
+            )
+            rows = cursor.execute(
+                """
+                SELECT ps.*
+                  FROM temp.partition_state_lookup AS lookup
+                  JOIN partition_state AS ps
+                    ON ps.source = lookup.source
+                   AND ps.customer_id = lookup.customer_id
+                   AND ps.query_name = lookup.query_name
+                   AND ps.logical_date = lookup.logical_date
+                """
+            ).fetchall()
+            cursor.execute("DELETE FROM temp.partition_state_lookup")
+        return self._states_by_key(rows)
+
+
+class _ConnectionOwner:
+    """Holds one thread's connection; collected when the thread exits."""
+
+    __slots__ = ("conn", "pid", "__weakref__")
+
+    def __init__(self, conn: sqlite3.Connection, pid: int) -> None:
+        self.conn = conn
+        self.pid = pid
+
+
+def _release_connection(
+    conn: sqlite3.Connection,
+    pid: int,
+    connections: set[sqlite3.Connection],
+    lock: threading.Lock,
+) -> None:
+    if pid != os.getpid():
+        return  # inherited across a fork; only the parent may close it
+    with lock:
+        connections.discard(conn)
+    conn.close()
+
+
+# Positions in ``SELECT *`` (migration 1 column order) and ``_list_query`` rows.
+_UPDATED_AT = 8
+_ROWID = 11
+_STATEMENT_CACHE_SIZE = 256
+_CONNECTION_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",  # readers never block the writer (and vice versa)
+    "PRAGMA synchronous=NORMAL",  # durable at checkpoints; safe with WAL
+    "PRAGMA cache_size=-16384",  # 16 MiB page cache per connection
+    "PRAGMA temp_store=MEMORY",
+)
+# journal_mode is stored in the file and cannot be set through mode=ro;
+# synchronous only matters to writers.
+_READ_ONLY_PRAGMAS = _CONNECTION_PRAGMAS[2:]
+_COLUMN_FETCH_SIZE = 10_000
+_KEY_BATCH_SIZE = 200  # 4 parameters per key stays below SQLite's 999 limit
+
+_EVENT_INSERT_SQL = """
+                INSERT INTO partition_state_events (
+                    source, customer_id, query_name, logical_date, status, previous_status,
+                    current_run_id, schema_version, record_count, error_message,
+                    attempt_count, updated_at
+                )
+                VALUES (
+                    NEW.source, NEW.customer_id, NEW.query_name, NEW.logical_date,
+                    NEW.status, {previous_status}, NEW.current_run_id, NEW.schema_version,
+                    NEW.record_count, NEW.error_message, NEW.attempt_count, NEW.updated_at
+                )"""
+
+# (version, statements) applied in order; never edit a released migration.
+_MIGRATIONS: tuple[tuple[int, tuple[str, ...]], ...] = (
+    (
+        1,
+        (
+            """
+            CREATE TABLE IF NOT EXISTS partition_state (
+                source TEXT NOT NULL,
+                customer_id TEXT NOT NULL,
+                query_name TEXT NOT NULL,
+                logical_date DATE NOT NULL,
+                status TEXT NOT NULL CHECK (status IN ('pending','success','failed')),
+                current_run_id TEXT,
+                schema_version TEXT,
+                record_count BIGINT,
+                updated_at TIMESTAMPTZ NOT NULL,
+                error_message TEXT,
+                attempt_count INTEGER,
+                PRIMARY KEY (source, customer_id, query_name, logical_date)
+            )
+            """,
+        ),
+    ),
+    (
+        2,
+        (
+            # state inspect/retry/mark-terminal: status filter, newest first.
+            # Not covering: list queries read whole rows, and copying every
+            # column into each index would tax every upsert.
+            """
+            CREATE INDEX IF NOT EXISTS idx_partition_state_status_updated
+                ON partition_state (status, updated_at)
+            """,
+            # per-query date ranges (observe freshness, consumers)
+            """
+            CREATE INDEX IF NOT EXISTS idx_partition_state_query_date
+                ON partition_state (query_name, logical_date)
+            """,
+            # per-customer date ranges
+            """
+            CREATE INDEX IF NOT EXISTS idx_partition_state_customer_date
+                ON partition_state (customer_id, logical_date)
+            """,
+        ),
+    ),
+    (
+        3,
+        (
+            # cover the observe aggregates (date ranges and gaps, with or
+            # without a status filter) so they never touch the table
+            """
+            CREATE INDEX IF NOT EXISTS idx_partition_state_status_query_date
+                ON partition_state (status, source, query_name, logical_date)
+            """,
+            """
+            CREATE INDEX IF NOT EXISTS idx_partition_state_source_query_date
+                ON partition_state (source, query_name, logical_date)
+            """,
+        ),
+    ),
+    (
+        4,
+        (
+            # unfiltered keyset pagination (iter_partition_states)
+            """
+            CREATE INDEX IF NOT EXISTS idx_partition_state_updated
+                ON partition_state (updated_at)
+            """,
+        ),
+    ),
+    (
+        5,
+        (
+            # Change log written by triggers, i.e. in the writer's transaction.
+            """
+            CREATE TABLE IF NOT EXISTS partition_state_events (
+                seq INTEGER PRIMARY KEY AUTOINCREMENT,
+                source TEXT NOT NULL,
+                customer_id TEXT NOT NULL,
+                query_name TEXT NOT NULL,
+                logical_date DATE NOT NULL,
+                status TEXT NOT NULL,
+                previous_status TEXT,
+                current_run_id TEXT,
+                schema_version TEXT,
+                record_count BIGINT,
+                error_message TEXT,
+                attempt_count INTEGER,
+                updated_at TIMESTAMPTZ NOT NULL
+            )
+            """,
+            f"""
+            CREATE TRIGGER IF NOT EXISTS partition_state_events_insert
+            AFTER INSERT ON partition_state
+            BEGIN
+                {_EVENT_INSERT_SQL.format(previous_status="NULL")};
+            END
+            """,
+            f"""
+            CREATE TRIGGER IF NOT EXISTS partition_state_events_update
+            AFTER UPDATE ON partition_state
+            WHEN OLD.status IS NOT NEW.status
+              OR OLD.current_run_id IS NOT NEW.current_run_id
+              OR OLD.schema_version IS NOT NEW.schema_version
+              OR OLD.record_count IS NOT NEW.record_count
+              OR OLD.error_message IS NOT NEW.error_message
+              OR OLD.attempt_count IS NOT NEW.attempt_count
+            BEGIN
+                {_EVENT_INSERT_SQL.format(previous_status="OLD.status")};
+            END
+            """,
+            # Seed the log with the current state so replaying from seq 0
+            # reproduces the table.
+            """
+            INSERT INTO partition_state_events (
+                source, customer_id, query_name, logical_date, status, previous_status,
+                current_run_id, schema_version, record_count, error_message, attempt_count,
+                updated_at
+            )
+            SELECT source, customer_id, query_name, logical_date, status, NULL,
+                   current_run_id, schema_version, record_count, error_message, attempt_count,
+                   updated_at
+              FROM partition_state
+             ORDER BY updated_at, rowid
+            """,
+        ),
+    ),
+)
+
+_GAPS_SQL = """
+    WITH dates AS (
+        SELECT DISTINCT source, query_name, logical_date
+          FROM partition_state
+          {where_sql}
+    ),
+    ordered AS (
+        SELECT source, query_name, logical_date,
+               LAG(logical_date) OVER (
+                   PARTITION BY source, query_name ORDER BY logical_date
+               ) AS previous_date
+          FROM dates
+    )
+    SELECT source, query_name, {gap_start}, {gap_end}
+      FROM ordered
+     WHERE {gap_days} > 1
+     ORDER BY source, query_name, logical_date
+"""
+
+_LOOKUP_TABLE_SQL = """
+    CREATE TEMP TABLE IF NOT EXISTS partition_state_lookup (
+        source TEXT NOT NULL,
+        customer_id TEXT NOT NULL,
+        query_name TEXT NOT NULL,
+        logical_date DATE NOT NULL,
+        PRIMARY KEY (source, customer_id, query_name, logical_date)
+    )
+"""
+
+_UPSERT_SQL = """
+    INSERT INTO partition_state (
+        source,
+        customer_id,
+        query_name,
+        logical_date,
+        status,
+        current_run_id,
+        schema_version,
+        record_count,
+        updated_at,
+        error_message,
+        attempt_count
+    )
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT(source, customer_id, query_name, logical_date) DO UPDATE SET
+        status=excluded.status,
+        current_run_id=excluded.current_run_id,
+        schema_version=excluded.schema_version,
+        record_count=excluded.record_count,
+        updated_at=excluded.updated_at,
+        error_message=excluded.error_message,
+        attempt_count=excluded.attempt_count
+"""
+
+
+def _list_query(
+    status: Optional[str] = None,
+    customer_id: Optional[str] = None,
+    query_name: Optional[str] = None,
+    since: Optional[date] = None,
+    until: Optional[date] = None,
+    limit: Optional[int] = None,
+    after: Optional[tuple] = None,
+    row_id: str = "rowid",
+    row_id_param: str = "?",
+    columns: Optional[str] = None,
+) -> tuple[str, tuple]:
+    """Build the ``list_partition_states`` query (also used by the query plan tests).
+
+    ``after`` is the ``(updated_at, rowid)`` of the last row of the previous page;
+    ``row_id`` names the backend's physical row identifier. ``columns`` replaces
+    the default projection (every column, then the row id as ``state_rowid``).
+    """
+    where_clauses = []
+    params: list[object] = []
+    if status:
+        where_clauses.append("status = ?")
+        params.append(status)
+    if customer_id:
+        where_clauses.append("customer_id = ?")
+        params.append(customer_id)
+    if query_name:
+        where_clauses.append("query_name = ?")
+        params.append(query_name)
+    if since:
+        where_clauses.append("logical_date >= ?")
+        params.append(since.isoformat())
+    if until:
+        where_clauses.append("logical_date <= ?")
+        params.append(until.isoformat())
+    if after:
+        where_clauses.append(f"(updated_at, {row_id}) < (?, {row_id_param})")
+        params.extend(after)
+
+    where_sql = ""
+    if where_clauses:
+        where_sql = "WHERE " + " AND ".join(where_clauses)
+
+    limit_sql = ""
+    if limit is not None:
+        limit_sql = f" LIMIT {int(limit)}"
+
+    if columns is None:
+        columns = f"*, {row_id} AS state_rowid"
+
+    sql = f"""
+        SELECT {columns}
+          FROM partition_state
+          {where_sql}
+         ORDER BY updated_at DESC, {row_id} DESC
+         {limit_sql}
+    """
+    return sql, tuple(params)
+
+
+def _row_to_event(row: Sequence) -> PartitionStateEvent:
+    # Columns in partition_state_events order, which matches the dataclass.
+    return PartitionStateEvent(
+        *row[:4], _as_date(row[4]), *row[5:12], updated_at=_as_datetime(row[12])
+    )
+
+
+def _require_migrated(store: object, current: Optional[int], latest: int) -> None:
+    """Raise unless ``current`` (None when never migrated) has every migration."""
+    if (current or 0) < latest:
+        raise RuntimeError(
+            f"State store {store} is at schema version {current or 0}, expected {latest}; "
+            "run any command that writes state to migrate it"
+        )
+
+
+def _as_date(value: date | str) -> date:
+    return date.fromisoformat(value) if isinstance(value, str) else value
+
+
+def _as_datetime(value: datetime | str) -> datetime:
+    return datetime.fromisoformat(value) if isinstance(value, str) else value
+
+
+def _key_params(key: PartitionStateKey) -> tuple[str, str, str, str]:
+    source, customer_id, query_name, logical_date = key
+    return (source, customer_id, query_name, logical_date.isoformat())
+
+
+def _state_params(state: PartitionState) -> tuple:
+    return (
+        state.source,
+        state.customer_id,
+        state.query_name,
+        state.logical_date.isoformat(),
+        state.status,
+        state.current_run_id,
+        state.schema_version,
+        state.record_count,
+        state.updated_at.isoformat(),
+        state.error_message,
+        state.attempt_count,
+    )
 
 
-__all__ = ["PartitionState", "PartitionStateRepository"]
+__all__ = [
+    "ATTEMPT_BUCKETS",
+    "AttemptSummary",
+    "AuthoritativeRun",
+    "DateGap",
+    "PartitionState",
+    "PartitionStateColumns",
+    "PartitionStateEvent",
+    "PartitionStateKey",
+    "PartitionStateRepository",
+    "PartitionStateStore",
+    "QueryDateRange",
+]
@@ -0,0 +1,60 @@
+"""Factory for selecting the PartitionState store backend."""
+from __future__ import annotations
+
+import os
+from pathlib import Path
+
+from .config import ConfigLoader
+from .state_store import PartitionStateRepository, PartitionStateStore
+
+DEFAULT_STATE_DB_PATH = "data/state_store.db"
+DEFAULT_STATE_STORE_TABLE = "partition_state"
+
+
+def create_state_store(
+    db_path: str | Path = DEFAULT_STATE_DB_PATH, read_only: bool = False
+) -> PartitionStateStore:
+    """Return the configured store: PostgreSQL when ``STATE_STORE_URI`` is set, else SQLite.
+
+    A ``read_only`` store never creates or migrates the schema; its first
+    query fails if the store is missing or not fully migrated.
+    """
+    uri = os.getenv("STATE_STORE_URI")
+    if not uri:
+        return PartitionStateRepository(db_path=db_path, read_only=read_only)
+    if uri.startswith(("postgresql://", "postgres://")):
+        from .state_store_postgres import DEFAULT_POOL_SIZE, PostgresPartitionStateStore
+
+        return PostgresPartitionStateStore(
+            uri,
+            table=state_store_table(),
+            pool_size=int(os.getenv("STATE_STORE_POOL_SIZE", DEFAULT_POOL_SIZE)),
+            read_only=read_only,
+        )
+    raise RuntimeError(f"Unsupported STATE_STORE_URI scheme: {uri.split(':', 1)[0]}")
+
+
+def state_store_table() -> str:
+    """PostgreSQL table name: ``STATE_STORE_TABLE`` if set, else ``storage.state_store_table``."""
+    override = os.getenv("STATE_STORE_TABLE")
+    if override:
+        return override
+    table = ConfigLoader().model.storage.state_store_table
+    # The shipped config holds the unresolved ``${STATE_STORE_TABLE}`` placeholder.
+    if not table or table.startswith("${"):
+        return DEFAULT_STATE_STORE_TABLE
+    return table
+
+
+def state_store_exists(db_path: str | Path = DEFAULT_STATE_DB_PATH) -> bool:
+    """False only when the SQLite store at ``db_path`` has not been created yet."""
+    return bool(os.getenv("STATE_STORE_URI")) or Path(db_path).exists()
+
+
+__all__ = [
+    "DEFAULT_STATE_DB_PATH",
+    "DEFAULT_STATE_STORE_TABLE",
+    "create_state_store",
+    "state_store_exists",
+    "state_store_table",
+]
@@ -0,0 +1,418 @@
+"""PostgreSQL-backed PartitionState store for multi-host deployments."""
+from __future__ import annotations
+
+import os
+import re
+import threading
+from contextlib import contextmanager
+from typing import Iterable, Iterator, Sequence
+
+import psycopg
+from psycopg_pool import ConnectionPool
+
+from .state_store import (
+    PartitionState,
+    PartitionStateEvent,
+    PartitionStateKey,
+    PartitionStateStore,
+    _COLUMN_FETCH_SIZE,
+    _require_migrated,
+    _row_to_event,
+)
+
+DEFAULT_POOL_SIZE = 10
+_IDENTIFIER = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
+_TABLE_PREFIX = re.compile(r"\bpartition_state")
+
+
+class PostgresPartitionStateStore(PartitionStateStore):
+    """Partition state in a PostgreSQL table shared by every worker host.
+
+    Connections come from a bounded pool (recreated after a fork), upserts run
+    server-side as ``INSERT ... ON CONFLICT`` batches, and the change log is
+    written by a trigger in the writer's transaction. ``table`` prefixes every
+    object the store creates, so several environments can share one database.
+    With ``read_only=True`` every session is read-only and the schema is only
+    checked, never created or migrated.
+
+    Writers append events without any shared lock. An event only receives its
+    public ``seq`` once every transaction that could still commit an earlier
+    event has finished (see ``sequence_events``), so consumers resuming from
+    a ``seq`` never skip a late-committing write. Numbering runs on the write
+    path, after each write commits, so readers never write.
+    """
+
+    _ROW_ID = "row_id"  # identity column (migration 4); ctid moves on UPDATE
+    _ROW_ID_PARAM = "?"
+    _GAP_EXPRESSIONS = {
+        "gap_start": "previous_date + 1",
+        "gap_end": "logical_date - 1",
+        "gap_days": "logical_date - previous_date",
+    }
+
+    def __init__(
+        self,
+        dsn: str,
+        table: str = "partition_state",
+        pool_size: int = DEFAULT_POOL_SIZE,
+        read_only: bool = False,
+    ) -> None:
+        if not _IDENTIFIER.match(table):
+            raise ValueError(f"Invalid state store table name: {table!r}")
+        self.dsn = dsn
+        self.table = table
+        self.pool_size = pool_size
+        self.read_only = read_only
+        self._MIGRATIONS_TABLE = f"{table}_migrations"
+        self._pool_lock = threading.Lock()
+        self._pool_instance: ConnectionPool | None = None
+        self._pool_pid: int | None = None
+        self._migrated = False
+
+    def _pool(self) -> ConnectionPool:
+        with self._pool_lock:
+            if self._pool_instance is None or self._pool_pid != os.getpid():
+                # A pool inherited from the parent process shares its sockets.
+                self._pool_instance = ConnectionPool(
+                    self.dsn,
+                    min_size=1,
+                    max_size=self.pool_size,
+                    kwargs={"options": "-c default_transaction_read_only=on"}
+                    if self.read_only
+                    else None,
+                    open=True,
+                )
+                self._pool_pid = os.getpid()
+            pool = self._pool_instance
+        if not self._migrated:
+            with pool.connection() as conn:
+                if self.read_only:
+                    self._check_migrated(conn)
+                else:
+                    self._migrate(conn)
+            self._migrated = True
+        return pool
+
+    @contextmanager
+    def _cursor(self) -> Iterator[psycopg.Cursor]:
+        # The pool commits when the block succeeds and rolls back otherwise.
+        with self._pool().connection() as conn, conn.cursor() as cursor:
+            yield cursor
+
+    _transaction = _cursor
+
+    def _stream(self, sql: str, params: Sequence = ()) -> Iterator[Sequence]:
+        # Server-side cursor, so large scans never materialize on the client.
+        with self._pool().connection() as conn:
+            with conn.cursor(name="partition_state_scan") as cursor:
+                cursor.itersize = _COLUMN_FETCH_SIZE
+                cursor.execute(self._sql(sql), params)
+                yield from cursor
+
+    def _sql(self, sql: str) -> str:
+        return _TABLE_PREFIX.sub(self.table, sql).replace("?", "%s")
+
+    def close(self) -> None:
+        with self._pool_lock:
+            pool, self._pool_instance = self._pool_instance, None
+        if pool is not None and self._pool_pid == os.getpid():
+            pool.close()
+
+    def ensure_schema(self) -> None:
+        self._pool()
+
+    def _check_migrated(self, conn: psycopg.Connection) -> None:
+        current = None
+        if conn.execute("SELECT to_regclass(%s)", (self._MIGRATIONS_TABLE,)).fetchone()[0]:
+            current = conn.execute(
+                f"SELECT MAX(version) FROM {self._MIGRATIONS_TABLE}"
+            ).fetchone()[0]
+        _require_migrated(self.table, current, _MIGRATIONS[-1][0])
+
+    def _migrate(self, conn: psycopg.Connection) -> None:
+        with conn.transaction():
+            # Serializes concurrent first connections from every host.
+            conn.execute("SELECT pg_advisory_xact_lock(hashtext(%s))", (self._MIGRATIONS_TABLE,))
+            conn.execute(
+                f"""
+                CREATE TABLE IF NOT EXISTS {self._MIGRATIONS_TABLE} (
+                    version INTEGER PRIMARY KEY,
+                    applied_at TIMESTAMPTZ NOT NULL DEFAULT now()
+                )
+                """
+            )
+            current = conn.execute(
+                f"SELECT COALESCE(MAX(version), 0) FROM {self._MIGRATIONS_TABLE}"
+            ).fetchone()[0]
+            for version, statements in _MIGRATIONS:
+                if version <= current:
+                    continue
+                for statement in statements:
+                    conn.execute(statement.format(table=self.table))
+                conn.execute(
+                    f"INSERT INTO {self._MIGRATIONS_TABLE} (version) VALUES (%s)", (version,)
+                )
+
+    def get_partition_states(
+        self, keys: Iterable[PartitionStateKey]
+    ) -> dict[PartitionStateKey, PartitionState]:
+        """Return existing states for many keys with one array-parameter join."""
+        keys = list(dict.fromkeys(keys))
+        if not keys:
+            return {}
+        sources, customer_ids, query_names, logical_dates = map(list, zip(*keys))
+        rows = self._rows(
+            """
+            SELECT ps.*
+              FROM unnest(?::text[], ?::text[], ?::text[], ?::date[])
+                   AS lookup (source, customer_id, query_name, logical_date)
+              JOIN partition_state AS ps
+                ON ps.source = lookup.source
+               AND ps.customer_id = lookup.customer_id
+               AND ps.query_name = lookup.query_name
+               AND ps.logical_date = lookup.logical_date
+            """,
+            (sources, customer_ids, query_names, logical_dates),
+        )
+        return self._states_by_key(rows)
+
+    def upsert_partition_state(self, state: PartitionState) -> None:
+        super().upsert_partition_state(state)
+        self.sequence_events()
+
+    def upsert_partition_states(self, states: Iterable[PartitionState]) -> None:
+        super().upsert_partition_states(states)
+        self.sequence_events()
+
+    def events_since(self, seq: int = 0, limit: int = 1000) -> list[PartitionStateEvent]:
+        """Return up to ``limit`` change events with a sequence number above ``seq``."""
+        rows = self._rows(
+            """
+            SELECT seq, source, customer_id, query_name, logical_date, status,
+                   previous_status, current_run_id, schema_version, record_count,
+                   error_message, attempt_count, updated_at
+              FROM partition_state_events
+             WHERE seq > ?
+             ORDER BY seq
+             LIMIT ?
+            """,
+            (seq, int(limit)),
+        )
+        return [_row_to_event(row) for row in rows]
+
+    def sequence_events(self) -> None:
+        """Number the events of every finished transaction, in insertion order.
+
+        Events are appended with ``seq`` NULL and the writer's transaction id.
+        Transactions older than the snapshot's ``xmin`` can no longer commit
+        new rows, so their events are final and get the next sequence numbers
+        by insertion ``id``. Each write calls this in its own short transaction
+        after committing; the lock serializes numbering, never the writes.
+
+        ``xmin`` is cluster-wide: while any transaction on the server stays
+        open (a long report, an idle-in-transaction session), events written
+        after it started stay unnumbered and invisible to ``events_since``.
+        They are numbered by the first write, or explicit call, after that
+        transaction ends.
+        """
+        with self._transaction() as cursor:
+            cursor.execute(
+                "SELECT pg_advisory_xact_lock(hashtext(%s))", (f"{self.table}_events",)
+            )
+            cursor.execute(
+                self._sql(
+                    """
+                    WITH ready AS (
+                        SELECT id, row_number() OVER (ORDER BY id) AS position
+                          FROM partition_state_events
+                         WHERE seq IS NULL
+                           AND xact_id < pg_snapshot_xmin(pg_current_snapshot())
+                    )
+                    UPDATE partition_state_events AS event
+                       SET seq = ready.position + (
+                               SELECT COALESCE(MAX(seq), 0) FROM partition_state_events
+                           )
+                      FROM ready
+                     WHERE event.id = ready.id
+                    """
+                )
+            )
+
+
+# (version, statements) applied in order; ``{table}`` is the configured table.
+# Versions are independent of the SQLite migrations.
+_MIGRATIONS: tuple[tuple[int, tuple[str, ...]], ...] = (
+    (
+        1,
+        (
+            """
+            CREATE TABLE IF NOT EXISTS {table} (
+                source TEXT NOT NULL,
+                customer_id TEXT NOT NULL,
+                query_name TEXT NOT NULL,
+                logical_date DATE NOT NULL,
+                status TEXT NOT NULL CHECK (status IN ('pending','success','failed')),
+                current_run_id TEXT,
+                schema_version TEXT,
+                record_count BIGINT,
+                updated_at TIMESTAMPTZ NOT NULL,
+                error_message TEXT,
+                attempt_count INTEGER,
+                PRIMARY KEY (source, customer_id, query_name, logical_date)
+            )
+            """,
+            """
+            CREATE INDEX IF NOT EXISTS idx_{table}_status_updated
+                ON {table} (status, updated_at)
+            """,
+            """
+            CREATE INDEX IF NOT EXISTS idx_{table}_updated ON {table} (updated_at)
+            """,
+            """
+            CREATE INDEX IF NOT EXISTS idx_{table}_query_date
+                ON {table} (query_name, logical_date)
+            """,
+            """
+            CREATE INDEX IF NOT EXISTS idx_{table}_customer_date
+                ON {table} (customer_id, logical_date)
+            """,
+            """
+            CREATE INDEX IF NOT EXISTS idx_{table}_status_query_date
+                ON {table} (status, source, query_name, logical_date)
+            """,
+        ),
+    ),
+    (
+        2,
+        (
+            """
+            CREATE TABLE IF NOT EXISTS {table}_events (
+                seq BIGINT GENERATED ALWAYS AS IDENTITY PRIMARY KEY,
+                source TEXT NOT NULL,
+                customer_id TEXT NOT NULL,
+                query_name TEXT NOT NULL,
+                logical_date DATE NOT NULL,
+                status TEXT NOT NULL,
+                previous_status TEXT,
+                current_run_id TEXT,
+                schema_version TEXT,
+                record_count BIGINT,
+                error_message TEXT,
+                attempt_count INTEGER,
+                updated_at TIMESTAMPTZ NOT NULL
+            )
+            """,
+            """
+            CREATE OR REPLACE FUNCTION {table}_record_event() RETURNS trigger
+            LANGUAGE plpgsql AS $$
+            BEGIN
+                IF TG_OP = 'UPDATE' AND (
+                    OLD.status, OLD.current_run_id, OLD.schema_version,
+                    OLD.record_count, OLD.error_message, OLD.attempt_count
+                ) IS NOT DISTINCT FROM (
+                    NEW.status, NEW.current_run_id, NEW.schema_version,
+                    NEW.record_count, NEW.error_message, NEW.attempt_count
+                ) THEN
+                    RETURN NULL;
+                END IF;
+                PERFORM pg_advisory_xact_lock(hashtext(TG_TABLE_NAME || '_events'));
+                INSERT INTO {table}_events (
+                    source, customer_id, query_name, logical_date, status,
+                    previous_status, current_run_id, schema_version, record_count,
+                    error_message, attempt_count, updated_at
+                )
+                VALUES (
+                    NEW.source, NEW.customer_id, NEW.query_name, NEW.logical_date,
+                    NEW.status, CASE WHEN TG_OP = 'UPDATE' THEN OLD.status END,
+                    NEW.current_run_id, NEW.schema_version, NEW.record_count,
+                    NEW.error_message, NEW.attempt_count, NEW.updated_at
+                );
+                RETURN NULL;
+            END
+            $$
+            """,
+            """
+            CREATE OR REPLACE TRIGGER {table}_events
+            AFTER INSERT OR UPDATE ON {table}
+            FOR EACH ROW EXECUTE FUNCTION {table}_record_event()
+            """,
+        ),
+    ),
+    (
+        3,
+        (
+            # Same coverage as the SQLite migration 3 index.
+            """
+            CREATE INDEX IF NOT EXISTS idx_{table}_source_query_date
+                ON {table} (source, query_name, logical_date)
+            """,
+            # Drop the global writer lock: events keep their insertion ``id``
+            # and are given a public ``seq`` by readers once their transaction
+            # is no longer running (PostgreSQL 13+ for xid8).
+            """
+            ALTER TABLE {table}_events RENAME COLUMN seq TO id
+            """,
+            """
+            ALTER TABLE {table}_events ADD COLUMN seq BIGINT UNIQUE
+            """,
+            """
+            UPDATE {table}_events SET seq = id
+            """,
+            """
+            ALTER TABLE {table}_events
+                ADD COLUMN xact_id xid8 NOT NULL DEFAULT pg_current_xact_id()
+            """,
+            """
+            CREATE INDEX IF NOT EXISTS idx_{table}_events_unsequenced
+                ON {table}_events (id) WHERE seq IS NULL
+            """,
+            """
+            CREATE OR REPLACE FUNCTION {table}_record_event() RETURNS trigger
+            LANGUAGE plpgsql AS $$
+            BEGIN
+                IF TG_OP = 'UPDATE' AND (
+                    OLD.status, OLD.current_run_id, OLD.schema_version,
+                    OLD.record_count, OLD.error_message, OLD.attempt_count
+                ) IS NOT DISTINCT FROM (
+                    NEW.status, NEW.current_run_id, NEW.schema_version,
+                    NEW.record_count, NEW.error_message, NEW.attempt_count
+                ) THEN
+                    RETURN NULL;
+                END IF;
+                INSERT INTO {table}_events (
+                    source, customer_id, query_name, logical_date, status,
+                    previous_status, current_run_id, schema_version, record_count,
+                    error_message, attempt_count, updated_at
+                )
+                VALUES (
+                    NEW.source, NEW.customer_id, NEW.query_name, NEW.logical_date,
+                    NEW.status, CASE WHEN TG_OP = 'UPDATE' THEN OLD.status END,
+                    NEW.current_run_id, NEW.schema_version, NEW.record_count,
+                    NEW.error_message, NEW.attempt_count, NEW.updated_at
+                );
+                RETURN NULL;
+            END
+            $$
+            """,
+        ),
+    ),
+    (
+        4,
+        (
+            # Keyset pagination tiebreaker that survives UPDATE (ctid does not).
+            """
+            ALTER TABLE {table}
+                ADD COLUMN IF NOT EXISTS row_id BIGINT GENERATED ALWAYS AS IDENTITY
+            """,
+            """
+            CREATE INDEX IF NOT EXISTS idx_{table}_updated_row ON {table} (updated_at, row_id)
+            """,
+            """
+            DROP INDEX IF EXISTS idx_{table}_updated
+            """,
+        ),
+    ),
+)
+
+
+__all__ = ["DEFAULT_POOL_SIZE", "PostgresPartitionStateStore"]
@@ -1,23 +1,86 @@
 """Loader/validator that assigns authority to raw partitions."""
 from __future__ import annotations
 
-from datetime import datetime, timezone
-from typing import Optional
+import json
+import logging
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import date, datetime, timezone
+from typing import Callable, Iterable, Mapping, Optional, Sequence
 
-from .raw_sink import PartitionKey, RawSink
-from .state_store import PartitionState, PartitionStateRepository
+from .raw_sink import PartitionKey, PartitionReader, PayloadChunk, PayloadDigest, RawSink
+from .state_store import PartitionState, PartitionStateStore
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class FieldChecks:
+    """Per-row checks applied to the partitions of one query.
+
+    ``required_keys`` must be present in every row. With ``check_types``
+    each key must keep one JSON type across the partition (nulls are allowed
+    and integers and floats count as numbers).
+    """
+
+    required_keys: tuple[str, ...] = ()
+    check_types: bool = True
+
+    @classmethod
+    def from_query_fields(cls, fields: Sequence[str]) -> "FieldChecks":
+        """Expect the payload keys the extractor derives from a query's GAQL fields."""
+        return cls(required_keys=tuple(name.replace(".", "_") for name in fields))
+
+
+@dataclass(frozen=True)
+class ValidationOptions:
+    """How thoroughly partitions are inspected (picklable for worker processes)."""
+
+    deep: bool = False
+    chunk_workers: int = 1
+    field_checks: Mapping[str, FieldChecks] = field(default_factory=dict)  # by query_name
+
+
+@dataclass(frozen=True)
+class PartitionCheck:
+    """Outcome of inspecting one raw partition, before it is recorded in the state store."""
+
+    partition_key: PartitionKey
+    run_id: str
+    record_count: Optional[int] = None
+    error: Optional[str] = None
 
 
 class RawPartitionValidator:
-    """Validates raw partitions and records status in the state store."""
+    """Validates raw partitions and records status in the state store.
+
+    By default a partition is verified at raw I/O speed: each payload file is
+    streamed once and its checksum, byte size and newline count are compared
+    with metadata.json without decoding JSON. ``deep=True`` additionally parses
+    every row, as do ``field_checks`` registered for the partition's query.
+    Partitions written before checksums existed are always parsed. Every check
+    happens in the same single streaming pass, so memory stays bounded by the
+    read block size regardless of partition size. Chunked partitions are
+    scanned with up to ``chunk_workers`` threads, one payload chunk per task.
+    """
 
     def __init__(
         self,
         raw_sink: RawSink,
-        state_repo: PartitionStateRepository,
+        state_repo: PartitionStateStore,
+        chunk_workers: int = 1,
+        deep: bool = False,
+        field_checks: Optional[Mapping[str, FieldChecks]] = None,
     ) -> None:
         self.raw_sink = raw_sink
         self.state_repo = state_repo
+        self.options = ValidationOptions(
+            deep=deep,
+            chunk_workers=max(1, chunk_workers),
+            field_checks=dict(field_checks or {}),
+        )
         self.state_repo.ensure_schema()
 
     def validate_partition(
@@ -26,82 +89,110 @@ class RawPartitionValidator:
         run_id: str,
     ) -> PartitionState:
         """Validate payload/metadata and upsert partition state."""
-        try:
-            reader = self.raw_sink.open_partition(partition_key, run_id)
-        except FileNotFoundError as exc:
-            return self._record_failure(
-                partition_key,
-                f"Partition not found: {exc}",
-            )
+        check = inspect_partition(self.raw_sink, partition_key, run_id, self.options)
+        state = self._resolve(check, self._fetch_state(partition_key))
+        self.state_repo.upsert_partition_state(state)
+        return state
 
-        try:
-            metadata = reader.read_metadata()
-        except Exception as exc:  # pragma: no cover - unexpected parsing errors
-            return self._record_failure(partition_key, f"Metadata read failed: {exc}")
-
-        try:
-            rows = list(reader.iter_payload_rows())
-        except Exception as exc:  # pragma: no cover
-            return self._record_failure(partition_key, f"Payload read failed: {exc}")
-
-        record_count = int(metadata.get("record_count", len(rows)))
-        if record_count != len(rows):
-            return self._record_failure(
-                partition_key,
-                f"Record count mismatch: metadata={record_count} actual={len(rows)}",
+    def validate_run(
+        self,
+        run_id: str,
+        processes: int = 1,
+        sink_factory: Optional[Callable[[], RawSink]] = None,
+        batch_size: int = 500,
+    ) -> list[PartitionState]:
+        """Validate every partition written by ``run_id``.
+
+        Partitions are inspected across ``processes`` worker processes, each
+        building its own sink with ``sink_factory`` (a picklable callable such
+        as ``create_raw_sink``). Results are recorded ``batch_size`` at a time:
+        one query for the previous states and one transaction for the upserts.
+        """
+        targets = list(self.raw_sink.scan_partitions(run_id=run_id))
+        if processes > 1 and sink_factory is None:
+            raise ValueError("sink_factory is required to validate with worker processes")
+        if processes <= 1 or len(targets) < 2:
+            checks = (
+                inspect_partition(self.raw_sink, key, target_run_id, self.options)
+                for key, target_run_id in targets
             )
+            return self._record_batches(checks, batch_size)
+        with ProcessPoolExecutor(
+            max_workers=min(processes, len(targets)),
+            initializer=_init_worker,
+            initargs=(sink_factory, self.options),
+        ) as executor:
+            chunksize = max(1, min(64, len(targets) // (processes * 4)))
+            checks = executor.map(_inspect_in_worker, targets, chunksize=chunksize)
+            return self._record_batches(checks, batch_size)
+
+    def _record_batches(
+        self, checks: Iterable[PartitionCheck], batch_size: int
+    ) -> list[PartitionState]:
+        states: list[PartitionState] = []
+        batch: list[PartitionCheck] = []
+        for check in checks:
+            batch.append(check)
+            if len(batch) >= batch_size:
+                states.extend(self._record_batch(batch))
+                batch = []
+        if batch:
+            states.extend(self._record_batch(batch))
+        return states
 
-        return self._record_success(partition_key, run_id, record_count)
+    def _record_batch(self, checks: Sequence[PartitionCheck]) -> list[PartitionState]:
+        previous = self.state_repo.get_partition_states(
+            _state_key(check.partition_key) for check in checks
+        )
+        states = [
+            self._resolve(check, previous.get(_state_key(check.partition_key)))
+            for check in checks
+        ]
+        self.state_repo.upsert_partition_states(states)
+        return states
 
-    def _record_success(
-        self, partition_key: PartitionKey, run_id: str, record_count: int
+    def _resolve(
+        self, check: PartitionCheck, previous: Optional[PartitionState]
     ) -> PartitionState:
-        previous = self._fetch_state(partition_key)
-        logical_date = datetime.fromisoformat(partition_key.logical_date).date()
-        selected_run_id = run_id
-        selected_count = record_count
+        """Return the state to record for ``check`` given the current state row."""
+        partition_key = check.partition_key
+        attempt_count = (previous.attempt_count or 0) + 1 if previous else 1
+        if check.error is not None:
+            return PartitionState(
+                source=partition_key.source,
+                customer_id=partition_key.customer_id,
+                query_name=partition_key.query_name,
+                logical_date=datetime.fromisoformat(partition_key.logical_date).date(),
+                status="failed",
+                current_run_id=previous.current_run_id if previous else None,
+                schema_version=previous.schema_version if previous else None,
+                record_count=previous.record_count if previous else None,
+                updated_at=self._now(),
+                error_message=check.error,
+                attempt_count=attempt_count,
+            )
+        selected_run_id = check.run_id
+        selected_count = check.record_count
         schema_version = "v1"
         if previous and previous.current_run_id:
-            if self._compare_run_ids(run_id, previous.current_run_id) < 0:
+            if self._compare_run_ids(check.run_id, previous.current_run_id) < 0:
                 # Older run finished after a newer one; retain existing authority.
                 selected_run_id = previous.current_run_id
                 selected_count = previous.record_count or selected_count
                 schema_version = previous.schema_version or schema_version
-            else:
-                schema_version = "v1"
-        state = PartitionState(
+        return PartitionState(
             source=partition_key.source,
             customer_id=partition_key.customer_id,
             query_name=partition_key.query_name,
-            logical_date=logical_date,
+            logical_date=datetime.fromisoformat(partition_key.logical_date).date(),
             status="success",
             current_run_id=selected_run_id,
             schema_version=schema_version,
             record_count=selected_count,
             updated_at=self._now(),
             error_message=None,
-            attempt_count=(previous.attempt_count + 1) if previous else 1,
+            attempt_count=attempt_count,
         )
-        self.state_repo.upsert_partition_state(state)
-        return state
-
-    def _record_failure(self, partition_key: PartitionKey, message: str) -> PartitionState:
-        previous = self._fetch_state(partition_key)
-        state = PartitionState(
-            source=partition_key.source,
-            customer_id=partition_key.customer_id,
-            query_name=partition_key.query_name,
-            logical_date=datetime.fromisoformat(partition_key.logical_date).date(),
-            status="failed",
-            current_run_id=previous.current_run_id if previous else None,
-            schema_version=previous.schema_version if previous else None,
-            record_count=previous.record_count if previous else None,
-            updated_at=self._now(),
-            error_message=message,
-            attempt_count=(previous.attempt_count + 1) if previous else 1,
-        )
-        self.state_repo.upsert_partition_state(state)
-        return state
 
     def _fetch_state(self, partition_key: PartitionKey) -> Optional[PartitionState]:
         return self.state_repo.get_partition_state(
@@ -121,4 +212,281 @@ class RawPartitionValidator:
         return (candidate > existing) - (candidate < existing)
 
 
-__all__ = ["RawPartitionValidator"]
+class BackgroundValidator:
+    """Validates partitions on worker threads as soon as they are finalized.
+
+    Extraction hands each finalized partition to :meth:`submit` and carries on;
+    validation overlaps with the remaining extraction and reads payloads while
+    they are still in the page cache. :meth:`drain` waits for outstanding work.
+    """
+
+    def __init__(self, validator: RawPartitionValidator, workers: int = 1) -> None:
+        self.validator = validator
+        self._executor = ThreadPoolExecutor(
+            max_workers=max(1, workers), thread_name_prefix="auto-validate"
+        )
+        self._futures: list[Future] = []
+        self._lock = threading.Lock()
+
+    def submit(self, partition_key: PartitionKey, run_id: str) -> None:
+        future = self._executor.submit(self._validate, partition_key, run_id, time.monotonic())
+        with self._lock:
+            self._futures.append(future)
+
+    def drain(self) -> list[PartitionState]:
+        """Wait for every submitted partition and return the recorded states.
+
+        Raises the first validation error (e.g. a state store failure) once all
+        submitted partitions have finished.
+        """
+        with self._lock:
+            futures, self._futures = self._futures, []
+        states: list[PartitionState] = []
+        error: Optional[BaseException] = None
+        for future in futures:
+            try:
+                states.append(future.result())
+            except Exception as exc:
+                error = error or exc
+        if error is not None:
+            raise error
+        return states
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=True)
+
+    def _validate(
+        self, partition_key: PartitionKey, run_id: str, submitted_at: float
+    ) -> PartitionState:
+        state = self.validator.validate_partition(partition_key, run_id)
+        logger.info(
+            "Validated %s/%s/%s run_id=%s status=%s %.2fs after finalize",
+            partition_key.customer_id,
+            partition_key.query_name,
+            partition_key.logical_date,
+            run_id,
+            state.status,
+            time.monotonic() - submitted_at,
+        )
+        return state
+
+
+def inspect_partition(
+    raw_sink: RawSink,
+    partition_key: PartitionKey,
+    run_id: str,
+    options: ValidationOptions = ValidationOptions(),
+) -> PartitionCheck:
+    """Check one partition's payload against its metadata without touching the state store."""
+
+    def failed(message: str) -> PartitionCheck:
+        return PartitionCheck(partition_key, run_id, error=message)
+
+    try:
+        reader = raw_sink.open_partition(partition_key, run_id)
+    except FileNotFoundError as exc:
+        return failed(f"Partition not found: {exc}")
+
+    try:
+        metadata = reader.read_metadata()
+    except Exception as exc:  # pragma: no cover - unexpected parsing errors
+        return failed(f"Metadata read failed: {exc}")
+
+    checks = options.field_checks.get(partition_key.query_name)
+    try:
+        chunks = list(reader.payload_chunks())
+        scans = _scan_chunks(reader, chunks, checks, options)
+    except Exception as exc:
+        return failed(f"Payload read failed: {exc}")
+
+    row_count = 0
+    field_types: dict[str, str] = {}
+    for chunk, scan in zip(chunks, scans):
+        problem = scan.problem or _chunk_problem(chunk, scan)
+        if not problem and checks and checks.check_types:
+            problem = _merge_field_types(field_types, scan.field_types, chunk.name)
+        if problem:
+            return failed(problem)
+        row_count += scan.row_count
+    record_count = int(metadata.get("record_count", row_count))
+    if record_count != row_count:
+        return failed(f"Record count mismatch: metadata={record_count} actual={row_count}")
+    return PartitionCheck(partition_key, run_id, record_count=record_count)
+
+
+_worker_sink: Optional[RawSink] = None
+_worker_options = ValidationOptions()
+
+
+def _init_worker(sink_factory: Callable[[], RawSink], options: ValidationOptions) -> None:
+    global _worker_sink, _worker_options
+    _worker_sink = sink_factory()
+    _worker_options = options
+
+
+def _inspect_in_worker(target: tuple[PartitionKey, str]) -> PartitionCheck:
+    assert _worker_sink is not None
+    partition_key, run_id = target
+    return inspect_partition(_worker_sink, partition_key, run_id, _worker_options)
+
+
+def _state_key(partition_key: PartitionKey) -> tuple[str, str, str, date]:
+    return (
+        partition_key.source,
+        partition_key.customer_id,
+        partition_key.query_name,
+        date.fromisoformat(partition_key.logical_date),
+    )
+
+
+def _scan_chunks(
+    reader: PartitionReader,
+    chunks: Sequence[PayloadChunk],
+    checks: Optional[FieldChecks],
+    options: ValidationOptions,
+) -> list[_ChunkScan]:
+    def scan(chunk: PayloadChunk) -> _ChunkScan:
+        parse = options.deep or checks is not None or not _verifiable(chunk)
+        return _scan_chunk(reader, chunk, parse, checks)
+
+    if options.chunk_workers == 1 or len(chunks) < 2:
+        return [scan(chunk) for chunk in chunks]
+    with ThreadPoolExecutor(
+        max_workers=min(options.chunk_workers, len(chunks)),
+        thread_name_prefix="validate-chunk",
+    ) as executor:
+        return list(executor.map(scan, chunks))
+
+
+def _verifiable(chunk: PayloadChunk) -> bool:
+    """True when raw checks alone prove the chunk's content and row count."""
+    return (
+        chunk.checksum is not None
+        and chunk.line_count is not None
+        and chunk.record_count in (None, chunk.line_count)
+    )
+
+
+@dataclass
+class _ChunkScan:
+    """Result of streaming one payload chunk."""
+
+    digest: PayloadDigest
+    parsed_rows: Optional[int] = None  # None when rows were not decoded
+    field_types: dict[str, str] = field(default_factory=dict)
+    problem: Optional[str] = None
+
+    @property
+    def row_count(self) -> int:
+        return self.digest.line_count if self.parsed_rows is None else self.parsed_rows
+
+
+def _scan_chunk(
+    reader: PartitionReader,
+    chunk: PayloadChunk,
+    parse: bool,
+    checks: Optional[FieldChecks] = None,
+) -> _ChunkScan:
+    """Stream one chunk once, hashing raw blocks and optionally checking each row."""
+    scan = _ChunkScan(PayloadDigest())
+    if not parse:
+        for block in reader.iter_chunk_bytes(chunk):
+            scan.digest.update(block)
+        return scan
+    scan.parsed_rows = 0
+    carry = b""
+    for block in reader.iter_chunk_bytes(chunk):
+        scan.digest.update(block)
+        buffer = carry + block if carry else block
+        start = 0
+        while True:
+            end = buffer.find(b"\n", start)
+            if end < 0:
+                break
+            if not _check_line(scan, buffer[start:end], checks, chunk.name):
+                return scan
+            start = end + 1
+        carry = buffer[start:]
+    if carry and not _check_line(scan, carry, checks, chunk.name):
+        return scan
+    return scan
+
+
+def _check_line(
+    scan: _ChunkScan, line: bytes, checks: Optional[FieldChecks], chunk_name: str
+) -> bool:
+    """Decode and check one line; returns False once a problem is recorded."""
+    if not line.strip():
+        return True
+    row = json.loads(line)
+    scan.parsed_rows = (scan.parsed_rows or 0) + 1
+    if checks is None:
+        return True
+    if not isinstance(row, dict):
+        scan.problem = f"Row {scan.parsed_rows} in {chunk_name} is not a JSON object"
+        return False
+    missing = [key for key in checks.required_keys if key not in row]
+    if missing:
+        scan.problem = (
+            f"Row {scan.parsed_rows} in {chunk_name} is missing required fields: "
+            + ", ".join(missing)
+        )
+        return False
+    if checks.check_types:
+        for key, value in row.items():
+            if value is None:
+                continue
+            kind = _json_type(value)
+            expected = scan.field_types.setdefault(key, kind)
+            if kind != expected:
+                scan.problem = (
+                    f"Field {key} in {chunk_name} row {scan.parsed_rows} "
+                    f"has type {kind}; earlier rows have {expected}"
+                )
+                return False
+    return True
+
+
+def _json_type(value: object) -> str:
+    if isinstance(value, bool):
+        return "boolean"
+    if isinstance(value, (int, float)):
+        return "number"
+    if isinstance(value, str):
+        return "string"
+    if isinstance(value, list):
+        return "array"
+    return "object"
+
+
+def _merge_field_types(
+    seen: dict[str, str], chunk_types: Mapping[str, str], chunk_name: str
+) -> Optional[str]:
+    for key, kind in chunk_types.items():
+        expected = seen.setdefault(key, kind)
+        if kind != expected:
+            return f"Field {key} in {chunk_name} has type {kind}; earlier chunks have {expected}"
+    return None
+
+
+def _chunk_problem(chunk: PayloadChunk, scan: _ChunkScan) -> Optional[str]:
+    digest = scan.digest
+    for label, expected, actual in (
+        ("Checksum", chunk.checksum, digest.checksum),
+        ("Byte size", chunk.byte_size, digest.byte_size),
+        ("Line count", chunk.line_count, digest.line_count),
+        ("Record count", chunk.record_count, scan.row_count),
+    ):
+        if expected is not None and expected != actual:
+            return f"{label} mismatch in {chunk.name}: metadata={expected} actual={actual}"
+    return None
+
+
+__all__ = [
+    "BackgroundValidator",
+    "FieldChecks",
+    "PartitionCheck",
+    "RawPartitionValidator",
+    "ValidationOptions",
+    "inspect_partition",
+]
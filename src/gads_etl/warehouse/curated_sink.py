@@ -2,8 +2,10 @@
 from __future__ import annotations
 
 import json
+import os
+import uuid
 from pathlib import Path
-from typing import Iterable, Mapping
+from typing import Iterable, Iterator, Mapping
 
 from ..raw_sink import PartitionKey
 
@@ -23,6 +25,14 @@ class CuratedSink:
         """Write curated data for a logical partition."""
         raise NotImplementedError
 
+    def is_staged(self, partition_key: PartitionKey, run_id: str) -> bool:
+        """Return True once ``(partition_key, run_id)`` has been finalized."""
+        raise NotImplementedError
+
+    def iter_rows(self, partition_key: PartitionKey, run_id: str) -> Iterator[dict]:
+        """Yield the rows of a finalized curated partition in stored order."""
+        raise NotImplementedError
+
 
 class FilesystemCuratedSink(CuratedSink):
     """Filesystem-backed curated sink using staged directories."""
@@ -41,7 +51,12 @@ class FilesystemCuratedSink(CuratedSink):
         record_count: int,
         loaded_at: str,
     ) -> None:
-        """Write payload rows and finalize metadata atomically (metadata last)."""
+        """Write payload rows and finalize metadata atomically (metadata last).
+
+        Both files are written under temporary names and renamed into place, so
+        an interrupted staging leaves no partial ``data.jsonl`` behind and can
+        simply be retried.
+        """
         run_dir = self._partition_run_dir(partition_key, run_id)
         metadata_path = run_dir / "metadata.json"
         if metadata_path.exists():
@@ -63,6 +78,17 @@ class FilesystemCuratedSink(CuratedSink):
         }
         self._write_metadata(metadata_path, metadata)
 
+    def is_staged(self, partition_key: PartitionKey, run_id: str) -> bool:
+        return (self._partition_run_dir(partition_key, run_id) / "metadata.json").exists()
+
+    def iter_rows(self, partition_key: PartitionKey, run_id: str) -> Iterator[dict]:
+        run_dir = self._partition_run_dir(partition_key, run_id)
+        if not (run_dir / "metadata.json").exists():
+            raise FileNotFoundError(f"Curated partition not finalized: {run_dir}")
+        with (run_dir / "data.jsonl").open("r", encoding="utf-8") as fp:
+            for line in fp:
+                yield json.loads(line)
+
     def _partition_run_dir(self, partition_key: PartitionKey, run_id: str) -> Path:
         return (
             self._curated_root
@@ -76,12 +102,26 @@ class FilesystemCuratedSink(CuratedSink):
     def _write_data(
         self, data_path: Path, rows: Iterable[Mapping[str, object]]
     ) -> None:
-        with data_path.open("w", encoding="utf-8") as fp:
-            for row in rows:
-                fp.write(json.dumps(row, separators=(",", ":")))
-                fp.write("\n")
+        tmp_path = _tmp_path(data_path)
+        try:
+            with tmp_path.open("w", encoding="utf-8") as fp:
+                for row in rows:
+                    fp.write(json.dumps(row, separators=(",", ":")))
+                    fp.write("\n")
+            os.replace(tmp_path, data_path)
+        finally:
+            tmp_path.unlink(missing_ok=True)
 
     def _write_metadata(self, metadata_path: Path, metadata: Mapping[str, object]) -> None:
-        with metadata_path.open("w", encoding="utf-8") as fp:
-            json.dump(metadata, fp, separators=(",", ":"))
-            fp.write("\n")
+        tmp_path = _tmp_path(metadata_path)
+        try:
+            with tmp_path.open("w", encoding="utf-8") as fp:
+                json.dump(metadata, fp, separators=(",", ":"))
+                fp.write("\n")
+            os.replace(tmp_path, metadata_path)
+        finally:
+            tmp_path.unlink(missing_ok=True)
+
+
+def _tmp_path(path: Path) -> Path:
+    return path.with_name(f".{path.name}.{uuid.uuid4().hex}.tmp")
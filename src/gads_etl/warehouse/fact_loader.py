@@ -0,0 +1,246 @@
+"""Embedded fact tables (schema/warehouse_tables.sql) fed from curated partitions."""
+from __future__ import annotations
+
+import sqlite3
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from importlib import resources
+from itertools import islice
+from pathlib import Path
+from typing import Iterable, Mapping, Optional
+
+from ..raw_sink import PartitionKey
+
+# Shipped as package data, so the loader works from any working directory.
+_SCHEMA_RESOURCE = "schema/warehouse_tables.sql"
+_INSERT_BATCH_SIZE = 10_000
+
+# Loader bookkeeping kept next to the fact tables: the run and the dates each
+# logical partition contributed, and the watermark of the last complete load.
+_BOOKKEEPING_SQL = """
+CREATE TABLE IF NOT EXISTS fact_partitions (
+    source TEXT NOT NULL,
+    customer_id TEXT NOT NULL,
+    query_name TEXT NOT NULL,
+    logical_date TEXT NOT NULL,
+    run_id TEXT NOT NULL,
+    PRIMARY KEY (source, customer_id, query_name, logical_date)
+);
+CREATE TABLE IF NOT EXISTS fact_partition_dates (
+    source TEXT NOT NULL,
+    customer_id TEXT NOT NULL,
+    query_name TEXT NOT NULL,
+    logical_date TEXT NOT NULL,
+    date TEXT NOT NULL,
+    PRIMARY KEY (source, customer_id, query_name, logical_date, date)
+);
+CREATE TABLE IF NOT EXISTS fact_load_state (
+    id INTEGER PRIMARY KEY CHECK (id = 1),
+    watermark INTEGER NOT NULL,
+    loaded_at TEXT NOT NULL
+);
+"""
+_PARTITION_WHERE = "source = ? AND customer_id = ? AND query_name = ? AND logical_date = ?"
+
+
+@dataclass(frozen=True)
+class FactTableMapping:
+    """How the curated rows of one query populate one fact table.
+
+    ``columns`` maps fact columns to curated row fields. ``customer_id`` comes
+    from the partition key and ``date`` from the row's ``date_field`` (the
+    partition's logical date when the row has none), so one partition may
+    cover several dates.
+    """
+
+    table: str
+    columns: Mapping[str, str]
+    date_field: str = "segments_date"
+
+    def insert_sql(self) -> str:
+        names = ["customer_id", "date", *self.columns]
+        placeholders = ", ".join("?" * len(names))
+        return f"INSERT INTO {self.table} ({', '.join(names)}) VALUES ({placeholders})"
+
+    def delete_sql(self) -> str:
+        return f"DELETE FROM {self.table} WHERE customer_id = ? AND date = ?"
+
+    def row_values(self, partition_key: PartitionKey, row: Mapping[str, object]) -> tuple:
+        values = [
+            partition_key.customer_id,
+            row.get(self.date_field) or partition_key.logical_date,
+        ]
+        for column, field in self.columns.items():
+            value = row.get(field)
+            if column.endswith("_id") and value is not None:
+                value = str(value)  # IDs are VARCHAR; the API returns integers
+            values.append(value)
+        return tuple(values)
+
+
+# query_name -> mapping, for the queries in config/google_apis.yaml
+FACT_TABLE_MAPPINGS: dict[str, FactTableMapping] = {
+    "campaign_daily_performance": FactTableMapping(
+        table="fact_campaign_daily",
+        columns={
+            "campaign_id": "campaign_id",
+            "impressions": "metrics_impressions",
+            "clicks": "metrics_clicks",
+            "conversions": "metrics_conversions",
+            "cost_micros": "metrics_cost_micros",
+        },
+    ),
+    "ad_group_conversion": FactTableMapping(
+        table="fact_ad_group_daily",
+        columns={
+            "ad_group_id": "ad_group_id",
+            "campaign_id": "campaign_id",
+            "device": "segments_device",
+            "conversions": "metrics_conversions",
+            "cost_micros": "metrics_cost_micros",
+            "value_per_conversion": "metrics_value_per_conversion",
+        },
+    ),
+}
+
+
+class SQLiteFactTableLoader:
+    """Fact tables in an embedded SQLite database, replaced one logical partition at a time.
+
+    Replacing a partition deletes the ``(customer_id, date)`` rows of every
+    date it contributed last time and of every date in its new rows, then bulk
+    inserts the new rows. A whole batch of partitions commits in one
+    transaction, so dashboards never see a partial load. The database also
+    records which run each partition was loaded from and the watermark of the
+    last complete load (see ``loaded_runs`` and ``load_watermark``).
+    """
+
+    def __init__(
+        self,
+        db_path: str | Path = "data/warehouse.db",
+        schema_path: Optional[str | Path] = None,
+        mappings: Optional[Mapping[str, FactTableMapping]] = None,
+    ) -> None:
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.schema_path = None if schema_path is None else Path(schema_path)
+        self.mappings = dict(FACT_TABLE_MAPPINGS if mappings is None else mappings)
+        self._conn = sqlite3.connect(self.db_path, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")  # dashboards read while loads run
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self.ensure_schema()
+
+    def ensure_schema(self) -> None:
+        if self.schema_path is None:
+            schema = resources.files(__package__).joinpath(_SCHEMA_RESOURCE)
+        else:
+            schema = self.schema_path
+        with self._conn:
+            self._conn.executescript(schema.read_text(encoding="utf-8") + _BOOKKEEPING_SQL)
+
+    def load_watermark(self) -> Optional[int]:
+        """Watermark of the last complete load; None for a database never loaded."""
+        row = self._conn.execute("SELECT watermark FROM fact_load_state WHERE id = 1").fetchone()
+        return None if row is None else row[0]
+
+    def loaded_runs(self) -> dict[PartitionKey, str]:
+        """The run_id each partition in the fact tables was loaded from."""
+        return {
+            PartitionKey(source, customer_id, query_name, logical_date): run_id
+            for source, customer_id, query_name, logical_date, run_id in self._conn.execute(
+                "SELECT source, customer_id, query_name, logical_date, run_id FROM fact_partitions"
+            )
+        }
+
+    def close(self) -> None:
+        self._conn.close()
+
+    def replace_partitions(
+        self,
+        partitions: Iterable[tuple[PartitionKey, str, Iterable[Mapping[str, object]]]],
+        demote: Iterable[PartitionKey] = (),
+        watermark: Optional[int] = None,
+    ) -> int:
+        """Replace the fact rows of every ``(partition_key, run_id, rows)`` and drop ``demote``.
+
+        Everything runs in one transaction, which also records ``watermark``
+        when given; returns the number of rows inserted. Partitions of queries
+        without a mapping are skipped.
+        """
+        inserted = 0
+        with self._conn:
+            for partition_key in demote:
+                mapping = self.mappings.get(partition_key.query_name)
+                if mapping is not None:
+                    self._delete_partition(mapping, partition_key)
+            for partition_key, run_id, rows in partitions:
+                mapping = self.mappings.get(partition_key.query_name)
+                if mapping is None:
+                    continue
+                self._delete_partition(mapping, partition_key)
+                inserted += self._insert_partition(mapping, partition_key, rows)
+                self._conn.execute(
+                    "INSERT INTO fact_partitions VALUES (?, ?, ?, ?, ?)",
+                    (*_partition_params(partition_key), run_id),
+                )
+            if watermark is not None:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO fact_load_state (id, watermark, loaded_at) "
+                    "VALUES (1, ?, ?)",
+                    (watermark, datetime.now(timezone.utc).isoformat()),
+                )
+        return inserted
+
+    def _delete_partition(self, mapping: FactTableMapping, partition_key: PartitionKey) -> None:
+        """Delete the rows of every date the partition contributed, and its bookkeeping."""
+        params = _partition_params(partition_key)
+        dates = [
+            row[0]
+            for row in self._conn.execute(
+                f"SELECT date FROM fact_partition_dates WHERE {_PARTITION_WHERE}", params
+            )
+        ] or [partition_key.logical_date]  # loaded before dates were recorded
+        self._conn.executemany(
+            mapping.delete_sql(), [(partition_key.customer_id, day) for day in dates]
+        )
+        self._conn.execute(f"DELETE FROM fact_partition_dates WHERE {_PARTITION_WHERE}", params)
+        self._conn.execute(f"DELETE FROM fact_partitions WHERE {_PARTITION_WHERE}", params)
+
+    def _insert_partition(
+        self,
+        mapping: FactTableMapping,
+        partition_key: PartitionKey,
+        rows: Iterable[Mapping[str, object]],
+    ) -> int:
+        """Insert ``rows``, first clearing each ``(customer_id, date)`` they cover."""
+        inserted = 0
+        params = _partition_params(partition_key)
+        dates: set[str] = set()
+        values = (mapping.row_values(partition_key, row) for row in rows)
+        insert_sql = mapping.insert_sql()
+        while batch := list(islice(values, _INSERT_BATCH_SIZE)):
+            new_dates = sorted({value[1] for value in batch} - dates)
+            if new_dates:
+                self._conn.executemany(
+                    mapping.delete_sql(), [(partition_key.customer_id, day) for day in new_dates]
+                )
+                self._conn.executemany(
+                    "INSERT INTO fact_partition_dates VALUES (?, ?, ?, ?, ?)",
+                    [(*params, day) for day in new_dates],
+                )
+                dates.update(new_dates)
+            self._conn.executemany(insert_sql, batch)
+            inserted += len(batch)
+        return inserted
+
+
+def _partition_params(partition_key: PartitionKey) -> tuple[str, str, str, str]:
+    return (
+        partition_key.source,
+        partition_key.customer_id,
+        partition_key.query_name,
+        partition_key.logical_date,
+    )
+
+
+__all__ = ["FACT_TABLE_MAPPINGS", "FactTableMapping", "SQLiteFactTableLoader"]
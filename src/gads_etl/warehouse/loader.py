@@ -1,11 +1,18 @@
 """Warehouse loader abstractions per docs/warehouse_semantics.md."""
 
-from dataclasses import dataclass
-from datetime import datetime, timezone
-from typing import Optional, Tuple
+import logging
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, replace
+from datetime import date, datetime, timezone
+from typing import Iterable, Optional, Tuple
 
-from ..state_store import PartitionStateRepository
-from .pointer_store import WarehousePointer, WarehousePointerStore
+from ..raw_sink import PartitionKey, RawSink
+from ..state_store import PartitionStateStore
+from .curated_sink import CuratedSink
+from .fact_loader import SQLiteFactTableLoader
+from .pointer_store import PointerDiff, WarehousePointer, WarehousePointerStore
+
+logger = logging.getLogger(__name__)
 
 
 @dataclass(frozen=True)
@@ -27,6 +34,7 @@ class ReconciliationPlan:
     load: Tuple[LogicalPartitionTarget, ...]
     replace: Tuple[LogicalPartitionTarget, ...]
     demote: Tuple[WarehousePointer, ...]
+    failed: Tuple[LogicalPartitionTarget, ...] = ()  # staging failed; pointer unchanged
 
 
 class WarehouseLoader:
@@ -34,83 +42,201 @@ class WarehouseLoader:
 
     def __init__(
         self,
-        partition_state_repository: PartitionStateRepository,
+        partition_state_repository: PartitionStateStore,
         pointer_store: WarehousePointerStore,
+        raw_sink: Optional[RawSink] = None,
+        curated_sink: Optional[CuratedSink] = None,
+        staging_workers: int = 4,
+        fact_loader: Optional[SQLiteFactTableLoader] = None,
     ):
-        """Initialize the loader with read-only dependencies."""
+        """Initialize the loader with read-only dependencies.
+
+        Without a ``curated_sink`` the loader only moves pointers; with a
+        ``fact_loader`` it also refreshes the fact tables from curated data.
+        """
+        if curated_sink is not None and raw_sink is None:
+            raise ValueError("raw_sink is required to stage into a curated sink")
+        if fact_loader is not None and curated_sink is None:
+            raise ValueError("curated_sink is required to load fact tables")
         self._partition_state_repository = partition_state_repository
         self._pointer_store = pointer_store
+        self._raw_sink = raw_sink
+        self._curated_sink = curated_sink
+        self._staging_workers = max(1, staging_workers)
+        self._fact_loader = fact_loader
 
-    def run(self) -> ReconciliationPlan:
-        """Drive warehouse loading as defined in docs/warehouse_semantics.md."""
-        plan = self._reconcile_partitions()
-        self._publish(plan)
-        self._demote(plan)
+    def run(self, full: bool = False) -> ReconciliationPlan:
+        """Drive warehouse loading as defined in docs/warehouse_semantics.md.
+
+        Only partitions with state events after the stored watermark, plus
+        those whose previous load failed, are reconciled; ``full`` (or a
+        missing watermark) compares every partition, which also repairs
+        pointers changed outside the loader.
+        """
+        # Read before reconciling: later events are simply seen again next run.
+        high_water = self._partition_state_repository.latest_event_seq()
+        pointer_watermark = self._pointer_store.load_watermark()
+        watermark = None if full else pointer_watermark
+        if watermark is None:
+            plan = self._reconcile_partitions()
+        else:
+            plan = self._reconcile_changed_partitions(watermark)
+        if self._curated_sink is not None:
+            plan = self._stage(plan)
+        # Failed partitions are recorded for retry with the new watermark, so
+        # one bad partition does not make every later run replay its events.
+        self._publish(plan, watermark=high_water)
+        if self._fact_loader is not None:
+            # Facts follow the pointers. A fact watermark that differs from the
+            # pointer watermark this run started from means the fact database
+            # is new or an earlier run published pointers without finishing
+            # its fact load, so every pointer is compared with the loaded runs.
+            fact_watermark = self._fact_loader.load_watermark()
+            reconcile = full or fact_watermark is None or fact_watermark != pointer_watermark
+            self._load_facts(plan, watermark=high_water, reconcile=reconcile)
         return plan
 
     def _reconcile_partitions(self) -> ReconciliationPlan:
-        """Compare PartitionState with warehouse pointers to find work."""
-        states = self._partition_state_repository.list_partition_states(
-            status="success"
+        """Compare PartitionState with warehouse pointers to find work.
+
+        A partition needs a load when it has no pointer and a replacement when
+        its pointer differs in ``run_id`` or ``schema_version``; pointers with
+        no successful partition behind them are demoted.
+        """
+        diff = self._pointer_store.diff_runs(
+            self._partition_state_repository.iter_authoritative_runs()
         )
-        load_targets = []
-        replace_targets = []
-        success_keys = set()
-
-        for state in states:
-            current_run_id = state.current_run_id
-            if not current_run_id:
-                continue
-            logical_date = state.logical_date.isoformat()
-            key = (
-                state.source,
-                state.customer_id,
-                state.query_name,
-                logical_date,
+        return self._plan(diff)
+
+    @staticmethod
+    def _plan(diff: PointerDiff) -> ReconciliationPlan:
+        return ReconciliationPlan(
+            load=tuple(LogicalPartitionTarget(*run) for run in diff.load),
+            replace=tuple(LogicalPartitionTarget(*run) for run in diff.replace),
+            demote=tuple(diff.demote),
+        )
+
+    def _reconcile_changed_partitions(self, since_seq: int) -> ReconciliationPlan:
+        """Reconcile partitions with state events after ``since_seq`` or awaiting a retry."""
+        keys = {
+            (event.source, event.customer_id, event.query_name, event.logical_date)
+            for event in self._partition_state_repository.iter_events_since(since_seq)
+        }
+        keys.update(
+            (source, customer_id, query_name, date.fromisoformat(logical_date))
+            for source, customer_id, query_name, logical_date in (
+                self._pointer_store.load_retry_keys()
             )
-            success_keys.add(key)
-            pointer = self._pointer_store.get_pointer(
+        )
+        if not keys:
+            return ReconciliationPlan(load=(), replace=(), demote=())
+        states = self._partition_state_repository.get_partition_states(keys)
+        runs = [
+            (
                 state.source,
                 state.customer_id,
                 state.query_name,
-                logical_date,
+                state.logical_date.isoformat(),
+                state.current_run_id,
+                state.schema_version,
             )
-            target = LogicalPartitionTarget(
-                source=state.source,
-                customer_id=state.customer_id,
-                query_name=state.query_name,
-                logical_date=logical_date,
-                run_id=current_run_id,
-                schema_version=state.schema_version,
-            )
-            if pointer is None:
-                load_targets.append(target)
-                continue
-            if pointer.run_id != current_run_id:
-                replace_targets.append(target)
-
-        demotions = []
-        for pointer in self._pointer_store.list_pointers():
-            key = (
-                pointer.source,
-                pointer.customer_id,
-                pointer.query_name,
-                pointer.logical_date,
-            )
-            if key not in success_keys:
-                demotions.append(pointer)
+            for state in states.values()
+            if state.status == "success" and state.current_run_id
+        ]
+        scope = [(*key[:3], key[3].isoformat()) for key in keys]
+        return self._plan(self._pointer_store.diff_runs(runs, scope=scope))
 
-        return ReconciliationPlan(
-            load=tuple(load_targets),
-            replace=tuple(replace_targets),
-            demote=tuple(demotions),
+    def _stage(self, plan: ReconciliationPlan) -> ReconciliationPlan:
+        """Stage every load/replace target into the curated sink before its pointer swap.
+
+        Partitions are staged by ``staging_workers`` threads, each streaming
+        rows from the raw reader to the curated writer, with at most two tasks
+        per worker queued. Targets already staged for their run_id are skipped.
+        """
+        failed = set()
+        with ThreadPoolExecutor(
+            max_workers=self._staging_workers, thread_name_prefix="warehouse-stage"
+        ) as executor:
+            pending: dict[Future, LogicalPartitionTarget] = {}
+            for target in (*plan.load, *plan.replace):
+                if len(pending) >= 2 * self._staging_workers:
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    failed.update(_collect(pending, done))
+                pending[executor.submit(self._stage_target, target)] = target
+            failed.update(_collect(pending, set(pending)))
+        if not failed:
+            return plan
+        return replace(
+            plan,
+            load=tuple(target for target in plan.load if target not in failed),
+            replace=tuple(target for target in plan.replace if target not in failed),
+            failed=tuple(target for target in (*plan.load, *plan.replace) if target in failed),
+        )
+
+    def _stage_target(self, target: LogicalPartitionTarget) -> None:
+        partition_key = _partition_key(target)
+        if self._curated_sink.is_staged(partition_key, target.run_id):
+            return
+        reader = self._raw_sink.open_partition(partition_key, target.run_id)
+        metadata = reader.read_metadata()
+        self._curated_sink.stage_partition(
+            partition_key,
+            target.run_id,
+            reader.iter_payload_rows(),
+            schema_version=target.schema_version or str(metadata.get("schema_version") or ""),
+            record_count=int(metadata.get("record_count") or 0),
+            loaded_at=datetime.now(timezone.utc).isoformat(),
         )
 
-    def _publish(self, plan: ReconciliationPlan) -> None:
-        """Publish reconciled partitions by updating warehouse pointers."""
+    def _load_facts(
+        self, plan: ReconciliationPlan, watermark: int, reconcile: bool = False
+    ) -> None:
+        """Bring the fact tables in line with the pointers ``plan`` just published.
+
+        Normally only the plan's staged targets are replaced and its demoted
+        pointers dropped. With ``reconcile`` every current pointer whose run
+        differs from the run its facts were loaded from is reloaded, and fact
+        partitions without a pointer are dropped. The same transaction records
+        ``watermark``, so a crash leaves the old one and the next run reconciles.
+        """
+        if reconcile:
+            loaded = self._fact_loader.loaded_runs()
+            targets = []
+            for pointer in self._pointer_store.list_pointers():
+                partition_key = _pointer_partition_key(pointer)
+                if partition_key.query_name not in self._fact_loader.mappings:
+                    continue
+                if loaded.pop(partition_key, None) == pointer.run_id:
+                    continue
+                if not self._curated_sink.is_staged(partition_key, pointer.run_id):
+                    logger.warning(
+                        "Fact load skipped %s/%s/%s/%s run_id=%s: not in the curated sink",
+                        pointer.source,
+                        pointer.customer_id,
+                        pointer.query_name,
+                        pointer.logical_date,
+                        pointer.run_id,
+                    )
+                    continue
+                targets.append((partition_key, pointer.run_id))
+            demote: Iterable[PartitionKey] = list(loaded)
+        else:
+            targets = [
+                (_partition_key(target), target.run_id) for target in (*plan.load, *plan.replace)
+            ]
+            demote = (_pointer_partition_key(pointer) for pointer in plan.demote)
+        # Rows stay lazy; each partition is read while it is inserted.
+        partitions = (
+            (partition_key, run_id, self._curated_sink.iter_rows(partition_key, run_id))
+            for partition_key, run_id in targets
+        )
+        self._fact_loader.replace_partitions(partitions, demote, watermark=watermark)
+
+    def _publish(self, plan: ReconciliationPlan, watermark: Optional[int] = None) -> None:
+        """Swap pointers, drop demoted ones and record failed targets in one transaction."""
         now_iso = datetime.now(timezone.utc).isoformat()
-        for target in (*plan.load, *plan.replace):
-            pointer = WarehousePointer(
+        pointers = (
+            WarehousePointer(
                 source=target.source,
                 customer_id=target.customer_id,
                 query_name=target.query_name,
@@ -119,14 +245,52 @@ class WarehouseLoader:
                 schema_version=target.schema_version or "",
                 loaded_at=now_iso,
             )
-            self._pointer_store.upsert_pointer(pointer)
-
-    def _demote(self, plan: ReconciliationPlan) -> None:
-        """Remove warehouse pointers for non-authoritative partitions."""
-        for pointer in plan.demote:
-            self._pointer_store.delete_pointer(
-                pointer.source,
-                pointer.customer_id,
-                pointer.query_name,
-                pointer.logical_date,
+            for target in (*plan.load, *plan.replace)
+        )
+        demote = (
+            (pointer.source, pointer.customer_id, pointer.query_name, pointer.logical_date)
+            for pointer in plan.demote
+        )
+        retry = [
+            (target.source, target.customer_id, target.query_name, target.logical_date)
+            for target in plan.failed
+        ]
+        self._pointer_store.publish(pointers, demote, watermark=watermark, retry=retry)
+
+
+def _partition_key(target: LogicalPartitionTarget) -> PartitionKey:
+    return PartitionKey(
+        source=target.source,
+        customer_id=target.customer_id,
+        query_name=target.query_name,
+        logical_date=target.logical_date,
+    )
+
+
+def _pointer_partition_key(pointer: WarehousePointer) -> PartitionKey:
+    return PartitionKey(
+        source=pointer.source,
+        customer_id=pointer.customer_id,
+        query_name=pointer.query_name,
+        logical_date=pointer.logical_date,
+    )
+
+
+def _collect(
+    pending: dict[Future, LogicalPartitionTarget], done: Iterable[Future]
+) -> Iterable[LogicalPartitionTarget]:
+    """Pop finished staging futures from ``pending``; yields the failed targets."""
+    for future in done:
+        target = pending.pop(future)
+        exc = future.exception()
+        if exc is not None:
+            logger.error(
+                "Staging failed for %s/%s/%s/%s run_id=%s: %s",
+                target.source,
+                target.customer_id,
+                target.query_name,
+                target.logical_date,
+                target.run_id,
+                exc,
             )
+            yield target
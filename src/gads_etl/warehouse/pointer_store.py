@@ -1,8 +1,17 @@
 """Warehouse pointer interfaces enforced by docs/warehouse_semantics.md."""
 
 from dataclasses import dataclass
+from datetime import datetime, timezone
+from itertools import islice
 import sqlite3
-from typing import Optional
+from typing import Iterable, Optional
+
+# (source, customer_id, query_name, logical_date)
+PointerKey = tuple[str, str, str, str]
+# (source, customer_id, query_name, logical_date, run_id, schema_version)
+PointerRun = tuple[str, str, str, str, str, Optional[str]]
+
+_RUN_BATCH_SIZE = 10_000
 
 
 @dataclass(frozen=True)
@@ -18,6 +27,15 @@ class WarehousePointer:
     loaded_at: str  # ISO-8601 timestamp
 
 
+@dataclass(frozen=True)
+class PointerDiff:
+    """Pointer changes needed to match a set of authoritative runs."""
+
+    load: list[PointerRun]  # no pointer yet
+    replace: list[PointerRun]  # pointer on another run_id or schema_version
+    demote: list[WarehousePointer]  # pointer without an authoritative run
+
+
 class WarehousePointerStore:
     """Abstract persistence layer for warehouse pointers."""
 
@@ -37,6 +55,37 @@ class WarehousePointerStore:
         """Return all warehouse pointers."""
         raise NotImplementedError
 
+    def diff_runs(
+        self, runs: Iterable[PointerRun], scope: Optional[Iterable[PointerKey]] = None
+    ) -> PointerDiff:
+        """Compare pointers with the authoritative ``runs`` in one pass.
+
+        With ``scope``, only pointers for those keys are candidates for demotion.
+        """
+        raise NotImplementedError
+
+    def publish(
+        self,
+        pointers: Iterable[WarehousePointer],
+        demote: Iterable[PointerKey] = (),
+        watermark: Optional[int] = None,
+        retry: Optional[Iterable[PointerKey]] = None,
+    ):
+        """Apply pointer upserts, deletions, the watermark and retry keys as one atomic change."""
+        raise NotImplementedError
+
+    def load_retry_keys(self) -> list[PointerKey]:
+        """Return the partitions whose last load failed and must be reconciled again."""
+        raise NotImplementedError
+
+    def load_watermark(self) -> Optional[int]:
+        """Return the state event sequence the pointers were last reconciled to."""
+        raise NotImplementedError
+
+    def save_watermark(self, seq: int):
+        """Record that the pointers reflect every state event up to ``seq``."""
+        raise NotImplementedError
+
 
 class SQLiteWarehousePointerStore(WarehousePointerStore):
     """SQLite-backed WarehousePointerStore respecting docs/warehouse_semantics.md."""
@@ -45,6 +94,7 @@ class SQLiteWarehousePointerStore(WarehousePointerStore):
         self._db_path = db_path
         self._conn = sqlite3.connect(self._db_path)
         self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA temp_store=MEMORY")  # diff_runs staging table
         self.ensure_schema()
 
     def ensure_schema(self):
@@ -64,6 +114,27 @@ class SQLiteWarehousePointerStore(WarehousePointerStore):
                 )
                 """
             )
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS warehouse_watermark (
+                    id INTEGER PRIMARY KEY CHECK (id = 1),
+                    event_seq INTEGER NOT NULL,
+                    updated_at TIMESTAMPTZ NOT NULL
+                )
+                """
+            )
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS warehouse_retry (
+                    source TEXT NOT NULL,
+                    customer_id TEXT NOT NULL,
+                    query_name TEXT NOT NULL,
+                    logical_date DATE NOT NULL,
+                    failed_at TIMESTAMPTZ NOT NULL,
+                    PRIMARY KEY (source, customer_id, query_name, logical_date)
+                )
+                """
+            )
 
     def get_pointer(
         self,
@@ -107,33 +178,7 @@ class SQLiteWarehousePointerStore(WarehousePointerStore):
     def upsert_pointer(self, pointer: WarehousePointer):
         """Insert or replace a pointer."""
         with self._conn:
-            self._conn.execute(
-                """
-                INSERT INTO warehouse_pointers (
-                    source,
-                    customer_id,
-                    query_name,
-                    logical_date,
-                    run_id,
-                    schema_version,
-                    loaded_at
-                ) VALUES (?, ?, ?, ?, ?, ?, ?)
-                ON CONFLICT(source, customer_id, query_name, logical_date)
-                DO UPDATE SET
-                    run_id = excluded.run_id,
-                    schema_version = excluded.schema_version,
-                    loaded_at = excluded.loaded_at
-                """,
-                (
-                    pointer.source,
-                    pointer.customer_id,
-                    pointer.query_name,
-                    pointer.logical_date,
-                    pointer.run_id,
-                    pointer.schema_version,
-                    pointer.loaded_at,
-                ),
-            )
+            self._conn.execute(_UPSERT_SQL, _pointer_params(pointer))
 
     def delete_pointer(
         self,
@@ -144,16 +189,7 @@ class SQLiteWarehousePointerStore(WarehousePointerStore):
     ):
         """Remove a pointer for the logical partition."""
         with self._conn:
-            self._conn.execute(
-                """
-                DELETE FROM warehouse_pointers
-                WHERE source = ?
-                  AND customer_id = ?
-                  AND query_name = ?
-                  AND logical_date = ?
-                """,
-                (source, customer_id, query_name, logical_date),
-            )
+            self._conn.execute(_DELETE_SQL, (source, customer_id, query_name, logical_date))
 
     def list_pointers(self):
         """Return all warehouse pointers."""
@@ -183,3 +219,213 @@ class SQLiteWarehousePointerStore(WarehousePointerStore):
             )
             for row in rows
         ]
+
+    def diff_runs(
+        self, runs: Iterable[PointerRun], scope: Optional[Iterable[PointerKey]] = None
+    ) -> PointerDiff:
+        """Compare pointers with the authoritative ``runs`` in one pass.
+
+        ``runs`` is streamed into a temporary table, then one join yields the
+        loads and replacements and one anti-join the demotions, so the cost is
+        a few statements regardless of how many partitions exist. With
+        ``scope``, only pointers for those keys are candidates for demotion.
+        """
+        runs = iter(runs)
+        scope_sql = ""
+        with self._conn:
+            self._conn.execute(
+                """
+                CREATE TEMP TABLE IF NOT EXISTS authoritative_runs (
+                    source TEXT NOT NULL,
+                    customer_id TEXT NOT NULL,
+                    query_name TEXT NOT NULL,
+                    logical_date DATE NOT NULL,
+                    run_id TEXT NOT NULL,
+                    schema_version TEXT,
+                    PRIMARY KEY (source, customer_id, query_name, logical_date)
+                ) WITHOUT ROWID
+                """
+            )
+            self._conn.execute("DELETE FROM temp.authoritative_runs")
+            while batch := list(islice(runs, _RUN_BATCH_SIZE)):
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO temp.authoritative_runs VALUES (?, ?, ?, ?, ?, ?)",
+                    batch,
+                )
+            if scope is not None:
+                self._conn.execute(
+                    """
+                    CREATE TEMP TABLE IF NOT EXISTS reconcile_scope (
+                        source TEXT NOT NULL,
+                        customer_id TEXT NOT NULL,
+                        query_name TEXT NOT NULL,
+                        logical_date DATE NOT NULL,
+                        PRIMARY KEY (source, customer_id, query_name, logical_date)
+                    ) WITHOUT ROWID
+                    """
+                )
+                self._conn.execute("DELETE FROM temp.reconcile_scope")
+                self._conn.executemany(
+                    "INSERT OR IGNORE INTO temp.reconcile_scope VALUES (?, ?, ?, ?)", scope
+                )
+                scope_sql = (
+                    "JOIN temp.reconcile_scope"
+                    " USING (source, customer_id, query_name, logical_date)"
+                )
+            cursor = self._conn.cursor()
+            cursor.row_factory = None  # plain tuples; rows are passed through as-is
+            changed = cursor.execute(
+                """
+                SELECT
+                    runs.source,
+                    runs.customer_id,
+                    runs.query_name,
+                    runs.logical_date,
+                    runs.run_id,
+                    runs.schema_version,
+                    pointer.run_id IS NULL
+                FROM temp.authoritative_runs AS runs
+                LEFT JOIN warehouse_pointers AS pointer
+                  ON pointer.source = runs.source
+                 AND pointer.customer_id = runs.customer_id
+                 AND pointer.query_name = runs.query_name
+                 AND pointer.logical_date = runs.logical_date
+                WHERE pointer.run_id IS NULL
+                   OR pointer.run_id != runs.run_id
+                   OR pointer.schema_version != COALESCE(runs.schema_version, '')
+                """
+            ).fetchall()
+            stale = cursor.execute(
+                f"""
+                SELECT
+                    source,
+                    customer_id,
+                    query_name,
+                    logical_date,
+                    run_id,
+                    schema_version,
+                    loaded_at
+                FROM warehouse_pointers AS pointer
+                {scope_sql}
+                WHERE NOT EXISTS (
+                    SELECT 1
+                    FROM temp.authoritative_runs AS runs
+                    WHERE runs.source = pointer.source
+                      AND runs.customer_id = pointer.customer_id
+                      AND runs.query_name = pointer.query_name
+                      AND runs.logical_date = pointer.logical_date
+                )
+                ORDER BY source, customer_id, query_name, logical_date
+                """
+            ).fetchall()
+            self._conn.execute("DELETE FROM temp.authoritative_runs")
+            if scope is not None:
+                self._conn.execute("DELETE FROM temp.reconcile_scope")
+        return PointerDiff(
+            load=[row[:6] for row in changed if row[6]],
+            replace=[row[:6] for row in changed if not row[6]],
+            demote=[WarehousePointer(*row) for row in stale],
+        )
+
+    def load_watermark(self) -> Optional[int]:
+        """Return the state event sequence the pointers were last reconciled to."""
+        row = self._conn.execute("SELECT event_seq FROM warehouse_watermark").fetchone()
+        return row["event_seq"] if row else None
+
+    def save_watermark(self, seq: int):
+        """Record that the pointers reflect every state event up to ``seq``."""
+        with self._conn:
+            self._write_watermark(seq)
+
+    def load_retry_keys(self) -> list[PointerKey]:
+        """Return the partitions whose last load failed and must be reconciled again."""
+        cursor = self._conn.cursor()
+        cursor.row_factory = None
+        return cursor.execute(
+            """
+            SELECT source, customer_id, query_name, logical_date
+            FROM warehouse_retry
+            ORDER BY source, customer_id, query_name, logical_date
+            """
+        ).fetchall()
+
+    def publish(
+        self,
+        pointers: Iterable[WarehousePointer],
+        demote: Iterable[PointerKey] = (),
+        watermark: Optional[int] = None,
+        retry: Optional[Iterable[PointerKey]] = None,
+    ):
+        """Apply pointer upserts, deletions, the watermark and retry keys as one atomic change.
+
+        Everything commits in a single transaction, so readers see either the
+        previous pointers or the whole plan. Rows are sent with ``executemany``
+        in batches to keep memory flat for very large plans. ``retry``, when
+        given, replaces the recorded retry keys.
+        """
+        pointers = map(_pointer_params, pointers)
+        demote = iter(demote)
+        with self._conn:
+            while batch := list(islice(pointers, _RUN_BATCH_SIZE)):
+                self._conn.executemany(_UPSERT_SQL, batch)
+            while batch := list(islice(demote, _RUN_BATCH_SIZE)):
+                self._conn.executemany(_DELETE_SQL, batch)
+            if watermark is not None:
+                self._write_watermark(watermark)
+            if retry is not None:
+                failed_at = datetime.now(timezone.utc).isoformat()
+                self._conn.execute("DELETE FROM warehouse_retry")
+                self._conn.executemany(
+                    "INSERT OR IGNORE INTO warehouse_retry VALUES (?, ?, ?, ?, ?)",
+                    ((*key, failed_at) for key in retry),
+                )
+
+    def _write_watermark(self, seq: int):
+        self._conn.execute(
+            """
+            INSERT INTO warehouse_watermark (id, event_seq, updated_at)
+            VALUES (1, ?, ?)
+            ON CONFLICT(id) DO UPDATE SET
+                event_seq = excluded.event_seq,
+                updated_at = excluded.updated_at
+            """,
+            (seq, datetime.now(timezone.utc).isoformat()),
+        )
+
+
+_UPSERT_SQL = """
+    INSERT INTO warehouse_pointers (
+        source,
+        customer_id,
+        query_name,
+        logical_date,
+        run_id,
+        schema_version,
+        loaded_at
+    ) VALUES (?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT(source, customer_id, query_name, logical_date)
+    DO UPDATE SET
+        run_id = excluded.run_id,
+        schema_version = excluded.schema_version,
+        loaded_at = excluded.loaded_at
+"""
+
+_DELETE_SQL = """
+    DELETE FROM warehouse_pointers
+    WHERE source = ?
+      AND customer_id = ?
+      AND query_name = ?
+      AND logical_date = ?
+"""
+
+
+def _pointer_params(pointer: WarehousePointer) -> tuple:
+    return (
+        pointer.source,
+        pointer.customer_id,
+        pointer.query_name,
+        pointer.logical_date,
+        pointer.run_id,
+        pointer.schema_version,
+        pointer.loaded_at,
+    )
@@ -10,14 +10,21 @@ CREATE TABLE IF NOT EXISTS fact_campaign_daily (
     PRIMARY KEY (customer_id, campaign_id, date)
 );
 
+-- Loads replace one (customer_id, date) partition at a time.
+CREATE INDEX IF NOT EXISTS idx_fact_campaign_daily_customer_date
+    ON fact_campaign_daily (customer_id, date);
+
 CREATE TABLE IF NOT EXISTS fact_ad_group_daily (
     customer_id VARCHAR(32) NOT NULL,
     ad_group_id VARCHAR(32) NOT NULL,
     campaign_id VARCHAR(32) NOT NULL,
-    device VARCHAR(32),
+    device VARCHAR(32) NOT NULL,
     date DATE NOT NULL,
     conversions NUMERIC(18,4),
     cost_micros BIGINT,
     value_per_conversion NUMERIC(18,4),
-    PRIMARY KEY (customer_id, ad_group_id, date)
+    PRIMARY KEY (customer_id, ad_group_id, device, date)
 );
+
+CREATE INDEX IF NOT EXISTS idx_fact_ad_group_daily_customer_date
+    ON fact_ad_group_daily (customer_id, date);
@@ -4,6 +4,7 @@ from __future__ import annotations
 from pathlib import Path
 
 from gads_etl.config import ConfigLoader
+from gads_etl.state_store_factory import state_store_table
 
 
 def test_config_loader_parses_customer_ids(tmp_path: Path) -> None:
@@ -43,3 +44,19 @@ def test_config_loader_parses_customer_ids(tmp_path: Path) -> None:
     query = loader.get_query("sample_query")
     assert query.entity == "campaign"
     assert query.fields == ["campaign.id"]
+
+
+def test_state_store_table_comes_from_config_unless_overridden(tmp_path: Path, monkeypatch) -> None:
+    shipped = Path(__file__).parents[2] / "config" / "google_apis.yaml"
+    config_file = tmp_path / "config.yaml"
+    config_file.write_text(shipped.read_text().replace("${STATE_STORE_TABLE}", "etl_state"))
+    monkeypatch.delenv("STATE_STORE_TABLE", raising=False)
+
+    monkeypatch.setenv("GADS_CONFIG_PATH", str(config_file))
+    assert state_store_table() == "etl_state"
+    monkeypatch.setenv("STATE_STORE_TABLE", "override_state")
+    assert state_store_table() == "override_state"
+
+    monkeypatch.delenv("STATE_STORE_TABLE")
+    monkeypatch.setenv("GADS_CONFIG_PATH", str(shipped))
+    assert state_store_table() == "partition_state"
@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+from datetime import date
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import pytest
+
+from gads_etl.config import (
+    ExecutionConfig,
+    ExtractorsConfig,
+    GoogleAdsConfig,
+    MetadataConfig,
+    PipelineConfig,
+    QueryDefinition,
+    StorageConfig,
+)
+from gads_etl.pipeline import GoogleAdsExtractor, PipelineRunner
+from gads_etl.raw_sink import PartitionKey
+from gads_etl.raw_sink_local import LocalFilesystemRawSink
+from gads_etl.run_context import RunContext
+
+QUERY = QueryDefinition(
+    name="campaign_daily",
+    entity="campaign",
+    date_column="segments.date",
+    fields=["campaign.id", "metrics.clicks"],
+)
+KEY = PartitionKey("google_ads", "123", "campaign_daily", "2024-06-01")
+
+
+def _config(**execution) -> PipelineConfig:
+    return PipelineConfig(
+        metadata=MetadataConfig(),
+        storage=StorageConfig(warehouse_uri="", lake_bucket="", state_store_table=""),
+        extractors=ExtractorsConfig(
+            google_ads=GoogleAdsConfig(
+                api_version="v22",
+                login_customer_id="1",
+                manager_account_id="1",
+                customer_ids=["123"],
+                ads_resource_queries=[QUERY],
+            )
+        ),
+        execution=ExecutionConfig(**execution),
+    )
+
+
+def _client(batches) -> MagicMock:
+    client = MagicMock()
+    client.get_service.return_value.search_stream.return_value = batches
+    return client
+
+
+def _batch(start: int, stop: int) -> SimpleNamespace:
+    return SimpleNamespace(
+        results=[
+            SimpleNamespace(
+                campaign=SimpleNamespace(id=idx), metrics=SimpleNamespace(clicks=idx * 10)
+            )
+            for idx in range(start, stop)
+        ]
+    )
+
+
+def test_extract_partition_streams_rows_in_order(tmp_path):
+    sink = LocalFilesystemRawSink(tmp_path)
+    extractor = GoogleAdsExtractor(
+        _client([_batch(0, 300), _batch(300, 600)]),
+        _config(converter_workers=3, serializer_workers=2, queue_depth=16),
+        RunContext(run_id="run"),
+        sink,
+    )
+    extractor.extract_partition(QUERY, "123", "2024-06-01", date(2024, 5, 31), date(2024, 6, 1))
+
+    reader = sink.open_partition(KEY, "run")
+    rows = list(reader.iter_payload_rows())
+    assert [row["campaign_id"] for row in rows] == list(range(600))
+    assert rows[1] == {"campaign_id": 1, "metrics_clicks": 10, "__query_name": "campaign_daily"}
+    assert reader.read_metadata()["record_count"] == 600
+
+
+def test_extract_partition_aborts_writer_when_stream_fails(tmp_path):
+    def failing_stream():
+        yield _batch(0, 5)
+        raise ConnectionError("stream reset")
+
+    sink = LocalFilesystemRawSink(tmp_path)
+    extractor = GoogleAdsExtractor(
+        _client(failing_stream()), _config(), RunContext(run_id="run"), sink
+    )
+    with pytest.raises(ConnectionError):
+        extractor.extract_partition(
+            QUERY, "123", "2024-06-01", date(2024, 5, 31), date(2024, 6, 1)
+        )
+    assert sink.list_partitions(KEY) == ["run"]
+    with pytest.raises(FileNotFoundError):
+        sink.open_partition(KEY, "run")
+
+
+def test_sync_daily_keeps_extraction_error_when_validation_drain_fails():
+    runner = PipelineRunner.__new__(PipelineRunner)
+    runner.config = _config()
+    runner.run_context = RunContext(run_id="run")
+    runner.extractor = MagicMock()
+    runner.extractor.extract_partition.side_effect = ConnectionError("stream reset")
+    runner.background_validator = MagicMock()
+    runner.background_validator.drain.side_effect = RuntimeError("state store locked")
+
+    with pytest.raises(ConnectionError):
+        runner.sync_daily(target_date=date(2024, 6, 1), lookback_days=1)
+    runner.background_validator.drain.assert_called_once()
@@ -0,0 +1,118 @@
+from __future__ import annotations
+
+import json
+import time
+from array import array
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import MagicMock
+
+from gads_etl.raw_sink import PartitionKey
+from gads_etl.raw_sink_cache import LocalPartitionCache
+from gads_etl.raw_sink_local import _load_offset_index
+from gads_etl.raw_sink_object import ObjectStorageRawSink, S3Config
+
+KEY = PartitionKey("google_ads", "123", "campaign", "2024-06-01")
+
+
+def _filler(size: int, calls: list | None = None):
+    def fill(directory) -> None:
+        if calls is not None:
+            calls.append(directory)
+            time.sleep(0.05)
+        (directory / "payload.jsonl").write_bytes(b"x" * size)
+        (directory / "metadata.json").write_text("{}")
+
+    return fill
+
+
+def test_object_sink_reads_each_partition_from_the_bucket_once(tmp_path):
+    payload = b'{"idx": 0}\n{"idx": 1}\n'
+    client = MagicMock()
+    client.get_object.return_value = {"Body": MagicMock(read=lambda: b'{"record_count": 2}')}
+    client.download_fileobj.side_effect = lambda bucket, key, handle: handle.write(payload)
+    cache = LocalPartitionCache(tmp_path / "cache", max_bytes=1024)
+    config = S3Config(bucket="bucket", prefix="raw")
+    sink = ObjectStorageRawSink(config, client=client, cache=cache)
+
+    first = sink.open_partition(KEY, "run")
+    assert [row["idx"] for row in first.iter_payload_rows()] == [0, 1]
+    client.reset_mock()
+    cached = next((tmp_path / "cache").rglob("payload.idx"))
+    assert _load_offset_index(cached) == array("Q", [0, 11, len(payload)])
+
+    second = sink.open_partition(KEY, "run")
+    assert second.read_metadata() == {"record_count": 2}
+    assert [row["idx"] for row in second.iter_payload_rows()] == [0, 1]
+    assert not client.method_calls
+    stats = cache.stats()
+    assert (stats.hits, stats.misses, stats.fills, stats.entries) == (1, 1, 1, 1)
+
+
+def test_evicts_least_recently_used_partitions(tmp_path):
+    cache = LocalPartitionCache(tmp_path, max_bytes=250)
+    keys = [PartitionKey("google_ads", "123", "campaign", f"2024-06-0{day}") for day in (1, 2, 3)]
+    cache.get_or_fill(keys[0], "run", _filler(100))
+    cache.get_or_fill(keys[1], "run", _filler(100))
+    assert cache.lookup(keys[0], "run") is not None  # keys[1] is now least recent
+    cache.get_or_fill(keys[2], "run", _filler(100))
+
+    assert cache.lookup(keys[1], "run") is None
+    assert cache.lookup(keys[0], "run") is not None
+    stats = cache.stats()
+    assert stats.evictions == 1
+    assert stats.bytes_cached <= 250
+
+    reopened = LocalPartitionCache(tmp_path, max_bytes=250)
+    assert reopened.stats().entries == 2
+
+
+def test_concurrent_misses_share_one_fill(tmp_path):
+    cache = LocalPartitionCache(tmp_path, max_bytes=1024)
+    calls: list = []
+    fill = _filler(10, calls)
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        results = list(executor.map(lambda _: cache.get_or_fill(KEY, "run", fill), range(8)))
+    assert len(calls) == 1
+    assert len(set(results)) == 1
+    assert json.loads((results[0] / "metadata.json").read_text()) == {}
+    assert not any((tmp_path / ".tmp").iterdir())
+
+
+def test_partitions_over_budget_are_not_retained(tmp_path):
+    cache = LocalPartitionCache(tmp_path, max_bytes=50)
+    assert cache.get_or_fill(KEY, "run", _filler(100)) is None
+    assert cache.lookup(KEY, "run") is None
+    assert cache.stats().bytes_cached == 0
+
+
+def test_over_budget_partition_is_streamed_without_a_cache_fill(tmp_path):
+    payload = b'{"idx": 0}\n{"idx": 1}\n'
+    metadata = json.dumps({"record_count": 2, "payload_byte_size": len(payload)}).encode()
+    client = MagicMock()
+    client.get_object.side_effect = lambda **kwargs: {
+        "Body": MagicMock(
+            read=lambda: metadata, iter_lines=lambda: iter(payload.splitlines())
+        )
+    }
+    cache = LocalPartitionCache(tmp_path / "cache", max_bytes=len(payload) - 1)
+    config = S3Config(bucket="bucket", prefix="raw")
+    sink = ObjectStorageRawSink(config, client=client, cache=cache)
+
+    rows = list(sink.open_partition(KEY, "run").iter_payload_rows())
+    assert [row["idx"] for row in rows] == [0, 1]
+    assert not client.download_fileobj.called  # one GET of the payload, no staging copy
+    assert cache.stats().fills == 0
+
+
+def test_namespaces_keep_sinks_sharing_a_cache_apart(tmp_path):
+    cache = LocalPartitionCache(tmp_path, max_bytes=1024)
+    first = cache.get_or_fill(KEY, "run", _filler(10), namespace="bucket-a/raw")
+    second = cache.get_or_fill(KEY, "run", _filler(20), namespace="bucket-b/raw")
+    assert first != second
+    assert (second / "payload.jsonl").stat().st_size == 20
+    assert cache.lookup(KEY, "run", namespace="bucket-c/raw") is None
+    assert not cache._fill_locks
+
+    reopened = LocalPartitionCache(tmp_path, max_bytes=1024)
+    assert reopened.stats().entries == 2
+    assert reopened.lookup(KEY, "run", namespace="bucket-a/raw") == first
@@ -0,0 +1,119 @@
+from __future__ import annotations
+
+from datetime import date
+
+import pytest
+
+from gads_etl.raw_sink import PartitionKey
+from gads_etl.raw_sink_catalog import CatalogedRawSink, SQLitePartitionCatalog
+from gads_etl.raw_sink_local import LocalFilesystemRawSink
+
+
+def _write(sink, key: PartitionKey, run_id: str, rows: int = 2) -> None:
+    writer = sink.write_partition(key, run_id)
+    for idx in range(rows):
+        writer.write_payload_row({"idx": idx})
+    writer.finalize({"record_count": rows, "schema_version": "v1"})
+
+
+def _key(customer_id: str, logical_date: str, query_name: str = "campaign") -> PartitionKey:
+    return PartitionKey("google_ads", customer_id, query_name, logical_date)
+
+
+def test_finalize_records_partition_and_lists_from_catalog(tmp_path):
+    inner = LocalFilesystemRawSink(tmp_path / "raw")
+    sink = CatalogedRawSink(inner, SQLitePartitionCatalog(tmp_path / "catalog.db"))
+    key = _key("123", "2024-06-01")
+    _write(sink, key, "run-b")
+    _write(sink, key, "run-a")
+    # An unfinalized attempt is never catalogued.
+    sink.write_partition(key, "run-c").write_payload_row({"idx": 0})
+
+    assert sink.list_partitions(key) == ["run-a", "run-b"]
+    assert inner.list_partitions(key) == ["run-a", "run-b", "run-c"]
+
+
+def test_find_filters_by_any_subset(tmp_path):
+    catalog = SQLitePartitionCatalog(tmp_path / "catalog.db")
+    sink = CatalogedRawSink(LocalFilesystemRawSink(tmp_path / "raw"), catalog)
+    _write(sink, _key("123", "2024-05-31"), "run-1")
+    _write(sink, _key("123", "2024-06-01"), "run-1")
+    _write(sink, _key("123", "2024-06-30", "ad_group"), "run-2")
+    _write(sink, _key("456", "2024-06-15"), "run-1")
+
+    june = catalog.find(customer_id="123", since=date(2024, 6, 1), until=date(2024, 6, 30))
+    assert [(e.partition_key.query_name, e.partition_key.logical_date) for e in june] == [
+        ("ad_group", "2024-06-30"),
+        ("campaign", "2024-06-01"),
+    ]
+    assert len(catalog.find(run_id="run-1")) == 3
+    assert len(catalog.find(query_name="campaign")) == 3
+    assert catalog.find(customer_id="123", query_name="campaign")[0].record_count == 2
+
+
+def test_rebuild_reconstructs_catalog_from_storage(tmp_path):
+    inner = LocalFilesystemRawSink(tmp_path / "raw")
+    _write(inner, _key("123", "2024-06-01"), "run-1", rows=3)
+    _write(inner, _key("456", "2024-06-02"), "run-2")
+    inner.write_partition(_key("789", "2024-06-03"), "run-3").write_payload_row({})
+
+    catalog = SQLitePartitionCatalog(tmp_path / "catalog.db")
+    assert catalog.rebuild(inner) == 2
+    entries = catalog.find()
+    assert [(e.partition_key.customer_id, e.run_id, e.record_count) for e in entries] == [
+        ("123", "run-1", 3),
+        ("456", "run-2", 2),
+    ]
+
+
+def test_empty_catalog_is_backfilled_from_existing_partitions(tmp_path):
+    inner = LocalFilesystemRawSink(tmp_path / "raw")
+    key = _key("123", "2024-06-01")
+    _write(inner, key, "run-1")
+    _write(inner, _key("456", "2024-06-02"), "run-1")
+    inner.write_partition(key, "run-2").write_payload_row({})  # not finalized
+
+    catalog = SQLitePartitionCatalog(tmp_path / "catalog.db")
+    sink = CatalogedRawSink(inner, catalog)
+    _write(sink, key, "run-3")
+
+    assert sink.list_partitions(key) == ["run-1", "run-3"]
+    assert sorted(pk.customer_id for pk, _ in sink.scan_partitions("run-1")) == ["123", "456"]
+
+
+def test_scan_is_served_from_catalog_and_backfill_runs_once(tmp_path, monkeypatch):
+    inner = LocalFilesystemRawSink(tmp_path / "raw")
+    catalog = SQLitePartitionCatalog(tmp_path / "catalog.db")
+    CatalogedRawSink(inner, catalog)  # empty sink: backfilled with nothing
+
+    scans = []
+    monkeypatch.setattr(inner, "scan_partitions", lambda run_id=None: scans.append(run_id))
+    sink = CatalogedRawSink(inner, catalog)
+    _write(sink, _key("123", "2024-06-01"), "run-1")
+    _write(sink, _key("456", "2024-06-02"), "run-2")
+
+    assert [(pk.customer_id, run_id) for pk, run_id in sink.scan_partitions()] == [
+        ("123", "run-1"),
+        ("456", "run-2"),
+    ]
+    assert scans == []
+
+
+def test_partition_sealed_before_a_crash_is_reconciled_on_read(tmp_path, monkeypatch):
+    inner = LocalFilesystemRawSink(tmp_path / "raw")
+    catalog = SQLitePartitionCatalog(tmp_path / "catalog.db")
+    sink = CatalogedRawSink(inner, catalog)
+    key = _key("123", "2024-06-01")
+
+    def crash(*args):
+        raise KeyboardInterrupt
+
+    monkeypatch.setattr(catalog, "record", crash)
+    with pytest.raises(KeyboardInterrupt):
+        _write(sink, key, "run-1")  # sealed, then the process dies
+    monkeypatch.undo()
+    catalog.record_pending(key, "run-2", {"record_count": 1})  # writer still running
+
+    assert catalog.find() == []
+    assert sink.list_partitions(key) == ["run-1"]
+    assert catalog.find()[0].record_count == 2
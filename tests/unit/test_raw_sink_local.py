@@ -0,0 +1,145 @@
+from __future__ import annotations
+
+import json
+
+import pytest
+
+from gads_etl import raw_sink_local
+from gads_etl.raw_sink import PartitionKey
+from gads_etl.raw_sink_local import LocalFilesystemRawSink
+
+KEY = PartitionKey("google_ads", "123", "campaign", "2024-06-01")
+
+
+def _write(sink: LocalFilesystemRawSink, rows: int, run_id: str = "run") -> None:
+    writer = sink.write_partition(KEY, run_id)
+    for idx in range(rows):
+        writer.write_payload_row({"idx": idx, "pad": "x" * (idx % 7)})
+    writer.finalize({"record_count": rows})
+
+
+def _run_dir(tmp_path, run_id: str = "run"):
+    return (
+        tmp_path
+        / "google_ads"
+        / "customer_id=123"
+        / "query_name=campaign"
+        / "logical_date=2024-06-01"
+        / f"run_id={run_id}"
+    )
+
+
+def test_finalize_persists_index_for_random_access(tmp_path):
+    sink = LocalFilesystemRawSink(tmp_path)
+    _write(sink, 100)
+    assert (_run_dir(tmp_path) / "payload.idx").stat().st_size == 101 * 8
+
+    reader = sink.open_partition(KEY, "run")
+    assert reader.row_count() == 100
+    assert reader.read_row(0)["idx"] == 0
+    assert reader.read_row(-1)["idx"] == 99
+    assert [row["idx"] for row in reader.iter_rows(40, 43)] == [40, 41, 42]
+    assert [row["idx"] for row in reader.iter_payload_rows()] == list(range(100))
+    with pytest.raises(IndexError):
+        reader.read_row(100)
+
+
+def test_sample_rows_is_uniform_subset_in_order(tmp_path):
+    sink = LocalFilesystemRawSink(tmp_path)
+    _write(sink, 50)
+    reader = sink.open_partition(KEY, "run")
+    sample = [row["idx"] for row in reader.sample_rows(10, seed=7)]
+    assert len(sample) == 10
+    assert sample == sorted(set(sample))
+    assert len(reader.sample_rows(500)) == 50
+
+
+def test_reader_rebuilds_missing_or_stale_index(tmp_path):
+    sink = LocalFilesystemRawSink(tmp_path)
+    _write(sink, 5)
+    run_dir = _run_dir(tmp_path)
+    (run_dir / "payload.idx").unlink()
+    assert sink.open_partition(KEY, "run").row_count() == 5
+
+    (run_dir / "payload.idx").write_bytes(b"\0" * 16)
+    assert sink.open_partition(KEY, "run").read_row(4)["idx"] == 4
+
+
+def test_full_scan_streams_without_index_or_mapping(tmp_path, monkeypatch):
+    sink = LocalFilesystemRawSink(tmp_path, chunk_size=200)
+    _write(sink, 30)
+    for index_path in _run_dir(tmp_path).glob("*.idx"):
+        index_path.unlink()  # like a legacy partition
+    monkeypatch.setattr(raw_sink_local, "_build_offset_index", None)
+    monkeypatch.setattr(raw_sink_local.mmap, "mmap", None)
+
+    reader = sink.open_partition(KEY, "run")
+    assert [row["idx"] for row in reader.iter_payload_rows()] == list(range(30))
+
+
+def test_reader_context_manager_releases_mappings(tmp_path):
+    sink = LocalFilesystemRawSink(tmp_path)
+    _write(sink, 5)
+    with sink.open_partition(KEY, "run") as reader:
+        assert reader.read_row(4)["idx"] == 4
+        mapped = reader._file("payload.jsonl").data()
+    assert mapped.closed
+
+
+def test_resumed_write_and_empty_partition(tmp_path):
+    sink = LocalFilesystemRawSink(tmp_path)
+    run_dir = _run_dir(tmp_path, "resumed")
+    run_dir.mkdir(parents=True)
+    (run_dir / "payload.jsonl").write_text(json.dumps({"idx": -1}) + "\n\n")
+    writer = sink.write_partition(KEY, "resumed")
+    writer.write_payload_row({"idx": 0})
+    writer.finalize({"record_count": 2})
+    reader = sink.open_partition(KEY, "resumed")
+    assert [row["idx"] for row in reader.iter_payload_rows()] == [-1, 0]
+
+    sink.write_partition(KEY, "empty").finalize({"record_count": 0})
+    empty = sink.open_partition(KEY, "empty")
+    assert empty.row_count() == 0
+    assert list(empty.iter_payload_rows()) == []
+
+
+def test_chunked_partition_spans_rows_across_chunks(tmp_path):
+    sink = LocalFilesystemRawSink(tmp_path, chunk_size=200)
+    _write(sink, 50)
+    run_dir = _run_dir(tmp_path)
+    metadata = json.loads((run_dir / "metadata.json").read_text())
+    assert not (run_dir / "payload.jsonl").exists()
+    assert len(metadata["chunks"]) > 1
+    assert sum(chunk["record_count"] for chunk in metadata["chunks"]) == 50
+
+    reader = sink.open_partition(KEY, "run")
+    chunks = reader.payload_chunks()
+    assert [chunk.name for chunk in chunks][:2] == ["payload-00000.jsonl", "payload-00001.jsonl"]
+    per_chunk = [[row["idx"] for row in reader.iter_chunk_rows(chunk)] for chunk in chunks]
+    assert [idx for rows in per_chunk for idx in rows] == list(range(50))
+    assert reader.row_count() == 50
+    assert reader.read_row(-1)["idx"] == 49
+    boundary = chunks[0].record_count
+    assert [row["idx"] for row in reader.iter_rows(boundary - 1, boundary + 2)] == [
+        boundary - 1,
+        boundary,
+        boundary + 1,
+    ]
+
+
+def test_single_file_partition_exposes_one_chunk(tmp_path):
+    sink = LocalFilesystemRawSink(tmp_path)
+    _write(sink, 3)
+    chunks = sink.open_partition(KEY, "run").payload_chunks()
+    assert [(chunk.name, chunk.record_count) for chunk in chunks] == [("payload.jsonl", 3)]
+
+
+def test_chunked_abort_removes_chunk_files(tmp_path):
+    sink = LocalFilesystemRawSink(tmp_path, chunk_size=50)
+    writer = sink.write_partition(KEY, "run")
+    for idx in range(20):
+        writer.write_payload_row({"idx": idx})
+    writer.abort()
+    assert list(_run_dir(tmp_path).iterdir()) == []
+    with pytest.raises(FileNotFoundError):
+        sink.open_partition(KEY, "run")
@@ -1,7 +1,7 @@
 from __future__ import annotations
 
+import hashlib
 import json
-from pathlib import Path
 from unittest.mock import MagicMock
 
 from botocore.exceptions import ClientError
@@ -11,9 +11,11 @@ import pytest
 from gads_etl.raw_sink_object import (
     ObjectStorageRawSink,
     S3Config,
+    S3PartitionReader,
     S3PartitionWriter,
     _partition_prefix,
     _object_key,
+    shared_s3_client,
 )
 from gads_etl.raw_sink import PartitionKey
 
@@ -34,18 +36,326 @@ def _not_found_error():
     return ClientError({"Error": {"Code": "404"}}, "head_object")
 
 
-def test_writer_finalizes_payload_before_metadata(tmp_path: Path):
+def test_writer_finalizes_payload_before_metadata():
     client = MagicMock()
     client.head_object.side_effect = _not_found_error()
     writer = S3PartitionWriter(client, "bucket", "payload", "metadata")
-    writer._tempfile.close()
-    writer._tempfile = open(tmp_path / "payload.tmp", "w", encoding="utf-8")
     writer.write_payload_row({"a": 1})
     writer.finalize({"b": 2})
-    assert client.upload_file.called
-    assert client.put_object.called
-    upload_args = client.upload_file.call_args[0]
-    assert upload_args[1:] == ("bucket", "payload")
+    assert not client.create_multipart_upload.called
+    keys = [call.kwargs["Key"] for call in client.put_object.call_args_list]
+    assert keys == ["payload", "metadata"]
+    payload_kwargs = client.put_object.call_args_list[0].kwargs
+    assert payload_kwargs["Body"] == b'{"a": 1}\n'
     put_kwargs = client.put_object.call_args.kwargs
-    assert put_kwargs["Key"] == "metadata"
-    assert json.loads(put_kwargs["Body"].decode("utf-8")) == {"b": 2}
+    metadata = json.loads(put_kwargs["Body"].decode("utf-8"))
+    assert metadata["b"] == 2
+    assert metadata["payload_byte_size"] == len(payload_kwargs["Body"])
+    assert metadata["payload_line_count"] == 1
+    digest = hashlib.blake2b(payload_kwargs["Body"], digest_size=16).hexdigest()
+    assert metadata["payload_checksum"] == f"blake2b:{digest}"
+
+
+def test_writer_streams_multipart_parts_in_order():
+    client = MagicMock()
+    client.head_object.side_effect = _not_found_error()
+    client.create_multipart_upload.return_value = {"UploadId": "up-1"}
+    client.upload_part.side_effect = lambda **kwargs: {
+        "ETag": f"etag-{kwargs['PartNumber']}"
+    }
+    writer = S3PartitionWriter(
+        client, "bucket", "payload", "metadata", part_size=16, max_concurrency=2
+    )
+    for idx in range(10):
+        writer.write_payload_row({"idx": idx})
+    assert client.upload_part.called  # parts are shipped before finalize
+    writer.finalize({"b": 2})
+
+    bodies = {
+        call.kwargs["PartNumber"]: call.kwargs["Body"]
+        for call in client.upload_part.call_args_list
+    }
+    payload = b"".join(bodies[number] for number in sorted(bodies))
+    assert payload.decode("utf-8").splitlines() == [
+        json.dumps({"idx": idx}) for idx in range(10)
+    ]
+    parts = client.complete_multipart_upload.call_args.kwargs["MultipartUpload"]["Parts"]
+    assert [part["PartNumber"] for part in parts] == sorted(bodies)
+    assert client.put_object.call_args.kwargs["Key"] == "metadata"
+    assert not client.abort_multipart_upload.called
+
+
+def test_writer_aborts_multipart_on_part_failure():
+    client = MagicMock()
+    client.create_multipart_upload.return_value = {"UploadId": "up-1"}
+    client.upload_part.side_effect = RuntimeError("network down")
+    writer = S3PartitionWriter(
+        client, "bucket", "payload", "metadata", part_size=16, max_concurrency=1
+    )
+    with pytest.raises(RuntimeError, match="network down"):
+        for idx in range(10):
+            writer.write_payload_row({"idx": idx})
+    client.abort_multipart_upload.assert_called_once_with(
+        Bucket="bucket", Key="payload", UploadId="up-1"
+    )
+    assert not client.put_object.called
+    with pytest.raises(RuntimeError):
+        writer.write_payload_row({"idx": 99})
+
+
+def test_writer_refuses_finalized_partition():
+    client = MagicMock()
+    client.create_multipart_upload.return_value = {"UploadId": "up-1"}
+    client.upload_part.return_value = {"ETag": "etag"}
+    writer = S3PartitionWriter(client, "bucket", "payload", "metadata", part_size=16)
+    for idx in range(3):
+        writer.write_payload_row({"idx": idx})
+    with pytest.raises(RuntimeError, match="already finalized"):
+        writer.finalize({"b": 2})
+    assert client.abort_multipart_upload.called
+    assert not client.complete_multipart_upload.called
+    assert not client.put_object.called
+
+
+def test_config_rejects_undersized_parts():
+    with pytest.raises(ValueError):
+        S3Config(bucket="bucket", prefix="raw", multipart_part_size=1024)
+
+
+class _FakeRangeClient:
+    def __init__(self, payload: bytes):
+        self.payload = payload
+        self.ranges = []
+
+    def get_object(self, Bucket, Key, Range):
+        start, end = (int(part) for part in Range.split("=", 1)[1].split("-"))
+        self.ranges.append(start)
+        if start >= len(self.payload):
+            raise ClientError({"Error": {"Code": "InvalidRange"}}, "get_object")
+        data = self.payload[start : end + 1]
+        body = MagicMock()
+        body.read.return_value = data
+        return {
+            "Body": body,
+            "ContentRange": f"bytes {start}-{start + len(data) - 1}/{len(self.payload)}",
+        }
+
+
+@pytest.mark.parametrize("range_size", [1, 7, 64, 4096])
+def test_ranged_reader_stitches_rows_across_ranges(range_size):
+    rows = [{"idx": idx, "text": "x" * (idx % 13)} for idx in range(50)]
+    payload = "".join(json.dumps(row) + "\n" for row in rows).encode("utf-8")
+    client = _FakeRangeClient(payload)
+    reader = S3PartitionReader(
+        client,
+        "bucket",
+        "payload",
+        "metadata",
+        range_size=range_size,
+        max_concurrency=3,
+        metadata={},
+    )
+    assert list(reader.iter_payload_rows()) == rows
+    assert sorted(client.ranges) == list(range(0, len(payload), range_size))
+
+
+def test_ranged_reader_handles_empty_payload():
+    reader = S3PartitionReader(
+        _FakeRangeClient(b""), "bucket", "payload", "metadata", range_size=16, metadata={}
+    )
+    assert list(reader.iter_payload_rows()) == []
+
+
+def test_writer_rolls_over_chunks_and_records_them_in_metadata():
+    client = MagicMock()
+    client.head_object.side_effect = _not_found_error()
+    writer = S3PartitionWriter(
+        client, "bucket", "run/payload.jsonl", "run/metadata.json", chunk_size=20
+    )
+    for idx in range(5):
+        writer.write_payload_row({"idx": idx})  # 11 bytes per line
+    writer.finalize({"record_count": 5})
+    calls = client.put_object.call_args_list
+    assert [call.kwargs["Key"] for call in calls] == [
+        "run/payload-00000.jsonl",
+        "run/payload-00001.jsonl",
+        "run/payload-00002.jsonl",
+        "run/metadata.json",
+    ]
+    metadata = json.loads(calls[-1].kwargs["Body"])
+    assert [chunk["record_count"] for chunk in metadata["chunks"]] == [2, 2, 1]
+    first_body = calls[0].kwargs["Body"]
+    assert metadata["chunks"][0] == {
+        "name": "payload-00000.jsonl",
+        "record_count": 2,
+        "byte_size": 22,
+        "line_count": 2,
+        "checksum": "blake2b:" + hashlib.blake2b(first_body, digest_size=16).hexdigest(),
+    }
+
+
+def test_chunked_writer_abort_deletes_published_chunks():
+    client = MagicMock()
+    client.head_object.side_effect = _not_found_error()
+    writer = S3PartitionWriter(
+        client, "bucket", "run/payload.jsonl", "run/metadata.json", chunk_size=20
+    )
+    for idx in range(3):
+        writer.write_payload_row({"idx": idx})
+    writer.abort()
+    client.delete_object.assert_called_once_with(
+        Bucket="bucket", Key="run/payload-00000.jsonl"
+    )
+
+
+def test_reader_reads_chunks_from_sibling_objects():
+    bodies = {
+        "run/payload-00000.jsonl": [b'{"idx": 0}', b'{"idx": 1}'],
+        "run/payload-00001.jsonl": [b'{"idx": 2}'],
+    }
+    client = MagicMock()
+    client.get_object.side_effect = lambda Bucket, Key: {
+        "Body": MagicMock(iter_lines=lambda: iter(bodies[Key]))
+    }
+    metadata = {
+        "record_count": 3,
+        "chunks": [
+            {"name": "payload-00000.jsonl", "record_count": 2},
+            {"name": "payload-00001.jsonl", "record_count": 1},
+        ],
+    }
+    reader = S3PartitionReader(
+        client, "bucket", "run/payload.jsonl", "run/metadata.json", metadata=metadata
+    )
+    chunks = reader.payload_chunks()
+    assert [chunk.record_count for chunk in chunks] == [2, 1]
+    assert list(reader.iter_chunk_rows(chunks[1])) == [{"idx": 2}]
+    assert [row["idx"] for row in reader.iter_payload_rows()] == [0, 1, 2]
+
+
+def _precondition_failed():
+    return ClientError({"Error": {"Code": "PreconditionFailed"}}, "put_object")
+
+
+def _sink(client) -> ObjectStorageRawSink:
+    return ObjectStorageRawSink(S3Config(bucket="bucket", prefix="raw"), client=client)
+
+
+def test_sink_write_checks_seal_once_then_uses_conditional_puts():
+    client = MagicMock()
+    client.head_object.side_effect = _not_found_error()
+    key = PartitionKey("google_ads", "123", "campaign", "2024-06-01")
+    writer = _sink(client).write_partition(key, "run")
+    writer.write_payload_row({"a": 1})
+    writer.finalize({"b": 2})
+    client.head_object.assert_called_once()
+    assert [call.kwargs["IfNoneMatch"] for call in client.put_object.call_args_list] == [
+        "*",
+        "*",
+    ]
+
+
+def test_sink_write_refuses_sealed_partition_before_extraction():
+    client = MagicMock()
+    key = PartitionKey("google_ads", "123", "campaign", "2024-06-01")
+    with pytest.raises(RuntimeError, match="already finalized"):
+        _sink(client).write_partition(key, "run")
+    assert not client.put_object.called
+
+
+def test_sink_write_refuses_partition_sealed_after_payload_collision():
+    client = MagicMock()
+    client.head_object.side_effect = [_not_found_error(), {}]
+    client.put_object.side_effect = _precondition_failed()
+    key = PartitionKey("google_ads", "123", "campaign", "2024-06-01")
+    writer = _sink(client).write_partition(key, "run")
+    writer.write_payload_row({"a": 1})
+    with pytest.raises(RuntimeError, match="already finalized"):
+        writer.finalize({"b": 2})
+    assert client.head_object.call_count == 2
+    assert client.put_object.call_count == 1
+
+
+def test_sink_write_replaces_orphan_payload_from_crashed_attempt():
+    client = MagicMock()
+    client.put_object.side_effect = [_precondition_failed(), {}, {}]
+    client.head_object.side_effect = _not_found_error()
+    key = PartitionKey("google_ads", "123", "campaign", "2024-06-01")
+    writer = _sink(client).write_partition(key, "run")
+    writer.write_payload_row({"a": 1})
+    writer.finalize({"b": 2})
+    calls = client.put_object.call_args_list
+    assert "IfNoneMatch" not in calls[1].kwargs
+    assert calls[2].kwargs["Key"].endswith("metadata.json")
+
+
+def _multipart_client(head_object):
+    client = MagicMock()
+    client.head_object.side_effect = head_object
+    client.create_multipart_upload.return_value = {"UploadId": "up-1"}
+    client.upload_part.side_effect = lambda **kwargs: {
+        "ETag": hashlib.md5(kwargs["Body"]).hexdigest()
+    }
+    client.complete_multipart_upload.side_effect = [
+        ClientError({"Error": {"Code": "PreconditionFailed"}}, "complete_multipart_upload"),
+        ClientError({"Error": {"Code": "NoSuchUpload"}}, "complete_multipart_upload"),
+    ]
+    return client
+
+
+def _write_multipart(client):
+    writer = S3PartitionWriter(
+        client, "bucket", "payload", "metadata", part_size=16, conditional_writes=True
+    )
+    for idx in range(4):
+        writer.write_payload_row({"idx": idx})
+    return writer
+
+
+def test_writer_aborts_when_orphan_replacement_loses_the_upload():
+    other = {"ETag": '"someone-else-1"'}
+    client = _multipart_client([_not_found_error(), other])
+    writer = _write_multipart(client)
+    with pytest.raises(RuntimeError, match="up-1 for payload no longer exists"):
+        writer.finalize({"b": 2})
+    assert not client.put_object.called
+    assert not client.abort_multipart_upload.called
+
+
+def test_writer_accepts_upload_completed_before_no_such_upload():
+    def head_object(Bucket, Key):
+        if Key == "metadata":
+            raise _not_found_error()
+        # S3's multipart ETag: MD5 of the part MD5s plus the part count.
+        bodies = [call.kwargs["Body"] for call in client.upload_part.call_args_list]
+        digest = hashlib.md5(b"".join(hashlib.md5(body).digest() for body in bodies))
+        return {"ETag": f'"{digest.hexdigest()}-{len(bodies)}"'}
+
+    client = _multipart_client(head_object)
+    _write_multipart(client).finalize({"b": 2})
+    assert client.put_object.call_args.kwargs["Key"] == "metadata"
+
+
+def test_open_partition_reuses_metadata_fetch():
+    client = MagicMock()
+    client.get_object.return_value = {"Body": MagicMock(read=lambda: b'{"b": 2}')}
+    key = PartitionKey("google_ads", "123", "campaign", "2024-06-01")
+    reader = _sink(client).open_partition(key, "run")
+    assert reader.read_metadata() == {"b": 2}
+    assert client.get_object.call_count == 1
+    assert not client.head_object.called
+
+
+def test_open_partition_missing_metadata_raises():
+    client = MagicMock()
+    client.get_object.side_effect = ClientError({"Error": {"Code": "NoSuchKey"}}, "get_object")
+    key = PartitionKey("google_ads", "123", "campaign", "2024-06-01")
+    with pytest.raises(FileNotFoundError):
+        _sink(client).open_partition(key, "run")
+
+
+def test_shared_client_is_reused_across_sinks():
+    config = S3Config(bucket="bucket", prefix="raw", region="us-east-1")
+    other = S3Config(bucket="other", prefix="raw2", region="us-east-1")
+    assert shared_s3_client(config) is shared_s3_client(other)
+    assert ObjectStorageRawSink(config).client is ObjectStorageRawSink(other).client
@@ -0,0 +1,46 @@
+from __future__ import annotations
+
+import json
+from datetime import date, datetime, timedelta, timezone
+
+from gads_etl import state_inspect
+from gads_etl.state_inspect import format_states, iter_format_states
+from gads_etl.state_store import PartitionState
+
+
+def _states(count: int) -> list[PartitionState]:
+    return [
+        PartitionState(
+            source="google_ads",
+            customer_id="123",
+            query_name="campaign",
+            logical_date=date(2024, 1, 1) + timedelta(days=day),
+            status="success",
+            current_run_id=f"run-{day}",
+            schema_version="v1",
+            record_count=day,
+            updated_at=datetime(2024, 2, 1, tzinfo=timezone.utc),
+            error_message=None,
+            attempt_count=1,
+        )
+        for day in range(count)
+    ]
+
+
+def test_json_output_streams_a_valid_document():
+    chunks = list(iter_format_states(iter(_states(3)), output_format="json"))
+
+    assert len(chunks) == 5
+    payload = json.loads("\n".join(chunks))
+    assert [item["record_count"] for item in payload] == [0, 1, 2]
+    assert "\n".join(chunks) == json.dumps(json.loads("\n".join(chunks)), indent=2)
+
+
+def test_table_output_is_rendered_in_blocks(monkeypatch):
+    monkeypatch.setattr(state_inspect, "TABLE_BLOCK_ROWS", 2)
+    chunks = list(iter_format_states(iter(_states(5))))
+
+    assert len(chunks) == 3
+    assert chunks[0].splitlines()[0].split() == state_inspect._TABLE_HEADERS
+    assert sum(len(chunk.splitlines()) for chunk in chunks) == 6
+    assert format_states([]) == "No partition state records found."
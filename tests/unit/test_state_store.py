@@ -0,0 +1,274 @@
+from __future__ import annotations
+
+import sqlite3
+import threading
+from dataclasses import replace
+from datetime import date, datetime, timedelta, timezone
+
+import pytest
+
+from gads_etl.state_store import (
+    PartitionState,
+    PartitionStateRepository,
+    PartitionStateStore,
+    _list_query,
+)
+
+
+def _state(day: int, status: str = "success") -> PartitionState:
+    return PartitionState(
+        source="google_ads",
+        customer_id="123",
+        query_name="campaign",
+        logical_date=date(2024, 1, 1) + timedelta(days=day),
+        status=status,
+        current_run_id="run",
+        schema_version="v1",
+        record_count=day,
+        updated_at=datetime.now(timezone.utc),
+        error_message=None,
+        attempt_count=1,
+    )
+
+
+def test_connection_is_reused_per_thread_in_wal_mode(tmp_path):
+    with PartitionStateRepository(tmp_path / "state.db") as repo:
+        conn = repo._connect()
+        assert repo._connect() is conn
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        assert conn.execute("PRAGMA busy_timeout").fetchone()[0] == 30000
+
+        other: list = []
+        thread = threading.Thread(target=lambda: other.append(repo._connect()))
+        thread.start()
+        thread.join()
+        assert other[0] is not conn
+
+
+def test_worker_thread_connections_are_closed_when_threads_exit(tmp_path):
+    with PartitionStateRepository(tmp_path / "state.db") as repo:
+        repo.ensure_schema()
+        opened: list = []
+
+        def work() -> None:
+            opened.append(repo._connect())
+            repo.upsert_partition_state(_state(len(opened)))
+
+        for _ in range(5):
+            thread = threading.Thread(target=work)
+            thread.start()
+            thread.join()
+
+        assert len(repo._connections) == 1  # the main thread's
+        with pytest.raises(sqlite3.ProgrammingError):
+            opened[0].execute("SELECT 1")
+        assert len(repo.list_partition_states()) == 5
+
+
+def test_concurrent_readers_and_writer_do_not_lock(tmp_path):
+    repo = PartitionStateRepository(tmp_path / "state.db")
+    repo.ensure_schema()
+    errors: list[BaseException] = []
+
+    def write() -> None:
+        try:
+            for day in range(200):
+                repo.upsert_partition_states([_state(day)])
+        except BaseException as exc:
+            errors.append(exc)
+
+    def read() -> None:
+        try:
+            for _ in range(200):
+                repo.list_partition_states(status="success", limit=10)
+        except BaseException as exc:
+            errors.append(exc)
+
+    threads = [threading.Thread(target=write)] + [threading.Thread(target=read) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    repo.close()
+
+    assert errors == []
+    reopened = PartitionStateRepository(tmp_path / "state.db")
+    assert len(reopened.list_partition_states()) == 200
+
+
+@pytest.mark.parametrize("count", [3, 1000])
+def test_get_partition_states_returns_only_existing_keys(tmp_path, count):
+    repo = PartitionStateRepository(tmp_path / "state.db")
+    repo.ensure_schema()
+    repo.upsert_partition_states(_state(day) for day in range(0, count, 2))
+
+    keys = [
+        ("google_ads", "123", "campaign", date(2024, 1, 1) + timedelta(days=day))
+        for day in range(count)
+    ]
+    states = repo.get_partition_states(keys + keys[:5])
+
+    assert sorted(states) == keys[::2]
+    assert all(states[key].logical_date == key[3] for key in states)
+    assert repo.get_partition_states(keys[1:2]) == {}
+
+
+def test_ensure_schema_records_migrations_once(tmp_path):
+    repo = PartitionStateRepository(tmp_path / "state.db")
+    repo.ensure_schema()
+    version = repo.schema_version()
+    PartitionStateRepository(tmp_path / "state.db").ensure_schema()
+
+    rows = repo._connect().execute("SELECT version FROM schema_migrations").fetchall()
+    assert [row[0] for row in rows] == list(range(1, version + 1))
+    assert version >= 2
+
+
+def test_read_only_repository_rejects_missing_or_unmigrated_databases(tmp_path):
+    missing = PartitionStateRepository(tmp_path / "missing" / "state.db", read_only=True)
+    with pytest.raises(RuntimeError, match="does not exist"):
+        missing.ensure_schema()
+    assert not (tmp_path / "missing").exists()
+
+    sqlite3.connect(tmp_path / "empty.db").close()
+    with pytest.raises(RuntimeError, match="schema version 0"):
+        PartitionStateRepository(tmp_path / "empty.db", read_only=True).ensure_schema()
+
+    repo = PartitionStateRepository(tmp_path / "old.db")
+    repo.ensure_schema()
+    with repo._connect() as conn:
+        conn.execute("DELETE FROM schema_migrations WHERE version > 1")
+    with pytest.raises(RuntimeError, match="schema version 1"):
+        PartitionStateRepository(tmp_path / "old.db", read_only=True).ensure_schema()
+
+
+@pytest.mark.parametrize(
+    "filters, index",
+    [
+        ({"status": "failed"}, "idx_partition_state_status_updated"),
+        ({"status": "failed", "limit": 10}, "idx_partition_state_status_updated"),
+        (
+            {"query_name": "campaign", "since": date(2024, 1, 1)},
+            "idx_partition_state_query_date",
+        ),
+        (
+            {"customer_id": "123", "since": date(2024, 1, 1), "until": date(2024, 2, 1)},
+            "idx_partition_state_customer_date",
+        ),
+    ],
+)
+def test_list_queries_use_secondary_indexes(tmp_path, filters, index):
+    repo = PartitionStateRepository(tmp_path / "state.db")
+    repo.ensure_schema()
+    sql, params = _list_query(**filters)
+
+    plan = repo._connect().execute(f"EXPLAIN QUERY PLAN {sql}", params).fetchall()
+    details = " | ".join(row["detail"] for row in plan)
+
+    assert index in details
+    assert "SCAN partition_state " not in details + " "
+    if set(filters) <= {"status", "limit"}:
+        assert "TEMP B-TREE" not in details  # rows come back already in updated_at order
+
+
+def test_aggregate_queries_match_stored_states(tmp_path):
+    repo = PartitionStateRepository(tmp_path / "state.db")
+    states = [_state(day) for day in (0, 1, 2, 5, 6, 9)]
+    states[1] = replace(states[1], status="failed", attempt_count=7, error_message="x")
+    states[2] = replace(states[2], status="failed", attempt_count=3, error_message="[terminal] x")
+    states[3] = replace(states[3], status="pending", attempt_count=None)
+    states.append(replace(_state(5), customer_id="456", attempt_count=12))
+    repo.upsert_partition_states(states)
+
+    assert repo.status_counts() == {"success": 4, "failed": 2, "pending": 1}
+    assert repo.count_terminal() == 1
+
+    (date_range,) = repo.date_ranges()
+    assert (date_range.earliest, date_range.latest) == (date(2024, 1, 1), date(2024, 1, 10))
+    assert date_range.distinct_dates == 6
+    gaps = [(gap.start.day, gap.end.day) for gap in repo.date_gaps(status="success")]
+    assert gaps == [(2, 5), (8, 9)]  # days 1, 6, 7, 10 succeeded (6 via customer 456)
+
+    summary = repo.attempt_summary()
+    assert (summary.partitions, summary.minimum, summary.maximum) == (7, 0, 12)
+    assert summary.average == pytest.approx(25 / 7)
+    assert summary.histogram == {"1-2": 4, "3-5": 1, "6-10": 1, "10+": 1}
+
+    top = repo.top_by_attempts(2)
+    assert [(state.attempt_count, state.status) for state in top] == [(12, "success"), (7, "failed")]
+    assert [state.attempt_count for state in repo.top_by_attempts(5, status="failed")] == [7, 3]
+
+
+def test_iter_partition_states_pages_through_list_order(tmp_path):
+    repo = PartitionStateRepository(tmp_path / "state.db")
+    shared = datetime(2024, 3, 1, tzinfo=timezone.utc)
+    states = [replace(_state(day), updated_at=shared + timedelta(hours=day // 3)) for day in range(25)]
+    states += [replace(_state(day), customer_id="456", status="failed") for day in range(4)]
+    repo.upsert_partition_states(states)
+
+    expected = repo.list_partition_states()
+    assert list(repo.iter_partition_states(page_size=4)) == expected
+    assert list(repo.iter_partition_states(page_size=4, limit=9)) == expected[:9]
+    assert list(repo.iter_partition_states(status="failed", page_size=3)) == (
+        repo.list_partition_states(status="failed")
+    )
+    assert list(repo.iter_partition_states(customer_id="999")) == []
+
+
+def test_loaded_states_are_slotted_and_columns_keep_iso_dates(tmp_path):
+    repo = PartitionStateRepository(tmp_path / "state.db")
+    stored = _state(3)
+    repo.upsert_partition_states([stored, replace(_state(4), status="failed")])
+
+    (loaded,) = repo.list_partition_states(status="success")
+    assert not hasattr(loaded, "__dict__")
+    assert loaded == stored
+    assert loaded.logical_date == date(2024, 1, 4)
+    assert replace(loaded, attempt_count=None).attempt_count is None
+
+    columns = repo.read_state_columns()
+    assert len(columns) == 2
+    assert sorted(zip(columns.keys(), columns.statuses)) == [
+        (("google_ads", "123", "campaign", "2024-01-04"), "success"),
+        (("google_ads", "123", "campaign", "2024-01-05"), "failed"),
+    ]
+    assert repo.read_state_columns(status="failed").logical_dates == ["2024-01-05"]
+
+
+def test_store_base_class_requires_backend_hooks():
+    with pytest.raises(TypeError, match="_cursor.*_transaction.*ensure_schema"):
+        PartitionStateStore()
+
+
+def test_state_writes_append_change_events(tmp_path):
+    repo = PartitionStateRepository(tmp_path / "state.db")
+    repo.upsert_partition_states([_state(0), _state(1)])
+    start = repo.latest_event_seq()
+
+    repo.upsert_partition_state(replace(_state(0), status="failed", error_message="boom"))
+    repo.upsert_partition_state(replace(_state(0), status="failed", error_message="boom"))  # no-op
+    repo.upsert_partition_states([_state(2), replace(_state(1), attempt_count=2)])
+
+    events = repo.events_since(start)
+    assert [(event.logical_date.day, event.previous_status, event.status) for event in events] == [
+        (1, "success", "failed"),
+        (3, None, "success"),
+        (2, "success", "success"),
+    ]
+    assert [event.seq for event in events] == sorted({event.seq for event in events})
+    assert repo.events_since(events[-1].seq) == []
+    assert list(repo.iter_events_since(0, page_size=2))[:2] == repo.events_since(0, limit=2)
+    assert len(list(repo.iter_events_since(0, page_size=2))) == 5
+
+
+def test_event_log_migration_seeds_existing_rows(tmp_path):
+    path = tmp_path / "state.db"
+    repo = PartitionStateRepository(path)
+    repo.upsert_partition_states([_state(0), _state(1)])
+    repo.close()
+    with sqlite3.connect(path) as conn:  # simulate a store created before the event log
+        conn.execute("DROP TABLE partition_state_events")
+        conn.execute("DELETE FROM schema_migrations WHERE version >= 5")
+
+    upgraded = PartitionStateRepository(path)
+    assert [event.logical_date.day for event in upgraded.events_since(0)] == [1, 2]
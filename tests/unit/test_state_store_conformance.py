@@ -0,0 +1,197 @@
+"""Behaviour every PartitionStateStore backend must share.
+
+SQLite always runs; set ``STATE_STORE_TEST_URI`` to a PostgreSQL DSN to run
+the same checks against a throwaway table there.
+"""
+from __future__ import annotations
+
+import os
+import sys
+import uuid
+from dataclasses import replace
+from datetime import date, datetime, timedelta, timezone
+
+import pytest
+
+from gads_etl.state_store import (
+    PartitionState,
+    PartitionStateRepository,
+    _UPSERT_SQL,
+    _state_params,
+)
+
+
+def _state(day: int, status: str = "success", customer_id: str = "123") -> PartitionState:
+    return PartitionState(
+        source="google_ads",
+        customer_id=customer_id,
+        query_name="campaign",
+        logical_date=date(2024, 1, 1) + timedelta(days=day),
+        status=status,
+        current_run_id="run",
+        schema_version="v1",
+        record_count=day,
+        updated_at=datetime(2024, 3, 1, tzinfo=timezone.utc) + timedelta(hours=day // 3),
+        error_message=None,
+        attempt_count=1,
+    )
+
+
+@pytest.fixture(params=["sqlite", "postgres"])
+def store(request, tmp_path):
+    if request.param == "sqlite":
+        with PartitionStateRepository(tmp_path / "state.db") as repo:
+            yield repo
+        return
+    uri = os.getenv("STATE_STORE_TEST_URI")
+    if not uri:
+        pytest.skip("STATE_STORE_TEST_URI is not set")
+    from gads_etl.state_store_postgres import PostgresPartitionStateStore
+
+    table = f"partition_state_{uuid.uuid4().hex[:8]}"
+    with PostgresPartitionStateStore(uri, table=table, pool_size=4) as repo:
+        yield repo
+        with repo._transaction() as cursor:
+            for name in (table, f"{table}_events", f"{table}_migrations"):
+                cursor.execute(f"DROP TABLE IF EXISTS {name} CASCADE")
+            cursor.execute(f"DROP FUNCTION IF EXISTS {table}_record_event()")
+
+
+def test_upsert_and_get_round_trip(store):
+    stored = _state(0)
+    store.upsert_partition_state(stored)
+    store.upsert_partition_state(replace(stored, status="failed", attempt_count=2))
+
+    loaded = store.get_partition_state("google_ads", "123", "campaign", date(2024, 1, 1))
+    assert loaded == replace(stored, status="failed", attempt_count=2)
+    assert store.get_partition_state("google_ads", "123", "campaign", date(2023, 1, 1)) is None
+
+
+@pytest.mark.parametrize("count", [3, 500])
+def test_bulk_get_returns_only_existing_keys(store, count):
+    store.upsert_partition_states(_state(day) for day in range(0, count, 2))
+    keys = [
+        ("google_ads", "123", "campaign", date(2024, 1, 1) + timedelta(days=day))
+        for day in range(count)
+    ]
+
+    states = store.get_partition_states(keys + keys[:2])
+    assert sorted(states) == keys[::2]
+    assert all(states[key].logical_date == key[3] for key in states)
+
+
+def test_list_and_iter_share_newest_first_order(store):
+    store.upsert_partition_states([_state(day) for day in range(12)])
+    store.upsert_partition_states([_state(day, "failed", customer_id="456") for day in range(3)])
+
+    listed = store.list_partition_states()
+    assert [state.updated_at for state in listed] == sorted(
+        (state.updated_at for state in listed), reverse=True
+    )
+    assert list(store.iter_partition_states(page_size=4)) == listed
+    assert list(store.iter_partition_states(page_size=4, limit=5)) == listed[:5]
+    assert store.list_partition_states(customer_id="456", since=date(2024, 1, 2)) == [
+        _state(day, "failed", customer_id="456") for day in (2, 1)
+    ]
+    columns = store.read_state_columns(status="failed")
+    assert sorted(columns.logical_dates) == ["2024-01-01", "2024-01-02", "2024-01-03"]
+
+
+def test_iteration_survives_updates_between_pages(store):
+    shared = _state(0).updated_at
+    store.upsert_partition_states(replace(_state(day), updated_at=shared) for day in range(6))
+    states = store.iter_partition_states(page_size=2)
+    first_page = [next(states), next(states)]
+    unseen = next(
+        state for state in store.list_partition_states() if state not in first_page
+    )
+    store.upsert_partition_state(replace(unseen, attempt_count=2))
+
+    keys = [state.logical_date for state in first_page + list(states)]
+    assert sorted(keys) == sorted(state.logical_date for state in store.list_partition_states())
+
+
+def test_aggregates(store):
+    states = [_state(day) for day in (0, 1, 2, 5)]
+    states[1] = replace(states[1], status="failed", attempt_count=4, error_message="[terminal] x")
+    store.upsert_partition_states(states)
+
+    assert store.status_counts() == {"success": 3, "failed": 1}
+    assert store.count_terminal() == 1
+    (date_range,) = store.date_ranges()
+    assert (date_range.earliest, date_range.latest) == (date(2024, 1, 1), date(2024, 1, 6))
+    gaps = [(gap.start, gap.end) for gap in store.date_gaps()]
+    assert gaps == [(date(2024, 1, 2), date(2024, 1, 2)), (date(2024, 1, 4), date(2024, 1, 5))]
+    summary = store.attempt_summary()
+    assert (summary.partitions, summary.maximum, summary.average) == (4, 4, 7 / 4)
+    assert summary.histogram == {"1-2": 3, "3-5": 1, "6-10": 0, "10+": 0}
+    assert store.top_by_attempts(1)[0].attempt_count == 4
+    assert store.oldest_updated("success").logical_date == date(2024, 1, 1)
+    assert store.newest_updated("success").logical_date == date(2024, 1, 6)
+
+
+def test_event_log_records_changes_in_order(store):
+    store.upsert_partition_states([_state(0), _state(1)])
+    store.upsert_partition_state(_state(0))  # unchanged: no event
+    store.upsert_partition_state(replace(_state(0), status="failed", error_message="boom"))
+
+    events = store.events_since(0)
+    assert [(event.logical_date.day, event.previous_status, event.status) for event in events] == [
+        (1, None, "success"),
+        (2, None, "success"),
+        (1, "success", "failed"),
+    ]
+    assert store.latest_event_seq() == events[-1].seq
+    assert list(store.iter_events_since(events[0].seq, page_size=1)) == events[1:]
+
+
+def test_schema_version_reports_latest_migration(store):
+    migrations = sys.modules[type(store).__module__]._MIGRATIONS
+    assert store.schema_version() == migrations[-1][0]
+
+
+def _read_only(store):
+    if isinstance(store, PartitionStateRepository):
+        return PartitionStateRepository(store.db_path, read_only=True)
+    from gads_etl.state_store_postgres import PostgresPartitionStateStore
+
+    return PostgresPartitionStateStore(store.dsn, table=store.table, read_only=True)
+
+
+def test_read_only_store_never_creates_or_writes(store):
+    with _read_only(store) as reader:
+        with pytest.raises(RuntimeError):
+            reader.ensure_schema()
+    store.upsert_partition_state(_state(0))
+
+    with _read_only(store) as reader:
+        assert reader.status_counts() == {"success": 1}
+        assert [event.status for event in reader.events_since(0)] == ["success"]
+        with pytest.raises(Exception, match="read-?only"):
+            reader.upsert_partition_state(_state(1))
+    assert store.status_counts() == {"success": 1}
+
+
+def test_events_of_open_transactions_are_not_skipped(store):
+    if isinstance(store, PartitionStateRepository):
+        pytest.skip("SQLite has a single writer, so events commit in seq order")
+    import psycopg
+
+    store.ensure_schema()
+    with psycopg.connect(store.dsn) as early, psycopg.connect(store.dsn) as late:
+        early.execute(store._sql(_UPSERT_SQL), _state_params(_state(0)))
+        # Gets a newer transaction id but appends before ``early`` finishes.
+        late.execute(store._sql(_UPSERT_SQL), _state_params(_state(1)))
+        early.execute(store._sql(_UPSERT_SQL), _state_params(_state(2)))
+        early.commit()
+        store.sequence_events()
+
+        seen = store.events_since(0)
+        assert [event.logical_date.day for event in seen] == [1, 3]
+        late.commit()
+    store.sequence_events()
+
+    rest = store.events_since(seen[-1].seq)
+    assert [event.logical_date.day for event in rest] == [2]
+    assert rest[0].seq > seen[-1].seq
+    assert store.latest_event_seq() == rest[0].seq
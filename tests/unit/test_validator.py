@@ -0,0 +1,193 @@
+from __future__ import annotations
+
+import json
+import tracemalloc
+from functools import partial
+from types import SimpleNamespace
+
+import pytest
+
+from gads_etl.raw_sink import PartitionKey
+from gads_etl.raw_sink_local import LocalFilesystemRawSink
+from gads_etl.state_store import PartitionStateRepository
+from gads_etl.validator import BackgroundValidator, FieldChecks, RawPartitionValidator
+
+KEY = PartitionKey("google_ads", "123", "campaign", "2024-06-01")
+
+
+def _write(sink: LocalFilesystemRawSink, rows: int, run_id: str = "run") -> None:
+    writer = sink.write_partition(KEY, run_id)
+    for idx in range(rows):
+        writer.write_payload_row({"idx": idx})
+    writer.finalize({"record_count": rows})
+
+
+def _validator(tmp_path, sink, **kwargs) -> RawPartitionValidator:
+    return RawPartitionValidator(
+        sink, PartitionStateRepository(tmp_path / "state.db"), **kwargs
+    )
+
+
+def test_validates_chunked_partition_with_parallel_workers(tmp_path):
+    sink = LocalFilesystemRawSink(tmp_path / "raw", chunk_size=64)
+    _write(sink, 40)
+    state = _validator(tmp_path, sink, chunk_workers=4).validate_partition(KEY, "run")
+    assert state.status == "success"
+    assert state.record_count == 40
+
+
+def test_reports_chunk_record_count_mismatch(tmp_path):
+    sink = LocalFilesystemRawSink(tmp_path / "raw", chunk_size=64)
+    _write(sink, 40)
+    metadata_path = next((tmp_path / "raw").rglob("metadata.json"))
+    metadata = json.loads(metadata_path.read_text())
+    metadata["chunks"][1]["record_count"] += 1
+    metadata_path.write_text(json.dumps(metadata))
+    state = _validator(tmp_path, sink).validate_partition(KEY, "run")
+    assert state.status == "failed"
+    assert "payload-00001.jsonl" in state.error_message
+
+
+def _payload_path(tmp_path):
+    return next((tmp_path / "raw").rglob("payload.jsonl"))
+
+
+def test_fast_mode_verifies_checksums_without_decoding(tmp_path, monkeypatch):
+    sink = LocalFilesystemRawSink(tmp_path / "raw")
+    _write(sink, 20)
+
+    def fail(*_args, **_kwargs):
+        raise AssertionError("fast validation must not decode JSON")
+
+    monkeypatch.setattr("gads_etl.validator.json", SimpleNamespace(loads=fail))
+    assert _validator(tmp_path, sink).validate_partition(KEY, "run").status == "success"
+
+    payload_path = _payload_path(tmp_path)
+    payload_path.write_bytes(payload_path.read_bytes().replace(b'"idx": 7', b'"idx": 8'))
+    state = _validator(tmp_path, sink).validate_partition(KEY, "run")
+    assert state.status == "failed"
+    assert state.error_message.startswith("Checksum mismatch in payload.jsonl")
+
+
+def test_deep_mode_parses_rows_and_legacy_partitions_fall_back_to_it(tmp_path):
+    sink = LocalFilesystemRawSink(tmp_path / "raw")
+    _write(sink, 5)
+    assert _validator(tmp_path, sink, deep=True).validate_partition(KEY, "run").status == "success"
+
+    metadata_path = next((tmp_path / "raw").rglob("metadata.json"))
+    metadata = json.loads(metadata_path.read_text())
+    for field in ("payload_checksum", "payload_byte_size", "payload_line_count"):
+        metadata.pop(field)
+    metadata_path.write_text(json.dumps(metadata))
+    payload_path = _payload_path(tmp_path)
+    payload_path.write_bytes(payload_path.read_bytes() + b"not json\n")
+    state = _validator(tmp_path, sink).validate_partition(KEY, "run")
+    assert state.status == "failed"
+    assert state.error_message.startswith("Payload read failed")
+
+
+def test_field_checks_report_missing_keys_and_type_drift(tmp_path):
+    sink = LocalFilesystemRawSink(tmp_path / "raw")
+    writer = sink.write_partition(KEY, "run")
+    writer.write_payload_row({"campaign_id": 1, "metrics_clicks": 3})
+    writer.write_payload_row({"campaign_id": 2, "metrics_clicks": None})
+    writer.write_payload_row({"campaign_id": 3, "metrics_clicks": "4"})
+    writer.finalize({"record_count": 3})
+
+    checks = FieldChecks.from_query_fields(["campaign.id", "metrics.clicks"])
+    validator = _validator(tmp_path, sink, field_checks={"campaign": checks})
+    state = validator.validate_partition(KEY, "run")
+    assert state.status == "failed"
+    assert state.error_message == (
+        "Field metrics_clicks in payload.jsonl row 3 has type string; earlier rows have number"
+    )
+
+    strict = FieldChecks.from_query_fields(["campaign.id", "campaign.name"])
+    validator = _validator(tmp_path, sink, field_checks={"campaign": strict})
+    state = validator.validate_partition(KEY, "run")
+    assert state.error_message == "Row 1 in payload.jsonl is missing required fields: campaign_name"
+
+
+def test_streaming_validation_memory_is_independent_of_partition_size(tmp_path):
+    sink = LocalFilesystemRawSink(tmp_path / "raw")
+    writer = sink.write_partition(KEY, "run")
+    rows = 80_000
+    for idx in range(rows):
+        writer.write_payload_row({"campaign_id": idx, "campaign_name": "c" * 100})
+    writer.finalize({"record_count": rows})
+    payload_size = _payload_path(tmp_path).stat().st_size
+    checks = FieldChecks.from_query_fields(["campaign.id", "campaign.name"])
+    validator = _validator(tmp_path, sink, deep=True, field_checks={"campaign": checks})
+
+    tracemalloc.start()
+    try:
+        state = validator.validate_partition(KEY, "run")
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    assert state.status == "success"
+    assert payload_size > 9 * 1024 * 1024
+    assert peak < 4 * 1024 * 1024
+
+
+def _write_run(sink: LocalFilesystemRawSink, run_id: str, days: int) -> None:
+    for day in range(1, days + 1):
+        key = PartitionKey("google_ads", "123", "campaign", f"2024-06-{day:02d}")
+        writer = sink.write_partition(key, run_id)
+        for idx in range(day):
+            writer.write_payload_row({"idx": idx})
+        writer.finalize({"record_count": day})
+
+
+@pytest.mark.parametrize("processes", [1, 2])
+def test_validate_run_checks_only_that_runs_partitions(tmp_path, processes):
+    sink = LocalFilesystemRawSink(tmp_path / "raw")
+    _write_run(sink, "run-b", days=6)
+    _write_run(sink, "run-a", days=2)
+    metadata_path = next((tmp_path / "raw").rglob("logical_date=2024-06-03/run_id=run-b/*.json"))
+    metadata = json.loads(metadata_path.read_text())
+    metadata["record_count"] = 99
+    metadata_path.write_text(json.dumps(metadata))
+
+    repo = PartitionStateRepository(tmp_path / "state.db")
+    validator = RawPartitionValidator(sink, repo)
+    validator.validate_partition(KEY, "run-a")
+    states = validator.validate_run(
+        "run-b",
+        processes=processes,
+        sink_factory=partial(LocalFilesystemRawSink, tmp_path / "raw"),
+        batch_size=4,
+    )
+
+    assert len(states) == 6
+    by_date = {state.logical_date.day: state for state in states}
+    assert by_date[3].status == "failed"
+    assert by_date[5].status == "success" and by_date[5].record_count == 5
+    assert by_date[1].attempt_count == 2
+    stored = repo.list_partition_states()
+    assert len(stored) == 6
+    assert {state.current_run_id for state in stored if state.status == "success"} == {"run-b"}
+
+
+def test_validate_run_requires_a_sink_factory_for_processes(tmp_path):
+    sink = LocalFilesystemRawSink(tmp_path / "raw")
+    _write_run(sink, "run", days=2)
+    with pytest.raises(ValueError):
+        _validator(tmp_path, sink).validate_run("run", processes=2)
+
+
+def test_background_validator_validates_submitted_partitions(tmp_path):
+    sink = LocalFilesystemRawSink(tmp_path / "raw")
+    _write_run(sink, "run", days=4)
+    background = BackgroundValidator(_validator(tmp_path, sink), workers=2)
+    try:
+        for day in range(1, 5):
+            key = PartitionKey("google_ads", "123", "campaign", f"2024-06-{day:02d}")
+            background.submit(key, "run")
+        states = background.drain()
+        assert background.drain() == []
+    finally:
+        background.close()
+
+    assert sorted(state.record_count for state in states) == [1, 2, 3, 4]
+    assert {state.status for state in states} == {"success"}
@@ -0,0 +1,123 @@
+import sqlite3
+
+import pytest
+
+from gads_etl.raw_sink import PartitionKey
+from gads_etl.warehouse.fact_loader import SQLiteFactTableLoader
+
+
+def _key(query_name: str, logical_date: str, customer_id: str = "123") -> PartitionKey:
+    return PartitionKey("google_ads", customer_id, query_name, logical_date)
+
+
+def _campaign_rows(count: int, clicks: int = 1, segments_date: str = None) -> list[dict]:
+    return [
+        {
+            "campaign_id": 1000 + index,
+            "segments_date": segments_date,
+            "metrics_impressions": 10,
+            "metrics_clicks": clicks,
+            "metrics_conversions": 0.5,
+            "metrics_cost_micros": 1_000_000,
+        }
+        for index in range(count)
+    ]
+
+
+def _rows(db_path, sql):
+    with sqlite3.connect(db_path) as conn:
+        return conn.execute(sql).fetchall()
+
+
+def test_replace_partitions_deletes_and_inserts_by_customer_and_date(tmp_path):
+    db_path = tmp_path / "warehouse.db"
+    loader = SQLiteFactTableLoader(db_path)
+    day1 = _key("campaign_daily_performance", "2024-01-01")
+    day2 = _key("campaign_daily_performance", "2024-01-02")
+    ad_groups = _key("ad_group_conversion", "2024-01-01")
+    ad_group_rows = [
+        {"ad_group_id": 7, "campaign_id": 1000, "segments_device": device}
+        for device in ("MOBILE", "DESKTOP")
+    ]
+
+    inserted = loader.replace_partitions(
+        [
+            (day1, "run-1", _campaign_rows(3)),
+            (day2, "run-1", _campaign_rows(2)),
+            (ad_groups, "run-1", ad_group_rows),
+            (_key("unmapped_query", "2024-01-01"), "run-1", [{"x": 1}]),
+        ]
+    )
+    assert inserted == 7
+    assert _rows(db_path, "SELECT campaign_id, date FROM fact_campaign_daily LIMIT 1") == [
+        ("1000", "2024-01-01")
+    ]
+
+    # Reloading a partition replaces exactly its rows.
+    loader.replace_partitions([(day1, "run-2", _campaign_rows(1, clicks=5))], demote=[ad_groups])
+    assert _rows(
+        db_path, "SELECT date, COUNT(*), SUM(clicks) FROM fact_campaign_daily GROUP BY date"
+    ) == [("2024-01-01", 1, 5), ("2024-01-02", 2, 2)]
+    assert _rows(db_path, "SELECT COUNT(*) FROM fact_ad_group_daily") == [(0,)]
+    assert loader.loaded_runs() == {day1: "run-2", day2: "run-1"}
+    loader.close()
+
+
+def test_rows_are_dated_by_segments_date_and_replaced_per_date(tmp_path):
+    db_path = tmp_path / "warehouse.db"
+    loader = SQLiteFactTableLoader(db_path)
+    # A lookback partition reports the same campaigns for several days.
+    lookback = _key("campaign_daily_performance", "2024-01-03")
+    rows = [
+        *_campaign_rows(2, segments_date="2024-01-01"),
+        *_campaign_rows(2, segments_date="2024-01-02"),
+        *_campaign_rows(2, segments_date="2024-01-03"),
+    ]
+    loader.replace_partitions(
+        [(_key("campaign_daily_performance", "2024-01-01"), "run-1", _campaign_rows(3))]
+    )
+
+    assert loader.replace_partitions([(lookback, "run-1", rows)], watermark=7) == 6
+    assert _rows(db_path, "SELECT date, COUNT(*) FROM fact_campaign_daily GROUP BY date") == [
+        ("2024-01-01", 2),
+        ("2024-01-02", 2),
+        ("2024-01-03", 2),
+    ]
+    assert loader.load_watermark() == 7
+
+    # Reloading drops the dates the partition no longer reports.
+    loader.replace_partitions(
+        [(lookback, "run-2", _campaign_rows(1, clicks=9, segments_date="2024-01-03"))]
+    )
+    assert _rows(db_path, "SELECT date, COUNT(*) FROM fact_campaign_daily GROUP BY date") == [
+        ("2024-01-03", 1)
+    ]
+    loader.replace_partitions([], demote=[lookback])
+    assert _rows(db_path, "SELECT COUNT(*) FROM fact_campaign_daily") == [(0,)]
+    assert loader.loaded_runs() == {_key("campaign_daily_performance", "2024-01-01"): "run-1"}
+    assert loader.load_watermark() == 7
+    loader.close()
+
+
+def test_replace_partitions_rolls_back_the_whole_batch(tmp_path):
+    db_path = tmp_path / "warehouse.db"
+    loader = SQLiteFactTableLoader(db_path)
+    loader.replace_partitions(
+        [(_key("campaign_daily_performance", "2024-01-01"), "run-1", _campaign_rows(2))]
+    )
+
+    duplicate = _campaign_rows(1) * 2  # violates the primary key
+    with pytest.raises(sqlite3.IntegrityError):
+        loader.replace_partitions(
+            [
+                (_key("campaign_daily_performance", "2024-01-01"), "run-2", _campaign_rows(4)),
+                (_key("campaign_daily_performance", "2024-01-02"), "run-2", duplicate),
+            ],
+            watermark=3,
+        )
+
+    assert _rows(db_path, "SELECT date, COUNT(*) FROM fact_campaign_daily GROUP BY date") == [
+        ("2024-01-01", 2)
+    ]
+    assert loader.load_watermark() is None
+    loader.close()
@@ -1,7 +1,15 @@
+import json
+import sqlite3
 from datetime import date, datetime, timezone
 
+import pytest
+
+from gads_etl.raw_sink import PartitionKey
+from gads_etl.raw_sink_local import LocalFilesystemRawSink
 from gads_etl.state_store import PartitionState, PartitionStateRepository
-from gads_etl.warehouse.loader import WarehouseLoader
+from gads_etl.warehouse.curated_sink import FilesystemCuratedSink
+from gads_etl.warehouse.fact_loader import SQLiteFactTableLoader
+from gads_etl.warehouse.loader import ReconciliationPlan, WarehouseLoader
 from gads_etl.warehouse.pointer_store import (
     SQLiteWarehousePointerStore,
     WarehousePointer,
@@ -199,3 +207,232 @@ def test_publish_updates_and_demotes(tmp_path):
     ].run_id == "run-new"
 
     assert ("google_ads", "123", "campaign_stats", "2024-01-03") not in pointers
+
+
+def test_reconcile_replaces_on_schema_version_change(tmp_path):
+    repo = _make_state_repo(tmp_path)
+    store = _make_pointer_store(tmp_path)
+    _upsert_state(repo, _success_state("run-same"))
+    pending = _success_state("run-pending", logical_date=date(2024, 1, 2))
+    pending.status = "pending"
+    _upsert_state(repo, pending)
+    _insert_pointer(
+        store,
+        WarehousePointer(
+            source="google_ads",
+            customer_id="123",
+            query_name="campaign_stats",
+            logical_date="2024-01-01",
+            run_id="run-same",
+            schema_version="v0",
+            loaded_at=datetime.now(timezone.utc).isoformat(),
+        ),
+    )
+
+    loader = WarehouseLoader(repo, store)
+    plan = loader._reconcile_partitions()
+
+    assert [(t.logical_date, t.schema_version) for t in plan.replace] == [("2024-01-01", "v1")]
+    assert plan.load == ()
+    assert plan.demote == ()
+
+
+def test_run_reconciles_only_changes_since_watermark(tmp_path):
+    repo = _make_state_repo(tmp_path)
+    store = _make_pointer_store(tmp_path)
+    _upsert_state(repo, _success_state("run-a", logical_date=date(2024, 1, 1)))
+    _upsert_state(repo, _success_state("run-b", logical_date=date(2024, 1, 2)))
+    loader = WarehouseLoader(repo, store)
+
+    assert store.load_watermark() is None
+    assert len(loader.run().load) == 2  # no watermark yet: full reconcile
+    assert store.load_watermark() == repo.latest_event_seq()
+
+    demoted = _success_state("run-b", logical_date=date(2024, 1, 2))
+    demoted.status = "failed"
+    _upsert_state(repo, demoted)
+    _upsert_state(repo, _success_state("run-c", logical_date=date(2024, 1, 3)))
+    # Drift outside the loader is invisible to incremental runs.
+    _insert_pointer(
+        store,
+        WarehousePointer(
+            source="google_ads",
+            customer_id="123",
+            query_name="campaign_stats",
+            logical_date="2023-12-31",
+            run_id="orphan",
+            schema_version="v1",
+            loaded_at=datetime.now(timezone.utc).isoformat(),
+        ),
+    )
+
+    plan = loader.run()
+    assert [target.logical_date for target in plan.load] == ["2024-01-03"]
+    assert [pointer.logical_date for pointer in plan.demote] == ["2024-01-02"]
+    assert loader.run() == ReconciliationPlan(load=(), replace=(), demote=())
+
+    full = loader.run(full=True)
+    assert [pointer.run_id for pointer in full.demote] == ["orphan"]
+    assert full.load == () and full.replace == ()
+
+
+def test_publish_is_atomic(tmp_path):
+    store = _make_pointer_store(tmp_path)
+    pointers = [
+        WarehousePointer(
+            source="google_ads",
+            customer_id="123",
+            query_name="campaign_stats",
+            logical_date=f"2024-01-{day:02d}",
+            run_id="run",
+            schema_version="v1",
+            loaded_at=datetime.now(timezone.utc).isoformat(),
+        )
+        for day in range(1, 29)
+    ]
+
+    def failing_demotions():
+        yield ("google_ads", "123", "campaign_stats", "2024-01-01")
+        raise RuntimeError("interrupted")
+
+    with pytest.raises(RuntimeError):
+        store.publish(
+            pointers,
+            failing_demotions(),
+            watermark=7,
+            retry=[("google_ads", "123", "campaign_stats", "2024-01-01")],
+        )
+    assert store.list_pointers() == []
+    assert store.load_watermark() is None
+    assert store.load_retry_keys() == []
+
+    store.publish(pointers, [("google_ads", "123", "campaign_stats", "2024-01-01")], watermark=7)
+    assert len(store.list_pointers()) == 27
+    assert store.load_watermark() == 7
+
+
+def test_run_stages_raw_partitions_before_publishing(tmp_path):
+    repo = _make_state_repo(tmp_path)
+    store = _make_pointer_store(tmp_path)
+    raw_sink = LocalFilesystemRawSink(tmp_path / "raw", chunk_size=64)
+    curated_sink = FilesystemCuratedSink(tmp_path / "warehouse")
+    for day in (1, 2):
+        key = PartitionKey("google_ads", "123", "campaign_stats", f"2024-01-0{day}")
+        writer = raw_sink.write_partition(key, f"run-{day}")
+        for index in range(20):
+            writer.write_payload_row({"day": day, "index": index})
+        writer.finalize({"record_count": 20, "schema_version": "v1"})
+        _upsert_state(repo, _success_state(f"run-{day}", logical_date=date(2024, 1, day)))
+    _upsert_state(repo, _success_state("run-missing", logical_date=date(2024, 1, 3)))
+
+    loader = WarehouseLoader(repo, store, raw_sink, curated_sink, staging_workers=2)
+    plan = loader.run()
+
+    assert [target.run_id for target in plan.load] == ["run-1", "run-2"]
+    assert [target.run_id for target in plan.failed] == ["run-missing"]
+    assert sorted(pointer.run_id for pointer in store.list_pointers()) == ["run-1", "run-2"]
+    # The watermark still advances; the failed partition is kept for retry.
+    assert store.load_watermark() == repo.latest_event_seq()
+    assert store.load_retry_keys() == [("google_ads", "123", "campaign_stats", "2024-01-03")]
+    data = (
+        tmp_path / "warehouse" / "curated" / "source=google_ads" / "customer_id=123"
+        / "query_name=campaign_stats" / "logical_date=2024-01-02" / "run_id=run-2"
+    )
+    rows = [json.loads(line) for line in (data / "data.jsonl").read_text().splitlines()]
+    assert rows == [{"day": 2, "index": index} for index in range(20)]
+    assert json.loads((data / "metadata.json").read_text())["record_count"] == 20
+
+    # Published partitions are left alone; only the missing one is retried.
+    retry = loader.run()
+    assert retry.load == () and [target.run_id for target in retry.failed] == ["run-missing"]
+    retry = loader.run(full=True)
+    assert retry.load == () and [target.run_id for target in retry.failed] == ["run-missing"]
+
+    key = PartitionKey("google_ads", "123", "campaign_stats", "2024-01-03")
+    writer = raw_sink.write_partition(key, "run-missing")
+    writer.write_payload_row({"day": 3, "index": 0})
+    writer.finalize({"record_count": 1, "schema_version": "v1"})
+    recovered = loader.run()
+    assert [target.run_id for target in recovered.load] == ["run-missing"]
+    assert recovered.failed == ()
+    assert store.load_retry_keys() == []
+
+
+def test_run_backfills_a_new_fact_database_from_current_pointers(tmp_path):
+    repo = _make_state_repo(tmp_path)
+    store = _make_pointer_store(tmp_path)
+    raw_sink = LocalFilesystemRawSink(tmp_path / "raw")
+    curated_sink = FilesystemCuratedSink(tmp_path / "warehouse")
+    for day in (1, 2):
+        key = PartitionKey("google_ads", "123", "campaign_daily_performance", f"2024-01-0{day}")
+        writer = raw_sink.write_partition(key, f"run-{day}")
+        writer.write_payload_row({"campaign_id": day, "metrics_clicks": day})
+        writer.finalize({"record_count": 1, "schema_version": "v1"})
+        state = _success_state(f"run-{day}", logical_date=date(2024, 1, day))
+        state.query_name = "campaign_daily_performance"
+        _upsert_state(repo, state)
+    WarehouseLoader(repo, store, raw_sink, curated_sink).run()
+
+    def fact_rows(name):
+        loader = WarehouseLoader(
+            repo,
+            store,
+            raw_sink,
+            curated_sink,
+            fact_loader=SQLiteFactTableLoader(tmp_path / name),
+        )
+        plan = loader.run(full=name == "full.db")
+        assert plan.load == () and plan.replace == ()
+        with sqlite3.connect(tmp_path / name) as conn:
+            return conn.execute(
+                "SELECT date, clicks FROM fact_campaign_daily ORDER BY date"
+            ).fetchall()
+
+    # Both a --full run and an incremental run into an empty database backfill.
+    assert fact_rows("full.db") == [("2024-01-01", 1), ("2024-01-02", 2)]
+    assert fact_rows("incremental.db") == [("2024-01-01", 1), ("2024-01-02", 2)]
+
+
+def test_run_loads_facts_after_the_pointers_and_catches_up_after_a_crash(
+    tmp_path, monkeypatch
+):
+    repo = _make_state_repo(tmp_path)
+    store = _make_pointer_store(tmp_path)
+    raw_sink = LocalFilesystemRawSink(tmp_path / "raw")
+    curated_sink = FilesystemCuratedSink(tmp_path / "warehouse")
+    key = PartitionKey("google_ads", "123", "campaign_daily_performance", "2024-01-02")
+    writer = raw_sink.write_partition(key, "run-1")
+    for day in (1, 2):  # one partition reporting two dates
+        writer.write_payload_row({"campaign_id": 7, "segments_date": f"2024-01-0{day}"})
+    writer.finalize({"record_count": 2, "schema_version": "v1"})
+    state = _success_state("run-1", logical_date=date(2024, 1, 2))
+    state.query_name = "campaign_daily_performance"
+    _upsert_state(repo, state)
+    fact_loader = SQLiteFactTableLoader(tmp_path / "facts.db")
+    loader = WarehouseLoader(repo, store, raw_sink, curated_sink, fact_loader=fact_loader)
+
+    def crash(*args, **kwargs):
+        raise RuntimeError("fact database unavailable")
+
+    monkeypatch.setattr(fact_loader, "replace_partitions", crash)
+    with pytest.raises(RuntimeError):
+        loader.run()
+    assert [pointer.run_id for pointer in store.list_pointers()] == ["run-1"]
+    monkeypatch.undo()
+
+    # No new events, but the fact watermark lags the pointers, so the run reconciles.
+    plan = loader.run()
+    assert plan.load == () and plan.replace == ()
+    with sqlite3.connect(tmp_path / "facts.db") as conn:
+        assert conn.execute(
+            "SELECT customer_id, campaign_id, date FROM fact_campaign_daily ORDER BY date"
+        ).fetchall() == [("123", "7", "2024-01-01"), ("123", "7", "2024-01-02")]
+    assert fact_loader.load_watermark() == repo.latest_event_seq()
+
+    # A fact database with nothing to load is still marked, so later runs
+    # stay incremental instead of reconciling every pointer again.
+    empty = SQLiteFactTableLoader(tmp_path / "empty.db", mappings={})
+    WarehouseLoader(repo, store, raw_sink, curated_sink, fact_loader=empty).run()
+    monkeypatch.setattr(store, "list_pointers", crash)
+    WarehouseLoader(repo, store, raw_sink, curated_sink, fact_loader=empty).run()
+    assert empty.load_watermark() == repo.latest_event_seq()